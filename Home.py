@@ -1,12 +1,8 @@
 import streamlit as st
 from scr.config import configure_page_home
-from scr.ui import selecteurs_session, sidebar_hint_once
-from scr.data import chargement_session
-from scr.utils import formatage_timedelta
-import plotly.express as px
+from scr.ui import selecteurs_session, sidebar_hint_once, donnees_session
+from scr.utils import formatage_timedelta, formatage_timedelta_serie
 import pandas as pd
-from streamlit_extras.colored_header import colored_header
-from streamlit_extras.add_vertical_space import add_vertical_space
 
 
 configure_page_home("F1 Analytics – Home")
@@ -45,20 +41,21 @@ if not loaded:
     st.info("Sélectionnez une année, un Grand Prix et un type de session, puis **Charger**")
     st.stop()
 
-# Chargement du WEEK-END de Grand prix
-try:
-    _data = chargement_session(annee, grand_prix, session_type)
-    session = session_type
-    nom_gp = grand_prix
-    tours = _data['tours']
-    pilotes = _data['pilotes']
-    meteo = _data['meteo']
-    resultats = _data['resultats']
-except Exception as e:
-    st.info("Données indisponibles pour cette sélection (connexion, calendrier ou session non disponible).")
-    with st.expander("Détails techniques (debug)"):
-        st.write(e)
-    st.stop()
+# Chargement du WEEK-END de Grand prix, en arrière-plan : seules les parties
+# affichées ici (tours et résultats) ; les autres pages chargent les leurs
+_data = donnees_session(annee, grand_prix, session_type, parties=("tours", "resultats"))
+
+# Imports d'affichage différés : la première visite (aucune session chargée) s'en passe
+import plotly.express as px
+from streamlit_extras.colored_header import colored_header
+from streamlit_extras.add_vertical_space import add_vertical_space
+
+session = session_type
+nom_gp = grand_prix
+tours = _data['tours']
+pilotes = _data['pilotes']
+meteo = _data['meteo']
+resultats = _data['resultats']
 
 
 # Les métriques utilisent maintenant le thème CSS adaptatif
@@ -87,14 +84,8 @@ else:
 
 # Top 10 meilleurs tours
 colored_header("Chronos — Top 10 meilleurs tours", description=None, color_name="blue-70")
-if not tours.empty and 'LapTime' in tours:
-    top = (tours.sort_values('LapTime')
-                .loc[tours['LapTime'].notna(),
-                     ['Driver','LapNumber','LapTime','LapSeconds','Compound','Stint']]
-                .head(10))
-
-    top = pd.DataFrame(top).copy()
-    top['LapTimeStr'] = top['LapTime'].apply(formatage_timedelta)
+top = _data['derivees']['top_tours']
+if not top.empty:
     top_display = top[['Driver','LapNumber','LapTimeStr','Compound','Stint']]
     st.dataframe(top_display, use_container_width=True)
 else:
@@ -103,10 +94,8 @@ else:
 add_vertical_space(1)
 # Répartition des pneus
 colored_header("Répartition des composés pneus", description=None, color_name="blue-70")
-if 'Compound' in tours:
-    comp = (tours.dropna(subset=['Compound'])
-                .groupby(['Driver','Compound']).size()
-                .reset_index(name='Tours'))
+comp = _data['derivees']['composes']
+if not comp.empty:
     fig = px.bar(comp, x='Driver', y='Tours', color='Compound', barmode='stack')
     st.plotly_chart(fig, use_container_width=True)
 else:
@@ -121,7 +110,7 @@ if not resultats.empty:
     for c in ["Time","FastestLapTime"]:
         if c in res.columns:
             try:
-                res[c] = res[c].apply(formatage_timedelta)
+                res[c] = formatage_timedelta_serie(res[c])
             except Exception:
                 pass
     st.markdown("Résultats officiels **(si disponibles)**")
@@ -0,0 +1,221 @@
+"""
+Données hors ligne des mesures : cache FastF1 enregistré du GP d'Australie 2025
+(course), complété de télémétrie synthétique et de jeux agrandis.
+
+Aucun accès réseau : FastF1 tourne en mode hors ligne sur une copie du cache,
+et tout ce que ce cache ne contient pas (télémétrie, infos circuit, autres
+manches de la saison) est fabriqué ici de façon déterministe.
+"""
+from __future__ import annotations
+
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+import fastf1
+import numpy as np
+import pandas as pd
+from fastf1.core import Telemetry
+from fastf1.events import Event
+from fastf1.mvapi import CircuitInfo
+
+import scr.calendrier
+from scr.cache import MAGASIN_EXPORTS, MAGASIN_FIGURES, MAGASIN_SESSIONS, MAGASIN_TELEMETRIE, cle_session
+from scr.calendrier import Calendrier
+
+RACINE = Path(__file__).resolve().parent.parent
+CACHE_DEPOT = RACINE / "cache"
+ANNEE = 2025
+COURSE = "Australian Grand Prix"
+DEBUT_COURSE = pd.Timestamp("2025-03-16 04:00")
+
+# Fréquence de la télémétrie synthétique (Hz), proche de celle de car_data
+FREQUENCE_TELEMETRIE = 4.0
+# Barème des dix premiers : les points viennent d'Ergast, absent du cache enregistré
+BAREME_POINTS = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+
+
+def session_australie_2025(points: bool = True):
+    """
+    Session FastF1 (non chargée) du GP d'Australie 2025, sans passer par le calendrier en ligne.
+
+    Paramètres
+    ----------
+    points : bool, optionnel
+        Compléter au chargement les points de la course d'après `BAREME_POINTS`
+        (False : résultats tels que lus dans le cache, comme dans les tests).
+    """
+    ev = {"RoundNumber": 1, "Country": "Australia", "Location": "Melbourne", "OfficialEventName": "",
+          "EventDate": pd.Timestamp("2025-03-16"), "EventName": COURSE,
+          "EventFormat": "conventional", "F1ApiSupport": True}
+    for i, session in enumerate(["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"], 1):
+        ev[f"Session{i}"] = session
+        ev[f"Session{i}Date"] = pd.Timestamp("2025-03-16 15:00+11:00")
+        ev[f"Session{i}DateUtc"] = DEBUT_COURSE
+    sess = fastf1.core.Session(Event(ev, year=ANNEE), "Race", f1_api_support=True)
+    if not points:
+        return sess
+    charger = sess.load
+
+    def load(*args, **kwargs):
+        charger(*args, **kwargs)
+        resultats = sess.results
+        if resultats["Points"].isna().all():
+            # Sans les tours, FastF1 ne calcule pas les positions : l'ordre des pilotes en tient lieu
+            positions = resultats["Position"].fillna(pd.Series(np.arange(1.0, len(resultats) + 1), index=resultats.index))
+            bareme = dict(enumerate(BAREME_POINTS, 1))
+            resultats["Points"] = positions.map(bareme).fillna(0.0).astype("float64")
+
+    sess.load = load
+    return sess
+
+
+def vider_caches():
+    """Vide les magasins mémoire partagés (les fichiers du cache restent)."""
+    for magasin in (MAGASIN_SESSIONS, MAGASIN_TELEMETRIE, MAGASIN_FIGURES, MAGASIN_EXPORTS):
+        magasin.vider()
+
+
+@contextmanager
+def fastf1_hors_ligne():
+    """
+    FastF1 hors ligne sur une copie temporaire du cache enregistré.
+
+    `fastf1.get_session` renvoie la course enregistrée pour toute épreuve de
+    2025 : les manches d'une saison synthétique rejouent ainsi ses résultats.
+
+    Retour
+    ------
+    Path
+        Valeur du `with` : dossier du cache temporaire.
+    """
+    etat = {attr: getattr(fastf1.Cache, attr)
+            for attr in ("_CACHE_DIR", "_requests_session_cached", "_IGNORE_VERSION", "_FORCE_RENEW")}
+    with tempfile.TemporaryDirectory(prefix="f1-bench-") as dossier:
+        shutil.copytree(CACHE_DEPOT / str(ANNEE), Path(dossier) / str(ANNEE),
+                        ignore=shutil.ignore_patterns("instantane", "*.arrow", ".DS_Store"))
+        fastf1.Cache.enable_cache(dossier)
+        fastf1.Cache.offline_mode(True)
+
+        def get_session(annee, course, sess_type, *args, **kwargs):
+            if annee != ANNEE or sess_type != "R":
+                raise ValueError(f"Aucune donnée enregistrée pour {annee} {course} {sess_type}")
+            return session_australie_2025()
+
+        try:
+            with mock.patch.object(fastf1, "get_session", get_session):
+                vider_caches()
+                yield Path(dossier)
+        finally:
+            vider_caches()
+            fastf1.Cache.offline_mode(False)
+            for attr, valeur in etat.items():
+                setattr(fastf1.Cache, attr, valeur)
+
+
+def supprimer_instantane(dossier: Path):
+    """Efface les instantanés columnaires : le prochain chargement relit les pickles FastF1."""
+    for instantane in Path(dossier).rglob("instantane"):
+        shutil.rmtree(instantane, ignore_errors=True)
+
+
+# --- Télémétrie et circuit synthétiques ---
+
+def _trace(phase: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Circuit fermé d'environ 5 km, paramétré par la fraction de tour."""
+    angle = 2 * np.pi * phase
+    return (2200 * np.cos(angle) + 500 * np.cos(3 * angle),
+            1400 * np.sin(angle) + 300 * np.sin(2 * angle))
+
+
+def ajouter_telemetrie(sess, frequence: float = FREQUENCE_TELEMETRIE):
+    """
+    Ajoute à une session chargée une télémétrie voiture et position synthétique.
+
+    Chaque pilote parcourt le même circuit au rythme de ses tours réels ;
+    vitesse, rapport, régime et positions suivent la fraction de tour écoulée.
+    Les volumes sont ceux d'une vraie course (une ligne par échantillon).
+    """
+    car_data, pos_data = {}, {}
+    for numero, tours in sess.laps.dropna(subset=["LapStartTime", "Time"]).groupby("DriverNumber", observed=True):
+        debut = tours["LapStartTime"].min().total_seconds()
+        fin = tours["Time"].max().total_seconds()
+        secondes = np.arange(debut, fin, 1 / frequence)
+        starts = tours["LapStartTime"].dt.total_seconds().to_numpy()
+        fins = tours["Time"].dt.total_seconds().to_numpy()
+        i = np.clip(np.searchsorted(starts, secondes, side="right") - 1, 0, len(starts) - 1)
+        phase = np.clip((secondes - starts[i]) / np.maximum(fins[i] - starts[i], 1e-3), 0, 1)
+        vitesse = 210 + 95 * np.cos(2 * np.pi * 5 * phase) + int(numero) % 7
+        temps = pd.to_timedelta(secondes, unit="s")
+        dates = DEBUT_COURSE + temps
+        car_data[str(numero)] = Telemetry(pd.DataFrame({
+            "Date": dates, "SessionTime": temps, "Time": temps - temps[0],
+            "RPM": 9000 + 30 * vitesse, "Speed": vitesse, "nGear": np.clip(vitesse // 40, 1, 8),
+            "Throttle": np.clip(vitesse / 3, 0, 100), "Brake": np.diff(vitesse, prepend=vitesse[0]) < -2,
+            "DRS": 0, "Source": "car",
+        }), session=sess, driver=str(numero))
+        x, y = _trace(phase)
+        pos_data[str(numero)] = Telemetry(pd.DataFrame({
+            "Date": dates, "SessionTime": temps, "Time": temps - temps[0],
+            "X": x, "Y": y, "Z": 0.0, "Status": "OnTrack", "Source": "pos",
+        }), session=sess, driver=str(numero))
+    sess._car_data, sess._pos_data = car_data, pos_data
+    sess._t0_date = DEBUT_COURSE
+    deposer_infos_circuit(sess)
+    return sess
+
+
+def deposer_infos_circuit(sess):
+    """Infos circuit (virages), normalement téléchargées, déposées dans le cache de `scr.telemetrie`."""
+    phases = np.linspace(0, 1, 14, endpoint=False)
+    x, y = _trace(phases)
+    virages = pd.DataFrame({"X": x, "Y": y, "Number": np.arange(1, 15), "Letter": "",
+                            "Angle": np.degrees(phases * 2 * np.pi), "Distance": phases * 5000})
+    vide = virages.iloc[0:0]
+    MAGASIN_TELEMETRIE.deposer((*cle_session(sess), "circuit"),
+                               CircuitInfo(corners=virages, marshal_lights=vide, marshal_sectors=vide, rotation=45.0))
+
+
+# --- Jeux agrandis ---
+
+def tours_agrandis(tours: pd.DataFrame, resultats: pd.DataFrame, facteur: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Tours et résultats avec `facteur` fois plus de pilotes (copies renommées).
+
+    Retour
+    ------
+    tuple[pd.DataFrame, pd.DataFrame]
+        (tours, résultats) ; les copies ont des numéros et abréviations distincts.
+    """
+    copies_tours, copies_resultats = [], []
+    for k in range(facteur):
+        suffixe = "" if k == 0 else str(k)
+        t = pd.DataFrame(tours).copy()
+        t["Driver"] = t["Driver"].astype(str) + suffixe
+        t["DriverNumber"] = (t["DriverNumber"].astype(int) + 100 * k).astype(str)
+        copies_tours.append(t)
+        r = pd.DataFrame(resultats).copy()
+        r["Abbreviation"] = r["Abbreviation"].astype(str) + suffixe
+        r["DriverNumber"] = (r["DriverNumber"].astype(int) + 100 * k).astype(str)
+        r["BroadcastName"] = r["BroadcastName"].astype(str) + suffixe
+        copies_resultats.append(r)
+    return pd.concat(copies_tours, ignore_index=True), pd.concat(copies_resultats, ignore_index=True)
+
+
+def saison_synthetique(manches: int) -> Calendrier:
+    """
+    Calendrier de `manches` épreuves qui rejouent toutes la course enregistrée,
+    déposé dans le service de calendrier (`scr.calendrier`) pour 2025.
+    """
+    table = pd.DataFrame({
+        "RoundNumber": np.arange(1, manches + 1),
+        "EventName": [COURSE] + [f"{COURSE} {m}" for m in range(2, manches + 1)],
+        "EventDate": pd.Timestamp("2025-03-16") + pd.to_timedelta(np.arange(manches) * 14, unit="D"),
+        "Session5": "Race",
+        "Session5DateUtc": DEBUT_COURSE + pd.to_timedelta(np.arange(manches) * 14, unit="D"),
+    }).reindex(columns=scr.calendrier.COLONNES_CALENDRIER)
+    cal = Calendrier(ANNEE, table)
+    scr.calendrier._CALENDRIERS[ANNEE] = (cal, float("inf"))
+    return cal
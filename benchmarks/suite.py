@@ -0,0 +1,373 @@
+"""
+Mesures de performance hors ligne : chargement, tables dérivées, championnat,
+télémétrie et figures, sur le GP d'Australie 2025 enregistré dans cache/.
+
+Utilisation :
+    python -m benchmarks.suite --json mesures.json
+    python -m benchmarks.suite --filtre figures --repetitions 3
+    python -m benchmarks.suite --json apres.json --comparer avant.json --seuil 0.15
+
+Chaque mesure est répétée (temps médian et minimal), puis rejouée une fois
+sous `tracemalloc` pour le pic mémoire et les allocations encore vivantes à
+la fin de l'appel. Le JSON produit (commit, versions, mesures) se compare
+d'un commit à l'autre avec `--comparer`.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fastf1
+import numpy as np
+import pandas as pd
+
+import scr.championnat
+from scr.cache import MAGASIN_FIGURES, MAGASIN_TELEMETRIE
+import scr.data
+from scr.data import calcul_classement_constructeur, calcul_classement_pilote, chargement_session, tour_rapide_tel
+from scr.derives import classement_session, materialiser
+from scr.positions import _calculer_matrice
+
+from .hors_ligne import (ANNEE, COURSE, RACINE, ajouter_telemetrie, deposer_infos_circuit, fastf1_hors_ligne,
+                         saison_synthetique, supprimer_instantane, tours_agrandis, vider_caches)
+
+# Parties chargées par les mesures de chargement (la télémétrie n'est pas dans le cache enregistré)
+PARTIES = ("tours", "resultats", "meteo")
+# Facteurs d'agrandissement des tables (nombre de pilotes multiplié)
+FACTEURS = (1, 4, 16)
+# Manches de la saison synthétique du championnat
+MANCHES = 24
+PILOTE = "VER"
+
+# Nom → (préparation non chronométrée, fonction mesurée, vérification) ; voir `mesure`
+MESURES: dict[str, tuple] = {}
+
+
+class MesureInvalide(RuntimeError):
+    """Le calcul mesuré ne produit pas le résultat attendu (le temps n'aurait pas de sens)."""
+
+
+def mesure(nom: str, avant=None, facteurs=None, verifier=None):
+    """
+    Déclare une mesure.
+
+    La fonction décorée reçoit le contexte (voir `preparer`), et le facteur
+    d'agrandissement si `facteurs` est donné : une mesure est alors déclarée
+    par facteur, nommée « nom[xN] ». `avant(contexte)` est appelée avant
+    chaque répétition, hors chronomètre (vidage des caches...).
+    `verifier(contexte)` est appelée une fois avant la mesure et lève
+    `MesureInvalide` si le calcul ne produit rien d'exploitable.
+    """
+    def enregistrer(fonction):
+        for facteur in facteurs or (None,):
+            if facteur is None:
+                MESURES[nom] = (avant, fonction, verifier)
+            else:
+                MESURES[f"{nom}[x{facteur}]"] = (avant, lambda ctx, f=facteur: fonction(ctx, f), verifier)
+        return fonction
+    return enregistrer
+
+
+def preparer(dossier: Path) -> dict:
+    """Charge la course enregistrée, y ajoute la télémétrie synthétique et la saison du championnat."""
+    data = chargement_session(ANNEE, COURSE, "R", PARTIES)
+    sess = ajouter_telemetrie(data["session"])
+    cal = saison_synthetique(MANCHES)
+    return dict(dossier=dossier, data=data, sess=sess, derniere_manche=cal.noms[-1], agrandis={})
+
+
+def _agrandi(ctx: dict, facteur: int):
+    if facteur not in ctx["agrandis"]:
+        ctx["agrandis"][facteur] = tours_agrandis(ctx["data"]["tours"], ctx["data"]["resultats"], facteur)
+    return ctx["agrandis"][facteur]
+
+
+# --- Chargement ---
+
+def _session_froide(ctx):
+    vider_caches()
+    supprimer_instantane(ctx["dossier"])
+
+
+@mesure("chargement.pickles_fastf1", avant=_session_froide)
+def _chargement_pickles(ctx):
+    chargement_session(ANNEE, COURSE, "R", PARTIES)
+
+
+@mesure("chargement.instantane", avant=lambda ctx: vider_caches())
+def _chargement_instantane(ctx):
+    chargement_session(ANNEE, COURSE, "R", PARTIES)
+
+
+@mesure("chargement.memoire")
+def _chargement_memoire(ctx):
+    chargement_session(ANNEE, COURSE, "R", PARTIES)
+
+
+# --- Tables dérivées (tailles réelle et agrandies) ---
+
+@mesure("derives.classement_session", facteurs=FACTEURS)
+def _classement_session(ctx, facteur):
+    tours, resultats = _agrandi(ctx, facteur)
+    classement_session(tours, resultats, "R")
+
+
+@mesure("derives.materialiser", facteurs=FACTEURS)
+def _materialiser(ctx, facteur):
+    tours, resultats = _agrandi(ctx, facteur)
+    materialiser(dict(tours=tours, resultats=resultats, type_session="R"))
+
+
+@mesure("positions.matrice")
+def _matrice_positions(ctx):
+    _calculer_matrice(ctx["sess"])
+
+
+# --- Championnat (saison synthétique de MANCHES courses) ---
+
+def _championnat_froid(ctx):
+    vider_caches()
+    scr.data._PROGRESSIONS.clear()
+    scr.championnat._REGISTRES.clear()
+    scr.championnat._ESSAIS.clear()
+    scr.championnat._PROVISOIRES.clear()
+    chemin = scr.championnat.chemin_registre(ANNEE)
+    if chemin is not None:
+        chemin.unlink(missing_ok=True)
+
+
+@mesure("championnat.classement_pilotes.froid", avant=_championnat_froid)
+def _classement_pilotes_froid(ctx):
+    calcul_classement_pilote(ANNEE, ctx["derniere_manche"])
+
+
+@mesure("championnat.classement_pilotes.registre", avant=lambda ctx: scr.data._PROGRESSIONS.clear())
+def _classement_pilotes_registre(ctx):
+    calcul_classement_pilote(ANNEE, ctx["derniere_manche"])
+
+
+@mesure("championnat.classement_constructeurs.registre", avant=lambda ctx: scr.data._PROGRESSIONS.clear())
+def _classement_constructeurs_registre(ctx):
+    calcul_classement_constructeur(ANNEE, ctx["derniere_manche"])
+
+
+# --- Télémétrie et figures (caches de télémétrie et de figures vidés) ---
+
+def _telemetrie_froide(ctx):
+    MAGASIN_TELEMETRIE.vider()
+    MAGASIN_FIGURES.vider()
+    deposer_infos_circuit(ctx["sess"])
+
+
+@mesure("telemetrie.tour_rapide_tel", avant=_telemetrie_froide)
+def _tour_rapide_tel(ctx):
+    tour_rapide_tel("", ctx["sess"].laps, PILOTE)
+
+
+def verifier_figure(fig):
+    """
+    Lève `MesureInvalide` si la figure n'a aucune donnée tracée (figure de repli
+    « ... indisponible ») : son temps de rendu ne mesurerait pas le calcul réel.
+    """
+    traces = sum(len(ax.lines) + len(ax.collections) + len(ax.images) + len(ax.patches) for ax in fig.axes)
+    repli = [t.get_text() for ax in fig.axes for t in ax.texts if "indisponible" in t.get_text().lower()]
+    if not traces or repli:
+        raise MesureInvalide(f"Figure sans données : {repli[0] if repli else 'aucun tracé'}")
+
+
+def _figure(nom: str, **parametres):
+    # Imports différés : Matplotlib n'est chargé que si une figure est mesurée
+    def mesurer_figure(ctx):
+        from scr import graphiques
+        from scr.rendu import image_figure
+
+        image_figure(getattr(graphiques, nom), ctx["sess"], **parametres)
+
+    def verifier(ctx):
+        import matplotlib.pyplot as plt
+        from scr import graphiques
+
+        _telemetrie_froide(ctx)
+        fig = getattr(graphiques, nom)(ctx["sess"], **parametres)
+        try:
+            verifier_figure(fig)
+        finally:
+            plt.close(fig)
+    mesure(f"figures.{nom}", avant=_telemetrie_froide, verifier=verifier)(mesurer_figure)
+
+
+_figure("figure_positions_par_tour")
+_figure("figure_carte_vitesse", pilote=PILOTE)
+_figure("figure_carte_rapports", pilote=PILOTE)
+_figure("figure_carte_mini_secteurs")
+_figure("figure_carte_virages", pilote=PILOTE)
+
+
+# --- Exécution ---
+
+def chronometrer(fonction, avant=None, repetitions: int = 5) -> dict:
+    """
+    Mesure un appel : temps sur `repetitions` appels, puis mémoire sur un appel tracé.
+
+    Retour
+    ------
+    dict
+        temps_s (chaque répétition), temps_median_s, temps_min_s, pic_octets
+        (pic tracé pendant l'appel), octets_retenus et allocations_retenues
+        (blocs alloués pendant l'appel et encore vivants à la fin).
+    """
+    temps = []
+    for _ in range(repetitions):
+        if avant is not None:
+            avant()
+        gc.collect()
+        debut = time.perf_counter()
+        fonction()
+        temps.append(time.perf_counter() - debut)
+
+    if avant is not None:
+        avant()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fonction()
+        retenus, pic = tracemalloc.get_traced_memory()
+        allocations = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    return dict(
+        temps_s=[round(t, 6) for t in temps],
+        temps_median_s=round(statistics.median(temps), 6),
+        temps_min_s=round(min(temps), 6),
+        pic_octets=int(pic),
+        octets_retenus=int(retenus),
+        allocations_retenues=int(allocations),
+    )
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RACINE, capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executer(filtre: str | None = None, repetitions: int = 5, afficher=None) -> dict:
+    """
+    Exécute les mesures (toutes, ou celles dont le nom correspond à `filtre`).
+
+    Paramètres
+    ----------
+    filtre : str | None, optionnel
+        Motif de noms (« figures.* ») ou préfixe (« derives »).
+    repetitions : int, optionnel
+        Répétitions chronométrées par mesure.
+    afficher : callable | None, optionnel
+        Appelée avec (nom, résultat) après chaque mesure.
+
+    Retour
+    ------
+    dict
+        commit, date, versions et mesures (nom → résultat de `chronometrer`).
+
+    Lève `MesureInvalide` si une mesure ne produit rien d'exploitable.
+    """
+    noms = [nom for nom in MESURES
+            if filtre is None or fnmatch.fnmatch(nom, filtre) or nom.startswith(filtre)]
+    resultats = {}
+    with fastf1_hors_ligne() as dossier:
+        ctx = preparer(dossier)
+        for nom in noms:
+            avant, fonction, verifier = MESURES[nom]
+            if verifier is not None:
+                verifier(ctx)
+            resultats[nom] = chronometrer(lambda: fonction(ctx), (lambda: avant(ctx)) if avant else None, repetitions)
+            if afficher is not None:
+                afficher(nom, resultats[nom])
+    return dict(
+        commit=_commit(),
+        date=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        machine=platform.platform(),
+        versions=dict(python=platform.python_version(), fastf1=fastf1.__version__,
+                      pandas=pd.__version__, numpy=np.__version__),
+        repetitions=repetitions,
+        mesures=resultats,
+    )
+
+
+def comparer(ancien: dict, nouveau: dict, seuil: float = 0.10) -> list[tuple[str, float, float, float]]:
+    """
+    Compare deux exécutions sur le temps médian des mesures communes.
+
+    Retour
+    ------
+    list[tuple[str, float, float, float]]
+        (nom, ancien temps, nouveau temps, variation relative) des mesures dont
+        la variation dépasse `seuil` (positive : plus lent).
+    """
+    ecarts = []
+    for nom, mesure_nouvelle in nouveau["mesures"].items():
+        if nom not in ancien["mesures"]:
+            continue
+        avant = ancien["mesures"][nom]["temps_median_s"]
+        apres = mesure_nouvelle["temps_median_s"]
+        variation = (apres - avant) / avant if avant > 0 else 0.0
+        if abs(variation) > seuil:
+            ecarts.append((nom, avant, apres, variation))
+    return ecarts
+
+
+def _ligne(nom: str, resultat: dict):
+    print(f"{nom:<48} {resultat['temps_median_s'] * 1000:10.1f} ms  (min {resultat['temps_min_s'] * 1000:8.1f})"
+          f"  pic {resultat['pic_octets'] / 2**20:8.1f} Mo  {resultat['allocations_retenues']:>9} blocs")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Mesures de performance hors ligne (GP d'Australie 2025 enregistré).")
+    parser.add_argument("--filtre", help="motif ou préfixe des mesures à exécuter (ex. 'figures.*', 'derives')")
+    parser.add_argument("--repetitions", type=int, default=5, help="répétitions chronométrées (défaut : 5)")
+    parser.add_argument("--json", help="fichier où écrire les résultats")
+    parser.add_argument("--comparer", help="résultats JSON de référence (autre commit)")
+    parser.add_argument("--seuil", type=float, default=0.10,
+                        help="variation relative signalée par --comparer (défaut : 0.10)")
+    parser.add_argument("--lister", action="store_true", help="lister les mesures sans les exécuter")
+    args = parser.parse_args(argv)
+
+    if args.lister:
+        print("\n".join(MESURES))
+        return 0
+    fastf1.set_log_level("ERROR")
+    try:
+        resultats = executer(args.filtre, args.repetitions, afficher=_ligne)
+    except MesureInvalide as e:
+        print(f"Mesure invalide : {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        Path(args.json).write_text(json.dumps(resultats, indent=2, ensure_ascii=False))
+    if not args.comparer:
+        return 0
+    reference = json.loads(Path(args.comparer).read_text())
+    ecarts = comparer(reference, resultats, args.seuil)
+    print(f"\nComparaison avec {reference.get('commit') or args.comparer} (seuil {args.seuil:.0%}) :")
+    for nom, avant, apres, variation in ecarts:
+        sens = "plus lent" if variation > 0 else "plus rapide"
+        print(f"  {nom:<46} {avant * 1000:9.1f} → {apres * 1000:9.1f} ms  {variation:+.0%} {sens}")
+    if not ecarts:
+        print("  aucun écart au-delà du seuil")
+    return 1 if any(variation > 0 for *_, variation in ecarts) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
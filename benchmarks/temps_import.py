@@ -0,0 +1,138 @@
+"""
+Temps d'import à froid de chaque page Streamlit, mesuré avec `python -X importtime`.
+
+Utilisation :
+    python -m benchmarks.temps_import
+    python -m benchmarks.temps_import Home.py pages/4_Meteo.py --repetitions 5 --json imports.json
+
+Pour chaque page, les imports exécutés à la première visite (ceux placés avant
+le premier `st.stop()` du script) sont rejoués dans un interpréteur neuf ; on
+retient la médiane des répétitions et les modules les plus coûteux.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+
+
+def pages() -> list[Path]:
+    """Scripts de l'application : Home puis les pages, dans l'ordre du menu."""
+    return [RACINE / "Home.py", *sorted((RACINE / "pages").glob("*.py"))]
+
+
+def _appelle_stop(noeud: ast.AST) -> bool:
+    return any(isinstance(n, ast.Call) and isinstance(n.func, ast.Attribute) and n.func.attr == "stop"
+               for n in ast.walk(noeud))
+
+
+def imports_page(chemin: Path) -> list[str]:
+    """
+    Instructions d'import exécutées à la première visite d'une page.
+
+    Seuls les imports de premier niveau sont retenus, jusqu'au premier
+    `st.stop()` : ceux placés après (imports différés) ne sont payés que
+    lorsque la page a des données à afficher.
+
+    Retour
+    ------
+    list[str]
+        Code source des instructions, dans l'ordre du script.
+    """
+    source = Path(chemin).read_text(encoding="utf-8")
+    instructions = []
+    for noeud in ast.parse(source).body:
+        if isinstance(noeud, (ast.Import, ast.ImportFrom)):
+            instructions.append(ast.get_source_segment(source, noeud))
+        elif _appelle_stop(noeud):
+            break
+    return instructions
+
+
+def analyser_importtime(sortie: str) -> list[tuple[str, int, int, int]]:
+    """
+    Lignes de `-X importtime` : (module, µs propres, µs cumulées, profondeur).
+
+    La profondeur 0 désigne les imports faits directement par le code mesuré.
+    """
+    lignes = []
+    for ligne in sortie.splitlines():
+        if not ligne.startswith("import time:"):
+            continue
+        propre, cumul, nom = ligne[len("import time:"):].split("|", 2)
+        if not propre.strip().isdigit():
+            continue  # en-tête
+        profondeur = (len(nom) - len(nom.lstrip()) - 1) // 2
+        lignes.append((nom.strip(), int(propre), int(cumul), profondeur))
+    return lignes
+
+
+def mesurer_page(chemin: Path, repetitions: int = 3, top: int = 8) -> dict:
+    """
+    Mesure le temps d'import à froid d'une page.
+
+    Paramètres
+    ----------
+    chemin : Path
+        Script de la page.
+    repetitions : int, optionnel
+        Nombre d'interpréteurs lancés ; la médiane est retenue.
+    top : int, optionnel
+        Nombre de modules les plus coûteux à rapporter.
+
+    Retour
+    ------
+    dict
+        total_ms (médiane), mesures_ms, imports (instructions rejouées) et
+        modules : [{module, cumul_ms}] des imports directs les plus lents
+        (de la dernière mesure).
+    """
+    code = "\n".join(imports_page(chemin))
+    mesures, lignes = [], []
+    for _ in range(repetitions):
+        resultat = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=RACINE,
+                                  capture_output=True, text=True)
+        if resultat.returncode != 0:
+            raise RuntimeError(f"Import de {Path(chemin).name} en échec :\n{resultat.stderr[-2000:]}")
+        lignes = analyser_importtime(resultat.stderr)
+        mesures.append(sum(cumul for _, _, cumul, profondeur in lignes if profondeur == 0) / 1000)
+    directs = sorted((l for l in lignes if l[3] == 0), key=lambda l: l[2], reverse=True)
+    return dict(
+        total_ms=round(statistics.median(mesures), 1),
+        mesures_ms=[round(m, 1) for m in mesures],
+        imports=code.splitlines(),
+        modules=[dict(module=nom, cumul_ms=round(cumul / 1000, 1)) for nom, _, cumul, _ in directs[:top]],
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.temps_import",
+                                     description="Temps d'import à froid de chaque page (python -X importtime).")
+    parser.add_argument("pages", nargs="*", help="scripts à mesurer (défaut : Home.py et pages/*.py)")
+    parser.add_argument("--repetitions", type=int, default=3, help="interpréteurs lancés par page (défaut : 3)")
+    parser.add_argument("--top", type=int, default=5, help="modules les plus lents affichés (défaut : 5)")
+    parser.add_argument("--json", help="fichier où écrire les résultats")
+    args = parser.parse_args(argv)
+
+    chemins = [RACINE / p for p in args.pages] if args.pages else pages()
+    resultats = {}
+    for chemin in chemins:
+        mesure = mesurer_page(chemin, args.repetitions, args.top)
+        resultats[str(chemin.relative_to(RACINE))] = mesure
+        lents = ", ".join(f"{m['module']} {m['cumul_ms']:.0f}" for m in mesure["modules"])
+        print(f"{chemin.name:<32} {mesure['total_ms']:8.0f} ms   ({lents})")
+    if args.json:
+        Path(args.json).write_text(json.dumps(dict(python=platform.python_version(), pages=resultats),
+                                              indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,13 @@
 import streamlit as st
 import plotly.express as px
+from plotly.subplots import make_subplots
 from scr.config import configure_page
-from scr.ui import selecteurs_pilotes, selections_courantes
-from scr.data import chargement_session, tour_rapide_tel
-from scr.utils import formatage_timedelta
+from scr.ui import selecteurs_pilotes, selections_courantes, donnees_session
+from scr.data import tour_rapide_tel
+from scr.telemetrie import comparer_tours, PAS_DISTANCE
+from scr.echantillonnage import indices_lttb, POINTS_PAR_TRACE
+from scr.exports import export_table
+from scr.utils import formatage_timedelta, formatage_timedelta_serie
 
 from streamlit_extras.colored_header import colored_header
 
@@ -24,7 +28,7 @@ if not loaded:
     st.stop()
 
 # 2) Charger les données une seule fois (cache côté scr.data)
-data = chargement_session(annee, grand_prix, session_type)
+data = donnees_session(annee, grand_prix, session_type, parties=("tours", "telemetrie"))
 tours = data["tours"]
 pilotes = data["pilotes"]
 
@@ -69,12 +73,50 @@ def _get_best_lap_no(d):
     return None
 
 colored_header("Télémétries sur le tour le plus rapide", description=None, color_name="blue-70")
+CANAUX = {"Speed": "Vitesse (km/h)", "Throttle": "Accélérateur (%)", "Brake": "Frein",
+          "nGear": "Rapport", "RPM": "Régime (tr/min)"}
+col_canal, col_autres = st.columns([1, 3])
+with col_canal:
+    canal = st.selectbox("Canal", list(CANAUX), format_func=CANAUX.get, key="canal_tel")
+with col_autres:
+    autres = st.multiselect("Autres pilotes à comparer",
+                            [p for p in pilotes if p not in (pilote_1, pilote_2)], key="autres_tel")
 try:
-    d1_fast, tel_1 = tour_rapide_tel(f"{annee}-{grand_prix}-{session_type}", tours, pilote_1)
-    fig = px.line(tel_1, x='Distance', y='Speed', title=f"Tour le plus rapide – {pilote_1}", labels={'Speed': 'Vitesse (km/h)', 'Distance': 'Distance (m)'})
+    session_key = f"{annee}-{grand_prix}-{session_type}"
+    d1_fast, _ = tour_rapide_tel(session_key, tours, pilote_1)
     if pilote_2:
-        d2_fast, tel_2 = tour_rapide_tel(f"{annee}-{grand_prix}-{session_type}", tours, pilote_2)
-        fig.add_scatter(x=tel_2['Distance'], y=tel_2['Speed'], mode='lines', name=pilote_2)
+        d2_fast, _ = tour_rapide_tel(session_key, tours, pilote_2)
+
+    # Tours alignés sur la distance du tour de référence (pilote 1) + écart cumulé
+    laps = [d1_fast] + [tour_rapide_tel(session_key, tours, p)[0] for p in [pilote_2, *autres] if p]
+    comparaison = comparer_tours(data["session"], laps)
+    if comparaison is None:
+        raise ValueError(f"Pas de télémétrie pour le tour de référence de {pilote_1}")
+
+    # Zoom : la plage affichée est recalculée sur une grille plus fine, puis chaque
+    # courbe est réduite (LTTB) au budget de points d'un graphique
+    distance_max = float(comparaison["distance"][-1])
+    zoom = st.slider("Zoom (distance, m)", 0.0, distance_max, (0.0, distance_max), step=10.0, key="zoom_tel")
+    pas = next((p for p in (0.5, 1.0, 2.0) if p >= (zoom[1] - zoom[0]) / POINTS_PAR_TRACE), PAS_DISTANCE)
+    if pas != PAS_DISTANCE:
+        comparaison = comparer_tours(data["session"], laps, pas=pas)
+    dans_zoom = (comparaison["distance"] >= zoom[0]) & (comparaison["distance"] <= zoom[1])
+    distance = comparaison["distance"][dans_zoom]
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.04)
+    for i, nom in enumerate(comparaison["pilotes"]):
+        valeurs = comparaison["canaux"][canal][i][dans_zoom]
+        idx = indices_lttb(distance, valeurs)
+        fig.add_scatter(x=distance[idx], y=valeurs[idx], mode="lines",
+                        name=nom, legendgroup=nom, row=1, col=1)
+        delta = comparaison["delta"][i][dans_zoom]
+        idx = indices_lttb(distance, delta)
+        fig.add_scatter(x=distance[idx], y=delta[idx], mode="lines",
+                        name=nom, legendgroup=nom, showlegend=False, row=2, col=1)
+    fig.update_layout(title=f"Tour le plus rapide – référence {pilote_1}", height=600)
+    fig.update_yaxes(title_text=CANAUX[canal], row=1, col=1)
+    fig.update_yaxes(title_text=f"Écart / {pilote_1} (s)", row=2, col=1)
+    fig.update_xaxes(title_text="Distance (m)", row=2, col=1)
     st.plotly_chart(fig, use_container_width=True)
 
     c1, c2, c3 = st.columns(3)
@@ -105,12 +147,13 @@ colored_header("Informations par tour un pilote", description=None, color_name="
 colonnes = ['Driver','LapNumber','LapTime','LapSeconds','Compound','Stint','IsPersonalBest','PitOutTime','PitInTime']
 table = subset[[c for c in colonnes if c in subset.columns]].copy()
 if 'LapTime' in table:
-    table['LapTime'] = table['LapTime'].apply(formatage_timedelta)
+    table['LapTime'] = formatage_timedelta_serie(table['LapTime'])
 if not table.empty:
     st.dataframe(table, use_container_width=True)
     st.download_button(
         "Télécharger CSV",
-        data=table.to_csv(index=False).encode('utf-8'),
+        data=lambda: export_table(table, "csv"),
         file_name=f"laps_{annee}_{grand_prix}_{session_type}.csv",
         mime="text/csv",
+        on_click="ignore",
     )
\ No newline at end of file
@@ -1,7 +1,11 @@
 import streamlit as st
+import plotly.express as px
 from scr.config import configure_page
-from scr.data import figure_positions_par_tour, chargement_session
-from scr.ui import selections_courantes
+from scr.graphiques import figure_positions_par_tour
+from scr.positions import bilan_positions
+from scr.rendu import image_figure
+from scr.ui import selections_courantes, donnees_session
+from streamlit_extras.colored_header import colored_header
 
 with open("f1_theme.css") as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
@@ -18,10 +22,24 @@ if not loaded:
     st.page_link("Home.py", label="🏠 Retour à la Home")
     st.stop()
 
-data = chargement_session(annee, grand_prix, session_type)
+data = donnees_session(annee, grand_prix, session_type, parties=("tours", "resultats"))
 sess = data["session"]
 
-fig = figure_positions_par_tour(sess)          # tous les pilotes
-# ou : fig = figure_positions_par_tour(sess, pilotes=["VER","HAM","LEC"])
+# Image rendue une seule fois par session, puis relue dans le cache
+st.image(image_figure(figure_positions_par_tour, sess), width="stretch")          # tous les pilotes
+# ou : image_figure(figure_positions_par_tour, sess, pilotes=["VER","HAM","LEC"])
 
-st.pyplot(fig)
\ No newline at end of file
+# Écarts au leader et bilan, tirés de la même matrice tour × pilote
+matrice = data["positions"]
+if matrice is not None:
+    index = data["index_pilotes"]
+    colored_header("Écart au leader (en secondes)", description=None, color_name="blue-70")
+    ecarts = matrice["ecarts"].reset_index().melt(id_vars="LapNumber", var_name="Driver", value_name="Ecart").dropna()
+    fig = px.line(ecarts, x="LapNumber", y="Ecart", color="Driver", render_mode="webgl",
+                  color_discrete_map={abb: index.couleur(abb) for abb in matrice["pilotes"]},
+                  labels={"LapNumber": "Tours", "Ecart": "Écart (s)", "Driver": "Pilote"})
+    fig.update_yaxes(autorange="reversed")
+    st.plotly_chart(fig, use_container_width=True)
+
+    colored_header("Positions gagnées", description=None, color_name="blue-70")
+    st.dataframe(bilan_positions(matrice), use_container_width=True)
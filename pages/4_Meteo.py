@@ -3,8 +3,8 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 from scr.config import configure_page
-from scr.ui import selections_courantes
-from scr.data import chargement_session
+from scr.ui import selections_courantes, donnees_session
+from scr.echantillonnage import reduire
 
 with open("f1_theme.css") as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
@@ -15,15 +15,11 @@ st.subheader("Données météo de la session")
 
 annee, grand_prix, session_type, loaded = selections_courantes(required=True)
 
-data = chargement_session(annee, grand_prix, session_type)
-tours = data["tours"]
-pilotes = data["pilotes"]
-
 if not loaded:
     st.info("Charge d’abord une session depuis la page Home")
     st.stop()
 
-data = chargement_session(annee, grand_prix, session_type)
+data = donnees_session(annee, grand_prix, session_type, parties=("meteo",))
 meteo = data['meteo']
 
 if not meteo.empty:
@@ -39,17 +35,19 @@ if not meteo.empty:
             pass
 
     temp = ('AirTemp' in meteo) or ('TrackTemp' in meteo)
+    # Points réellement tracés : réduits une fois pour tous les graphiques
+    trace = reduire(meteo, xcol, ['AirTemp', 'TrackTemp', 'WindSpeed'])
 
     if temp:
         fig_all = make_subplots(specs=[[{"secondary_y": True}]])
         if 'AirTemp' in meteo:
             fig_all.add_trace(
-                go.Scatter(x=meteo[xcol], y=meteo['AirTemp'], mode='lines', name='Température air (°C)'),
+                go.Scatter(x=trace[xcol], y=trace['AirTemp'], mode='lines', name='Température air (°C)'),
                 secondary_y=False,
             )
         if 'TrackTemp' in meteo:
             fig_all.add_trace(
-                go.Scatter(x=meteo[xcol], y=meteo['TrackTemp'], mode='lines', name='Température piste (°C)'),
+                go.Scatter(x=trace[xcol], y=trace['TrackTemp'], mode='lines', name='Température piste (°C)'),
                 secondary_y=False,
             )
         fig_all.update_layout(
@@ -62,15 +60,15 @@ if not meteo.empty:
         st.plotly_chart(fig_all, use_container_width=True)
 
     if 'AirTemp' in meteo:
-        fig_t = px.line(meteo, x=xcol, y='AirTemp', labels={'AirTemp':'Température air (°C)'}, title="Température de l'air")
+        fig_t = px.line(trace, x=xcol, y='AirTemp', labels={'AirTemp':'Température air (°C)'}, title="Température de l'air")
         fig_t.update_xaxes(title_text="Temps de session")
         st.plotly_chart(fig_t, use_container_width=True)
     if 'TrackTemp' in meteo:
-        fig_tt = px.line(meteo, x=xcol, y='TrackTemp', labels={'TrackTemp':'Température piste (°C)'}, title="Température de la piste")
+        fig_tt = px.line(trace, x=xcol, y='TrackTemp', labels={'TrackTemp':'Température piste (°C)'}, title="Température de la piste")
         fig_tt.update_xaxes(title_text="Temps de session")
         st.plotly_chart(fig_tt, use_container_width=True)
     if 'WindSpeed' in meteo:
-        fig_w = px.line(meteo, x=xcol, y='WindSpeed', labels={'WindSpeed':'Vent (m/s)'}, title="Vitesse du vent")
+        fig_w = px.line(trace, x=xcol, y='WindSpeed', labels={'WindSpeed':'Vent (m/s)'}, title="Vitesse du vent")
         fig_w.update_xaxes(title_text="Temps de session")
         st.plotly_chart(fig_w, use_container_width=True)
 
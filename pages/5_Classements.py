@@ -1,7 +1,9 @@
 import streamlit as st
+import plotly.express as px
 from scr.config import configure_page
-from scr.ui import selections_courantes
-from scr.data import chargement_session, classement_session, calcul_classement_pilote, calcul_classement_constructeur
+from scr.ui import selections_courantes, donnees_session
+from scr.data import progression_championnat
+from scr.championnat import classement_apres
 
 configure_page("F1 Analytics – Classements")
 
@@ -12,21 +14,15 @@ t1, t2 = st.tabs(["Classement session", "Championnat"])
 
 annee, grand_prix, session_type, loaded = selections_courantes(required=True)
 
-data = chargement_session(annee, grand_prix, session_type)
-tours = data["tours"]
-pilotes = data["pilotes"]
-
 if not loaded:
     st.info("Charge d’abord une session depuis la page Home")
     st.stop()
 
-data = chargement_session(annee, grand_prix, session_type)
-tours = data['tours']
-resultats = data['resultats']
+data = donnees_session(annee, grand_prix, session_type, parties=("tours", "resultats"))
 
 with t1:
     st.subheader(f"Classement – {session_type}")
-    cls = classement_session(tours, resultats, session_type)
+    cls = data['derivees']['classement']
     if not cls.empty:
         # Ajout logos : TeamName + Driver
         df = cls.copy()
@@ -38,25 +34,40 @@ with t1:
         st.info("Classement indisponible pour cette session.")
 
 with t2:
+    with st.spinner("Calcul de la progression du championnat..."):
+        progression = progression_championnat(annee, grand_prix)
+    if not progression:
+        st.info("Championnat indisponible (données incomplètes ou accès réseau).")
+        st.stop()
+
+    manches = progression["manches"]
+    manche = st.select_slider(
+        "Classement après la manche",
+        options=manches.index.tolist(),
+        value=manches.index[-1],
+        format_func=lambda m: f"{m} – {manches[m]}",
+    )
+
     ctab1, ctab2 = st.tabs(["Pilotes", "Constructeurs"])
     with ctab1:
-        st.subheader("Championnat Pilotes (cumul jusqu'à l'épreuve sélectionnée)")
-        with st.spinner("Calcul des points cumulés pilotes..."):
-            standings = calcul_classement_pilote(annee, grand_prix)
+        st.subheader(f"Championnat Pilotes (après {manches[manche]})")
+        standings = classement_apres(progression["pilotes"], manche, progression["equipes_pilotes"])
         if not standings.empty:
-            df = standings.copy()
-            if "BroadcastName" in df:
-                # Pilote : pas systématique d'avoir code rapide, on garde juste nom ou on peut mettre photo si mapping dispo
-                df["BroadcastName"] = df["BroadcastName"].apply(lambda name: name)
-            st.write(df.to_html(escape=False, index=False), unsafe_allow_html=True)
+            st.write(standings.to_html(escape=False, index=False), unsafe_allow_html=True)
+            fig = px.line(progression["pilotes"], markers=True,
+                          labels={"RoundNumber": "Manche", "value": "Points", "BroadcastName": "Pilote"})
+            fig.add_vline(x=manche, line_dash="dot")
+            st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Classement pilotes indisponible (données incomplètes ou accès réseau).")
     with ctab2:
-        st.subheader("Championnat Constructeurs (cumul jusqu'à l'épreuve sélectionnée)")
-        with st.spinner("Calcul des points cumulés constructeurs..."):
-            cstand = calcul_classement_constructeur(annee, grand_prix)
+        st.subheader(f"Championnat Constructeurs (après {manches[manche]})")
+        cstand = classement_apres(progression["equipes"], manche)
         if not cstand.empty:
-            df = cstand.copy()
-            st.write(df.to_html(escape=False, index=False), unsafe_allow_html=True)
+            st.write(cstand.to_html(escape=False, index=False), unsafe_allow_html=True)
+            fig = px.line(progression["equipes"], markers=True,
+                          labels={"RoundNumber": "Manche", "value": "Points", "TeamName": "Équipe"})
+            fig.add_vline(x=manche, line_dash="dot")
+            st.plotly_chart(fig, use_container_width=True)
         else:
-            st.info("Classement constructeurs indisponible (données incomplètes ou accès réseau).")
\ No newline at end of file
+            st.info("Classement constructeurs indisponible (données incomplètes ou accès réseau).")
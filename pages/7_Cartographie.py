@@ -1,8 +1,8 @@
-from scr.data import figure_carte_vitesse, figure_carte_rapports, figure_carte_virages
+from scr.graphiques import figure_carte_vitesse, figure_carte_rapports, figure_carte_virages, figure_carte_mini_secteurs
 import streamlit as st
 from scr.config import configure_page
-from scr.data import chargement_session
-from scr.ui import selections_courantes, selecteur_pilote_unique
+from scr.rendu import image_figure
+from scr.ui import selections_courantes, selecteur_pilote_unique, donnees_session
 from streamlit_extras.colored_header import colored_header
 
 
@@ -18,7 +18,7 @@ if not loaded:
     st.page_link("Home.py", label="🏠 Retour à la Home")
     st.stop()
 
-data = chargement_session(annee, grand_prix, session_type)
+data = donnees_session(annee, grand_prix, session_type, parties=("tours", "resultats", "telemetrie"))
 sess = data["session"]
 pilotes = data['pilotes']
 
@@ -27,18 +27,23 @@ with st.sidebar:
 
 
 colored_header("Carte du circuit", description=None, color_name="blue-70")
-# Carte simple (tour le plus rapide de la session)
-fig = figure_carte_virages(sess)
-st.pyplot(fig)
+# Carte simple (tour le plus rapide de la session) ; les images rendues sont mises en cache
+st.image(image_figure(figure_carte_virages, sess), width="stretch")
 
 colored_header("Vitesse sur le tour le plus rapide", description=None, color_name="blue-70")
-fig = figure_carte_vitesse(sess, pilote=pilote)
-st.pyplot(fig)
+st.image(image_figure(figure_carte_vitesse, sess, pilote=pilote), width="stretch")
 
 colored_header("Changements de rapport sur le tour le plus rapide", description=None, color_name="blue-70")
-fig = figure_carte_rapports(sess, pilote=pilote)
-st.pyplot(fig)
+st.image(image_figure(figure_carte_rapports, sess, pilote=pilote), width="stretch")
+
+colored_header("Mini-secteurs les plus rapides", description=None, color_name="blue-70")
+col_n, col_par = st.columns(2)
+with col_n:
+    n_secteurs = st.slider("Nombre de mini-secteurs", 5, 50, 25, key="n_mini_secteurs")
+with col_par:
+    par = st.radio("Colorier par", ["pilote", "equipe"], format_func={"pilote": "Pilote", "equipe": "Équipe"}.get,
+                   horizontal=True, key="mini_secteurs_par")
+st.image(image_figure(figure_carte_mini_secteurs, sess, n_secteurs=n_secteurs, par=par), width="stretch")
 
 # Tour 10 de LEC avec traits plus fins
-#fig = figure_carte_rapports(sess, pilote="LEC", lap_number=10, linewidth_track=12, linewidth_gears=3)
-#st.pyplot(fig)
+#st.image(image_figure(figure_carte_rapports, sess, pilote="LEC", lap_number=10, linewidth_track=12, linewidth_gears=3))
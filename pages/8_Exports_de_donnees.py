@@ -1,7 +1,7 @@
 import streamlit as st
 from scr.config import configure_page
-from scr.ui import selections_courantes
-from scr.data import chargement_session
+from scr.ui import selections_courantes, donnees_session
+from scr.exports import FORMATS_EXPORT, export_session, nom_fichier
 from scr.ui import context_sidebar_only
 
 with open("f1_theme.css") as f:
@@ -18,24 +18,19 @@ if not loaded:
     st.page_link("Home.py", label="🏠 Retour à la Home")
     st.stop()
 
-data = chargement_session(annee, grand_prix, session_type)
-tours = data["tours"]
-pilotes = data["pilotes"]
-
-data = chargement_session(annee, grand_prix, session_type)
-tours = data['tours']
-meteo = data['meteo']
-resultats = data['resultats']
-
-if not tours.empty:
-    csv = tours.to_csv(index=False).encode('utf-8')
-    st.download_button("Télécharger tous les tours (CSV)", data=csv,
-                       file_name=f"laps_full_{annee}_{grand_prix}_{session_type}.csv", mime="text/csv")
-if not meteo.empty:
-    csvw = meteo.to_csv(index=False).encode('utf-8')
-    st.download_button("Télécharger météo (CSV)", data=csvw,
-                       file_name=f"weather_{annee}_{grand_prix}_{session_type}.csv", mime="text/csv")
-if not resultats.empty:
-    csvr = resultats.to_csv(index=False).encode('utf-8')
-    st.download_button("Télécharger résultats (CSV)", data=csvr,
-                       file_name=f"results_{annee}_{grand_prix}_{session_type}.csv", mime="text/csv")
\ No newline at end of file
+data = donnees_session(annee, grand_prix, session_type, parties=("tours", "meteo", "resultats"))
+
+format_export = st.radio("Format", list(FORMATS_EXPORT), format_func=lambda f: FORMATS_EXPORT[f][2],
+                         horizontal=True, key="format_export")
+_, mime, libelle = FORMATS_EXPORT[format_export]
+
+# Fichiers produits seulement au clic, en flux (les petits restent en cache par session et format)
+TABLES = [("tours", "Télécharger tous les tours", "laps_full"),
+          ("meteo", "Télécharger météo", "weather"),
+          ("resultats", "Télécharger résultats", "results")]
+for nom, label, prefixe in TABLES:
+    if not data[nom].empty:
+        st.download_button(f"{label} ({libelle})",
+                           data=lambda nom=nom: export_session(data, nom, format_export),
+                           file_name=nom_fichier(f"{prefixe}_{annee}_{grand_prix}_{session_type}", format_export),
+                           mime=mime, on_click="ignore", key=f"export_{nom}")
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Budget mémoire du magasin de sessions (en Mo), réglable par variable d'environnement.
+BUDGET_SESSIONS_MO = int(os.environ.get("F1_BUDGET_SESSIONS_MO", "1024"))
+# Budget du cache de télémétrie par tour (en Mo).
+BUDGET_TELEMETRIE_MO = int(os.environ.get("F1_BUDGET_TELEMETRIE_MO", "256"))
+# Budget du cache des figures rendues (PNG / SVG, en Mo).
+BUDGET_FIGURES_MO = int(os.environ.get("F1_BUDGET_FIGURES_MO", "64"))
+# Budget du cache des fichiers d'export (CSV, Parquet... en Mo).
+BUDGET_EXPORTS_MO = int(os.environ.get("F1_BUDGET_EXPORTS_MO", "128"))
+
+
+class DictionnaireFige(dict):
+    """
+    Dictionnaire en lecture seule, partagé tel quel entre les utilisateurs.
+
+    Les objets contenus (DataFrames, Session FastF1) ne sont pas copiés : les
+    appelants doivent faire un `.copy()` avant toute modification.
+    """
+
+    def _lecture_seule(self, *args, **kwargs):
+        raise TypeError("Les données de session partagées sont en lecture seule.")
+
+    __setitem__ = __delitem__ = _lecture_seule
+    clear = pop = popitem = setdefault = update = _lecture_seule
+
+
+def estimer_taille(obj, _vus: set | None = None, _profondeur: int = 0) -> int:
+    """
+    Estime l'empreinte mémoire (en octets) d'un objet et de ce qu'il référence.
+
+    Paramètres
+    ----------
+    obj : object
+        Objet à mesurer (DataFrame, tableau NumPy, dict, Session FastF1...).
+
+    Retour
+    ------
+    int
+        Estimation du nombre d'octets. Les objets partagés ne sont comptés qu'une fois.
+    """
+    if _vus is None:
+        _vus = set()
+    if id(obj) in _vus:
+        return 0
+    _vus.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            estimer_taille(k, _vus, _profondeur + 1) + estimer_taille(v, _vus, _profondeur + 1)
+            for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimer_taille(v, _vus, _profondeur + 1) for v in obj)
+    # Objets quelconques (Session FastF1...) : on suit leurs attributs sur quelques niveaux
+    if _profondeur < 3 and hasattr(obj, "__dict__") and not isinstance(obj, type):
+        return sys.getsizeof(obj) + estimer_taille(vars(obj), _vus, _profondeur + 1)
+    return sys.getsizeof(obj)
+
+
+def cle_session(sess) -> tuple:
+    """Identifiant d'une session FastF1 dans les caches : (année, événement, session)."""
+    return int(sess.event.year), sess.event['EventName'], sess.name
+
+
+class MagasinSessions:
+    """
+    Cache mémoire partagé par tout le processus, sans sérialisation.
+
+    Contrairement à `st.cache_data`, qui désérialise une copie à chaque accès,
+    le magasin renvoie toujours les mêmes objets. Les entrées sont évincées par
+    ordre d'utilisation (LRU) dès que la taille estimée dépasse le budget.
+    Une valeur None (chargement en échec) n'est jamais conservée.
+
+    Paramètres
+    ----------
+    budget_octets : int
+        Taille totale maximale des entrées conservées, en octets.
+    """
+
+    def __init__(self, budget_octets: int):
+        self.budget_octets = int(budget_octets)
+        self._entrees: OrderedDict = OrderedDict()
+        self._octets = 0
+        self._verrou = threading.Lock()
+        # Clé → [verrou, nombre de threads qui l'utilisent] ; retiré quand plus personne ne l'attend
+        self._verrous_cles: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def _verrou_cle(self, cle):
+        with self._verrou:
+            verrou = self._verrous_cles.setdefault(cle, [threading.Lock(), 0])
+            verrou[1] += 1
+        try:
+            with verrou[0]:
+                yield
+        finally:
+            with self._verrou:
+                verrou[1] -= 1
+                if not verrou[1]:
+                    del self._verrous_cles[cle]
+
+    def _consulter(self, cle, accepte):
+        """Renvoie (entrée acceptée ou None, valeur précédente éventuelle)."""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None:
+                return None, None
+            valeur, _ = entree
+            if accepte is not None and not accepte(valeur):
+                return None, valeur
+            self._entrees.move_to_end(cle)
+            self.hits += 1
+            return valeur, valeur
+
+    def obtenir_ou_charger(self, cle, charger, accepte=None):
+        """
+        Renvoie la valeur en cache pour `cle`, ou la charge une seule fois.
+
+        Paramètres
+        ----------
+        cle : hashable
+            Clé de l'entrée.
+        charger : callable
+            Fonction `charger(precedente)` appelée en cas d'absence ; reçoit la
+            valeur précédente (ou None) pour pouvoir la compléter. Si elle
+            renvoie None, rien n'est conservé : le prochain appel recharge.
+        accepte : callable | None
+            Prédicat indiquant si une valeur présente convient. Une valeur
+            refusée est rechargée (compte comme un miss).
+
+        Retour
+        ------
+        object
+            La valeur partagée (jamais copiée).
+        """
+        valeur, _ = self._consulter(cle, accepte)
+        if valeur is not None:
+            return valeur
+
+        # Un seul chargement à la fois par clé : les autres threads attendent puis relisent
+        with self._verrou_cle(cle):
+            valeur, precedente = self._consulter(cle, accepte)
+            if valeur is not None:
+                return valeur
+            with self._verrou:
+                self.misses += 1
+            valeur = charger(precedente)
+            self.deposer(cle, valeur)
+            return valeur
+
+    def lire(self, cle):
+        """Valeur présente pour `cle`, ou None ; ne déclenche aucun chargement ni attente."""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            return None if entree is None else entree[0]
+
+    def deposer(self, cle, valeur):
+        """Insère (ou remplace) une entrée puis évince les plus anciennes si besoin ; None retire l'entrée."""
+        taille = estimer_taille(valeur) if valeur is not None else 0
+        with self._verrou:
+            ancienne = self._entrees.pop(cle, None)
+            if ancienne is not None:
+                self._octets -= ancienne[1]
+            if valeur is None:
+                return
+            self._entrees[cle] = (valeur, taille)
+            self._octets += taille
+            # On garde toujours l'entrée la plus récente, même si elle dépasse seule le budget
+            while self._octets > self.budget_octets and len(self._entrees) > 1:
+                _, (_, taille_evincee) = self._entrees.popitem(last=False)
+                self._octets -= taille_evincee
+                self.evictions += 1
+
+    def vider(self):
+        """Supprime toutes les entrées (les compteurs sont conservés)."""
+        with self._verrou:
+            self._entrees.clear()
+            self._octets = 0
+
+    def statistiques(self) -> dict:
+        """
+        Retourne l'état du magasin.
+
+        Retour
+        ------
+        dict
+            hits, misses, evictions, entrees, octets, budget_octets.
+        """
+        with self._verrou:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entrees=len(self._entrees),
+                octets=self._octets,
+                budget_octets=self.budget_octets,
+            )
+
+
+MAGASIN_SESSIONS = MagasinSessions(BUDGET_SESSIONS_MO * 1024 * 1024)
+MAGASIN_TELEMETRIE = MagasinSessions(BUDGET_TELEMETRIE_MO * 1024 * 1024)
+MAGASIN_FIGURES = MagasinSessions(BUDGET_FIGURES_MO * 1024 * 1024)
+MAGASIN_EXPORTS = MagasinSessions(BUDGET_EXPORTS_MO * 1024 * 1024)
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import fastf1
+import pandas as pd
+
+from .instantane import ecrire_table, lire_table
+
+_logger = logging.getLogger(__name__)
+
+# Première saison proposée par les sélecteurs
+ANNEE_MIN = 2018
+# Durée de validité du calendrier de la saison en cours (s) : les saisons passées ne changent plus
+TTL_CALENDRIER_S = float(os.environ.get("F1_TTL_CALENDRIER_S", "3600"))
+# Délai avant de retenter un calendrier introuvable (s)
+TTL_ECHEC_S = 60.0
+
+NOM_DOSSIER = "calendriers"
+
+# Nom de session FastF1 → identifiant accepté par `fastf1.get_session`
+TYPES_SESSION = {
+    "Practice 1": "FP1", "Practice 2": "FP2", "Practice 3": "FP3",
+    "Qualifying": "Q", "Sprint Shootout": "SS", "Sprint Qualifying": "SQ",
+    "Sprint": "S", "Race": "R",
+}
+
+COLONNES_CALENDRIER = ["RoundNumber", "Country", "Location", "EventName", "EventDate", "EventFormat",
+                       *(f"Session{i}" for i in range(1, 6)), *(f"Session{i}DateUtc" for i in range(1, 6))]
+
+_CALENDRIERS: dict[int, tuple] = {}
+_VERROUS: dict[int, threading.Lock] = {}
+_VERROU = threading.Lock()
+# Téléchargements hors des réexécutions : revalidations et préchargement
+_EXECUTEUR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="calendrier")
+_REVALIDATIONS: dict[int, Future] = {}
+_PRECHARGEMENT = None
+
+
+class Calendrier:
+    """
+    Calendrier d'une saison, indexé par nom d'épreuve.
+
+    Manche, date et sessions d'une épreuve sont lues par un seul accès
+    dictionnaire. À obtenir via `calendrier` (mis en cache, mémoire et disque).
+
+    Attributs
+    ---------
+    annee : int
+        Saison.
+    table : pd.DataFrame
+        Une ligne par épreuve (hors essais hivernaux), colonnes `COLONNES_CALENDRIER`.
+    noms : tuple[str, ...]
+        Noms des épreuves, dans l'ordre du calendrier.
+    """
+
+    def __init__(self, annee: int, table: pd.DataFrame):
+        self.annee = int(annee)
+        self.table = table.reset_index(drop=True)
+        self.noms = tuple(self.table["EventName"])
+        self._index = {}
+        for i, ligne in enumerate(self.table.itertuples(index=False)):
+            ligne = ligne._asdict()
+            sessions = {}
+            for n in range(1, 6):
+                nom_session = ligne.get(f"Session{n}")
+                if isinstance(nom_session, str) and nom_session in TYPES_SESSION:
+                    sessions[TYPES_SESSION[nom_session]] = ligne.get(f"Session{n}DateUtc")
+            self._index[ligne["EventName"]] = dict(
+                position=i, manche=int(ligne["RoundNumber"]), date=ligne["EventDate"], sessions=sessions,
+            )
+
+    def __contains__(self, nom: str) -> bool:
+        return nom in self._index
+
+    def manche(self, nom: str) -> int:
+        """Numéro de manche de l'épreuve `nom` (KeyError si inconnue)."""
+        return self._index[nom]["manche"]
+
+    def date(self, nom: str) -> pd.Timestamp:
+        """Date de l'épreuve (jour de la course)."""
+        return self._index[nom]["date"]
+
+    def types_session(self, nom: str) -> tuple[str, ...]:
+        """Sessions du week-end ("FP1", "Q", "S", "R"...), dans l'ordre."""
+        return tuple(self._index[nom]["sessions"])
+
+    def date_session(self, nom: str, sess_type: str) -> pd.Timestamp | None:
+        """Date UTC (sans fuseau) d'une session du week-end, None si absente."""
+        return self._index[nom]["sessions"].get(sess_type)
+
+    def jusqua(self, nom: str) -> pd.DataFrame:
+        """Lignes du calendrier de la première manche jusqu'à `nom` inclus."""
+        return self.table.iloc[:self._index[nom]["position"] + 1]
+
+
+def fichier_calendrier(annee: int) -> Path | None:
+    """Fichier du calendrier dans le cache FastF1 (None si le cache n'est pas activé)."""
+    racine = getattr(fastf1.Cache, "_CACHE_DIR", None)
+    if not racine:
+        return None
+    return Path(racine) / NOM_DOSSIER / f"calendrier_{annee}.arrow"
+
+
+def _saison_terminee(annee: int) -> bool:
+    return annee < datetime.now().year
+
+
+def _frais(annee: int, horodatage: float) -> bool:
+    return _saison_terminee(annee) or time.time() - horodatage < TTL_CALENDRIER_S
+
+
+def _lire(annee: int) -> tuple[Calendrier, float] | None:
+    chemin = fichier_calendrier(annee)
+    if chemin is None or not chemin.exists():
+        return None
+    try:
+        return Calendrier(annee, lire_table(chemin)), chemin.stat().st_mtime
+    except Exception as e:
+        _logger.warning("Calendrier %s illisible sur disque : %s", annee, e)
+        return None
+
+
+def _telecharger(annee: int) -> Calendrier:
+    calendrier_fastf1 = fastf1.get_event_schedule(annee, include_testing=False)
+    table = pd.DataFrame(calendrier_fastf1).reindex(columns=COLONNES_CALENDRIER)
+    cal = Calendrier(annee, table)
+    chemin = fichier_calendrier(annee)
+    if chemin is not None:
+        try:
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            ecrire_table(cal.table, chemin)
+        except Exception as e:
+            _logger.warning("Calendrier %s non écrit : %s", annee, e)
+    return cal
+
+
+def _valide(annee: int, entree: tuple | None) -> bool:
+    if entree is None:
+        return False
+    if entree[0] is None:
+        return time.time() - entree[1] < TTL_ECHEC_S
+    return _frais(annee, entree[1])
+
+
+def _verrou_annee(annee: int) -> threading.Lock:
+    with _VERROU:
+        return _VERROUS.setdefault(annee, threading.Lock())
+
+
+def _telecharger_ou_conserver(annee: int, connu: tuple | None) -> Calendrier | None:
+    """Télécharge le calendrier ; en cas d'échec, garde `connu` (à appeler sous le verrou de la saison)."""
+    try:
+        _CALENDRIERS[annee] = (_telecharger(annee), time.time())
+    except Exception as e:
+        if connu is not None:
+            _logger.warning("Calendrier %s non revalidé, ancienne version conservée : %s", annee, e)
+            # Nouvel essai dans TTL_ECHEC_S secondes, pas à chaque appel
+            _CALENDRIERS[annee] = (connu[0], time.time() - TTL_CALENDRIER_S + TTL_ECHEC_S)
+        else:
+            _logger.warning("Calendrier %s indisponible : %s", annee, e)
+            _CALENDRIERS[annee] = (None, time.time())
+    return _CALENDRIERS[annee][0]
+
+
+def _revalider(annee: int) -> Calendrier | None:
+    with _verrou_annee(annee):
+        entree = _CALENDRIERS.get(annee)
+        # Un autre thread a pu le revalider entre-temps
+        if _valide(annee, entree):
+            return entree[0]
+        connu = entree if entree is not None and entree[0] is not None else None
+        return _telecharger_ou_conserver(annee, connu)
+
+
+def revalider(annee: int) -> Future:
+    """
+    Revalide le calendrier d'une saison en arrière-plan (une seule fois à la fois).
+
+    Retour
+    ------
+    concurrent.futures.Future
+        Revalidation en cours ; son résultat est celui de `calendrier`.
+    """
+    annee = int(annee)
+    with _VERROU:
+        futur = _REVALIDATIONS.get(annee)
+        if futur is None or futur.done():
+            futur = _REVALIDATIONS[annee] = _EXECUTEUR.submit(_revalider, annee)
+        return futur
+
+
+def calendrier(annee: int) -> Calendrier | None:
+    """
+    Calendrier d'une saison, depuis la mémoire, le disque ou FastF1.
+
+    Les saisons passées sont conservées indéfiniment ; celle en cours est
+    revalidée après `TTL_CALENDRIER_S` secondes. La revalidation (comme le
+    nouvel essai après un échec) se fait en arrière-plan : l'appel sert
+    aussitôt le dernier calendrier connu, même périmé, sans attendre le
+    réseau. Seul un calendrier encore jamais obtenu (ni en mémoire ni sur
+    disque) est téléchargé pendant l'appel.
+
+    Paramètres
+    ----------
+    annee : int
+        Saison.
+
+    Retour
+    ------
+    Calendrier | None
+        None si aucun calendrier n'a jamais pu être obtenu (nouvel essai en
+        arrière-plan après `TTL_ECHEC_S` secondes).
+    """
+    annee = int(annee)
+    entree = _CALENDRIERS.get(annee)
+    if entree is None:
+        with _verrou_annee(annee):
+            # Un autre thread a pu le charger pendant l'attente
+            entree = _CALENDRIERS.get(annee)
+            if entree is None:
+                entree = _lire(annee)
+                if entree is None:
+                    return _telecharger_ou_conserver(annee, None)
+                _CALENDRIERS[annee] = entree
+    if not _valide(annee, entree):
+        revalider(annee)
+    return entree[0]
+
+
+def noms_courses(annee: int) -> tuple[str, ...]:
+    """Noms des épreuves d'une saison (vide si le calendrier est indisponible)."""
+    cal = calendrier(annee)
+    return cal.noms if cal is not None else ()
+
+
+def saisons() -> list[int]:
+    """Saisons proposées, de la plus récente à `ANNEE_MIN`."""
+    return list(range(datetime.now().year, ANNEE_MIN - 1, -1))
+
+
+def precharger(annees=None) -> list[Future]:
+    """
+    Charge en arrière-plan le calendrier de la saison en cours (une seule fois
+    par processus), pour que les sélecteurs l'aient dès leur premier affichage.
+    Les autres saisons sont chargées à leur première sélection.
+
+    Paramètres
+    ----------
+    annees : iterable[int] | None, optionnel
+        Saisons à charger, None pour la saison en cours.
+    """
+    global _PRECHARGEMENT
+    with _VERROU:
+        if _PRECHARGEMENT is None:
+            _PRECHARGEMENT = [_EXECUTEUR.submit(calendrier, a) for a in (annees or (datetime.now().year,))]
+        return _PRECHARGEMENT
+
+
+def vider():
+    """Oublie les calendriers gardés en mémoire (les fichiers sur disque restent)."""
+    global _PRECHARGEMENT
+    with _VERROU:
+        _CALENDRIERS.clear()
+        _PRECHARGEMENT = None
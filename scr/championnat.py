@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import fastf1
+import pandas as pd
+
+from .instantane import DELAI_RESULTATS_DEFINITIFS, ecrire_table, lire_table
+
+# À incrémenter si les colonnes du registre changent (l'ancien fichier est alors ignoré).
+VERSION_REGISTRE = 1
+
+COLONNES_REGISTRE = ["RoundNumber", "EventName", "DriverNumber", "Abbreviation",
+                     "BroadcastName", "TeamName", "Points"]
+
+# Délai avant de retenter une manche en échec ou sans points publiés (s)
+DELAI_NOUVEL_ESSAI_S = float(os.environ.get("F1_DELAI_NOUVEL_ESSAI_S", "300"))
+
+_REGISTRES: dict[int, pd.DataFrame] = {}
+# (année, manche) → instant du dernier essai infructueux (ou de la dernière lecture provisoire)
+_ESSAIS: dict[tuple[int, int], float] = {}
+# Année → manches aux résultats encore provisoires : en mémoire seulement, relues ensuite
+_PROVISOIRES: dict[int, set[int]] = {}
+_VERROUS: dict[int, threading.Lock] = {}
+_VERROU = threading.Lock()
+
+
+def chemin_registre(annee: int) -> Path | None:
+    """
+    Fichier du registre de points d'une saison, dans le cache FastF1.
+
+    Retour
+    ------
+    Path | None
+        Par ex. cache/2025/registre_points_v1.arrow, ou None si le cache est désactivé.
+    """
+    racine = getattr(fastf1.Cache, "_CACHE_DIR", None)
+    if not racine:
+        return None
+    return Path(racine) / str(annee) / f"registre_points_v{VERSION_REGISTRE}.arrow"
+
+
+def _registre_vide() -> pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype="float64" if c == "Points" else "int64" if c == "RoundNumber" else "object")
+                         for c in COLONNES_REGISTRE})
+
+
+def lire_registre(annee: int) -> pd.DataFrame:
+    """
+    Retourne le registre de points connu pour une saison (mémoire, puis disque).
+
+    Paramètres
+    ----------
+    annee : int
+        L'année de la saison.
+
+    Retour
+    ------
+    pd.DataFrame
+        Une ligne par pilote et par course : RoundNumber, EventName, DriverNumber,
+        Abbreviation, BroadcastName, TeamName, Points. Vide si rien n'est enregistré.
+    """
+    if annee in _REGISTRES:
+        return _REGISTRES[annee]
+    chemin = chemin_registre(annee)
+    registre = _registre_vide()
+    if chemin is not None and chemin.exists():
+        try:
+            registre = lire_table(chemin)
+        except Exception:
+            pass
+    _REGISTRES[annee] = registre
+    return registre
+
+
+def lignes_manche(resultats: pd.DataFrame, manche: int, nom: str) -> pd.DataFrame | None:
+    """
+    Extrait les lignes du registre depuis les résultats d'une course.
+
+    Retour
+    ------
+    pd.DataFrame | None
+        None si les résultats sont absents ou incomplets (points non publiés) :
+        la manche sera retentée plus tard au lieu d'être figée à zéro.
+    """
+    if resultats is None or resultats.empty or not {'BroadcastName', 'TeamName', 'Points'} <= set(resultats.columns):
+        return None
+    if resultats['Points'].isna().all():
+        return None
+    lignes = pd.DataFrame({c: resultats[c].to_numpy() if c in resultats else None
+                           for c in COLONNES_REGISTRE if c not in ("RoundNumber", "EventName")})
+    lignes['Points'] = pd.to_numeric(lignes['Points'], errors='coerce').fillna(0.0)
+    lignes.insert(0, 'EventName', nom)
+    lignes.insert(0, 'RoundNumber', int(manche))
+    return lignes[COLONNES_REGISTRE]
+
+
+def resultats_definitifs(date) -> bool:
+    """
+    Indique si les résultats d'une manche disputée à `date` peuvent être figés.
+
+    Même règle que `instantane.resultats_definitifs` : pas avant
+    `DELAI_RESULTATS_DEFINITIFS` après la course (pénalités, disqualifications,
+    appels). `date` est le jour de la course (EventDate), compté jusqu'à sa fin.
+    Sans date connue, les résultats sont tenus pour définitifs.
+    """
+    if date is None or pd.isna(date):
+        return True
+    date = pd.Timestamp(date)
+    if date.tzinfo is not None:
+        date = date.tz_convert("UTC").tz_localize(None)
+    return pd.Timestamp.now("UTC").tz_localize(None) >= date + pd.Timedelta(days=1) + DELAI_RESULTATS_DEFINITIFS
+
+
+def completer_registre(annee: int, manches: pd.DataFrame, charger) -> pd.DataFrame:
+    """
+    Ajoute au registre de la saison les courses qui n'y figurent pas encore.
+
+    Seules les manches manquantes sont chargées ; le registre complété est
+    conservé en mémoire et réécrit sur disque. Une manche en échec ou sans
+    points publiés est retentée au plus toutes les `DELAI_NOUVEL_ESSAI_S` secondes.
+    Une manche trop récente (voir `resultats_definitifs`) figure au registre
+    mais n'est pas écrite sur disque : ses résultats sont relus avec le même
+    délai, jusqu'à ce qu'ils soient définitifs.
+
+    Paramètres
+    ----------
+    annee : int
+        L'année de la saison.
+    manches : pd.DataFrame
+        Colonnes RoundNumber et EventName des courses à couvrir, et EventDate
+        si elle est connue.
+    charger : callable
+        `charger(noms_evenements)` renvoie un dict nom → DataFrame des résultats,
+        pour toutes les manches manquantes d'un coup (chargement groupé). Une
+        course absente du dict ou aux résultats incomplets est laissée de côté.
+
+    Retour
+    ------
+    pd.DataFrame
+        Le registre de la saison (voir `lire_registre`).
+    """
+    with _VERROU:
+        verrou = _VERROUS.setdefault(annee, threading.Lock())
+    with verrou:
+        registre = lire_registre(annee)
+        provisoires = _PROVISOIRES.setdefault(annee, set())
+        connues = set(registre['RoundNumber'].tolist()) - provisoires
+        maintenant = time.monotonic()
+        dates = manches['EventDate'] if 'EventDate' in manches else pd.Series(None, index=manches.index)
+        manquantes = [(int(manche), nom, date)
+                      for manche, nom, date in zip(manches['RoundNumber'], manches['EventName'], dates)
+                      if int(manche) not in connues
+                      and maintenant - _ESSAIS.get((annee, int(manche)), -float("inf")) >= DELAI_NOUVEL_ESSAI_S]
+        resultats = charger([nom for _, nom, _ in manquantes]) if manquantes else {}
+        nouvelles, definitives = [], False
+        for manche, nom, date in manquantes:
+            lignes = lignes_manche(resultats.get(nom), manche, nom)
+            if lignes is None:
+                _ESSAIS[(annee, manche)] = maintenant
+                continue
+            nouvelles.append(lignes)
+            if resultats_definitifs(date):
+                provisoires.discard(manche)
+                _ESSAIS.pop((annee, manche), None)
+                definitives = True
+            else:
+                provisoires.add(manche)
+                _ESSAIS[(annee, manche)] = maintenant
+
+        if nouvelles:
+            # Une manche provisoire relue remplace ses lignes précédentes
+            relues = [int(lignes['RoundNumber'].iloc[0]) for lignes in nouvelles]
+            registre = (pd.concat([registre[~registre['RoundNumber'].isin(relues)], *nouvelles], ignore_index=True)
+                          .sort_values('RoundNumber', kind='stable')
+                          .reset_index(drop=True))
+            chemin = chemin_registre(annee)
+            if chemin is not None and definitives:
+                try:
+                    chemin.parent.mkdir(parents=True, exist_ok=True)
+                    ecrire_table(registre[~registre['RoundNumber'].isin(provisoires)].reset_index(drop=True), chemin)
+                except Exception:
+                    pass
+            _REGISTRES[annee] = registre
+    return registre
+
+
+def progression(registre: pd.DataFrame, par: str = 'BroadcastName') -> pd.DataFrame:
+    """
+    Points cumulés après chaque manche, en une seule passe sur le registre.
+
+    Paramètres
+    ----------
+    registre : pd.DataFrame
+        Registre de la saison (voir `lire_registre`).
+    par : str, optionnel
+        'BroadcastName' (pilotes, par défaut) ou 'TeamName' (constructeurs).
+
+    Retour
+    ------
+    pd.DataFrame
+        Index RoundNumber, une colonne par pilote / équipe. NaN tant que le
+        pilote ou l'équipe n'a pas encore pris part à une course.
+    """
+    if registre.empty:
+        return pd.DataFrame()
+    brut = registre.pivot_table(index='RoundNumber', columns=par, values='Points', aggfunc='sum').sort_index()
+    return brut.fillna(0.0).cumsum().where(brut.notna().cumsum() > 0)
+
+
+def equipes_par_manche(registre: pd.DataFrame) -> pd.DataFrame:
+    """
+    Équipe de chaque pilote après chaque manche (dernière équipe connue).
+
+    Retour
+    ------
+    pd.DataFrame
+        Index RoundNumber, une colonne par BroadcastName.
+    """
+    if registre.empty:
+        return pd.DataFrame()
+    return (registre.pivot_table(index='RoundNumber', columns='BroadcastName', values='TeamName', aggfunc='last')
+                    .sort_index().ffill())
+
+
+def classement_apres(progression_df: pd.DataFrame, manche: int, equipes: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Classement après une manche, lu directement dans la matrice de progression.
+
+    Paramètres
+    ----------
+    progression_df : pd.DataFrame
+        Matrice renvoyée par `progression`.
+    manche : int
+        Numéro de manche (la dernière manche enregistrée ≤ `manche` est utilisée).
+    equipes : pd.DataFrame | None, optionnel
+        Matrice de `equipes_par_manche`, pour ajouter TeamName au classement pilotes.
+
+    Retour
+    ------
+    pd.DataFrame
+        Colonnes : Position, <pilote ou équipe>, [TeamName], Points. Vide si aucune course.
+    """
+    lignes = progression_df.loc[:manche]
+    if lignes.empty:
+        return pd.DataFrame()
+    cle = progression_df.columns.name
+    standings = (lignes.iloc[-1].dropna().rename('Points')
+                       .sort_values(ascending=False, kind='stable')
+                       .rename_axis(cle).reset_index())
+    if equipes is not None and not equipes.empty:
+        standings.insert(1, 'TeamName', standings[cle].map(equipes.loc[:manche].iloc[-1]))
+    standings.insert(0, 'Position', standings.index + 1)
+    return standings
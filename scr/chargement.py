@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .calendrier import calendrier
+from .data import PARTIES_SESSION, chargement_session, donnees_disponibles
+
+_logger = logging.getLogger(__name__)
+
+# Chargements menés en même temps (chacun occupe un thread pendant toute la session)
+CHARGEMENTS_SIMULTANES = int(os.environ.get("F1_CHARGEMENTS_SIMULTANES", "2"))
+
+# Étapes d'un chargement : (nom, libellé, parties chargées à la fin de l'étape).
+# Chaque étape complète la session partagée : les pages affichent ce qui est
+# déjà là pendant que la suite arrive. Une étape ne fait analyser par FastF1
+# que sa propre partie, sur une copie de la session de l'étape précédente
+# (voir `chargement_session`) ; tours compactés, positions, index des pilotes
+# et tables dérivées (scr.derives) sont repris tels quels tant qu'ils ne changent pas.
+# Un chargement ne parcourt que les étapes des parties demandées, et chacune
+# ne charge que les parties demandées (une page sans télémétrie ne la paie pas).
+ETAPES = (
+    ("calendrier", "Calendrier", ()),
+    ("tours", "Temps au tour, résultats et tables dérivées", ("tours", "resultats")),
+    ("meteo", "Météo", ("tours", "resultats", "meteo")),
+    ("telemetrie", "Télémétrie", ("tours", "resultats", "meteo", "telemetrie")),
+    ("messages", "Messages de course", PARTIES_SESSION),
+)
+
+_EXECUTEUR = ThreadPoolExecutor(max_workers=CHARGEMENTS_SIMULTANES, thread_name_prefix="chargement")
+_EN_COURS: dict = {}
+_VERROU = threading.Lock()
+
+
+class ChargementAnnule(Exception):
+    """Chargement abandonné par tous ses demandeurs."""
+
+
+class Chargement:
+    """
+    Chargement d'une session en arrière-plan, par étapes.
+
+    Partagé par tous les utilisateurs qui demandent la même session : il n'est
+    annulé que lorsque le dernier d'entre eux l'abandonne. L'annulation prend
+    effet entre deux étapes (une étape FastF1 commencée va à son terme).
+    À obtenir via `lancer_chargement`.
+
+    Attributs
+    ---------
+    cle : tuple
+        (année, Grand Prix, type de session).
+    parties : tuple[str, ...]
+        Parties demandées.
+    etapes : tuple
+        Étapes à parcourir (sous-ensemble de `ETAPES`).
+    etape : str | None
+        Étape en cours (None avant le début ou une fois terminé).
+    terminees : list[str]
+        Étapes achevées.
+    etat : str
+        "en_attente", "en_cours", "termine", "annule" ou "echec".
+    erreur : Exception | None
+        Erreur de l'étape en échec.
+    """
+
+    def __init__(self, annee: int, course: str, sess_type: str, parties=None):
+        self.cle = (annee, course, sess_type)
+        voulues = set(PARTIES_SESSION if parties is None else parties)
+        self.parties = tuple(p for p in PARTIES_SESSION if p in voulues)
+        # Étapes utiles : le calendrier, puis celles qui apportent une partie demandée
+        self.etapes = tuple((nom, libelle, tuple(p for p in cumul if p in voulues))
+                            for i, (nom, libelle, cumul) in enumerate(ETAPES)
+                            if i == 0 or voulues & (set(cumul) - set(ETAPES[i - 1][2])))
+        self.etape = None
+        self.terminees: list[str] = []
+        self.etat = "en_attente"
+        self.erreur = None
+        self.debut = time.monotonic()
+        self._demandeurs = 0
+        self._annule = threading.Event()
+        self.futur = None
+
+    @property
+    def progression(self) -> float:
+        """Part des étapes achevées, entre 0 et 1."""
+        return len(self.terminees) / len(self.etapes)
+
+    @property
+    def libelle(self) -> str:
+        """Libellé de l'étape en cours (ou de l'état final)."""
+        noms = {nom: libelle for nom, libelle, _ in ETAPES}
+        if self.etat == "en_cours" and self.etape:
+            return noms[self.etape]
+        return {"en_attente": "En attente", "termine": "Terminé", "annule": "Annulé",
+                "echec": "Échec"}.get(self.etat, self.etat)
+
+    @property
+    def termine(self) -> bool:
+        return self.etat in ("termine", "annule", "echec")
+
+    def disponible(self, parties=()) -> bool:
+        """True si les `parties` sont déjà dans la session partagée."""
+        return donnees_disponibles(*self.cle, parties=parties) is not None
+
+    def abandonner(self):
+        """Retire un demandeur ; sans demandeur restant, le chargement est annulé."""
+        with _VERROU:
+            self._demandeurs = max(0, self._demandeurs - 1)
+            if self._demandeurs or self.termine:
+                return
+            self._annule.set()
+            if self.futur is not None and self.futur.cancel():
+                self.etat = "annule"
+            if _EN_COURS.get(self._cle_en_cours) is self:
+                del _EN_COURS[self._cle_en_cours]
+
+    @property
+    def _cle_en_cours(self) -> tuple:
+        return (*self.cle, self.parties)
+
+    def _executer(self):
+        annee, course, sess_type = self.cle
+        self.etat = "en_cours"
+        try:
+            for nom, _, parties in self.etapes:
+                if self._annule.is_set():
+                    raise ChargementAnnule()
+                self.etape = nom
+                # Étape déjà couverte (par une page ou un précédent chargement) : rien à faire
+                if donnees_disponibles(annee, course, sess_type, parties=parties) is None:
+                    if nom == "calendrier":
+                        # Calendrier en cache (scr.calendrier) : une course inconnue échoue tout de suite,
+                        # sans résoudre la session une seconde fois. Sans calendrier, FastF1 tranchera.
+                        cal = calendrier(annee)
+                        if cal is not None and course not in cal:
+                            raise ValueError(f"Épreuve inconnue pour {annee} : {course}")
+                    else:
+                        chargement_session(annee, course, sess_type, parties=parties)
+                self.terminees.append(nom)
+            self.etat = "termine"
+        except ChargementAnnule:
+            self.etat = "annule"
+        except Exception as e:
+            _logger.warning("Chargement %s interrompu à l'étape %s : %s", self.cle, self.etape, e)
+            self.erreur = e
+            self.etat = "echec"
+        finally:
+            self.etape = None
+            _logger.info("Chargement %s : %s en %.1f s", self.cle, self.etat, time.monotonic() - self.debut)
+            with _VERROU:
+                if _EN_COURS.get(self._cle_en_cours) is self:
+                    del _EN_COURS[self._cle_en_cours]
+
+
+def lancer_chargement(annee: int, course: str, sess_type: str, parties=None) -> Chargement:
+    """
+    Lance (ou rejoint) le chargement d'une session en arrière-plan.
+
+    Un chargement n'est partagé qu'entre demandeurs des mêmes parties ; deux
+    chargements d'une même session se complètent via `chargement_session`.
+
+    Paramètres
+    ----------
+    annee, course, sess_type :
+        Session à charger.
+    parties : iterable[str] | None, optionnel
+        Parties voulues (voir `scr.data.PARTIES_SESSION`), None pour toutes.
+
+    Retour
+    ------
+    Chargement
+        Suivi du chargement ; l'appelant devient l'un de ses demandeurs et
+        doit appeler `abandonner()` s'il n'en a plus besoin.
+    """
+    nouveau = Chargement(annee, course, sess_type, parties)
+    with _VERROU:
+        chargement = _EN_COURS.get(nouveau._cle_en_cours)
+        if chargement is None:
+            chargement = nouveau
+            _EN_COURS[chargement._cle_en_cours] = chargement
+            chargement.futur = _EXECUTEUR.submit(chargement._executer)
+        chargement._demandeurs += 1
+        return chargement
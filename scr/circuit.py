@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import fastf1
+import numpy as np
+import pandas as pd
+
+from .cache import MAGASIN_TELEMETRIE
+from .instantane import _ecrire_atomique
+from .telemetrie import contexte_tour
+
+_logger = logging.getLogger(__name__)
+
+# À incrémenter si le calcul de la géométrie change : les fichiers d'une autre version sont ignorés
+VERSION_GEOMETRIE = 1
+
+# Nombre de points du tracé simplifié (largement suffisant pour une carte)
+POINTS_PISTE = int(os.environ.get("F1_POINTS_PISTE", "400"))
+
+NOM_DOSSIER = "circuits"
+
+
+def cle_circuit(sess) -> str:
+    """
+    Identifiant du circuit d'une session, commun à toutes les années.
+
+    Clé du circuit dans les données F1 (ex. '10' pour Melbourne), sinon le lieu
+    de l'événement.
+    """
+    try:
+        circuit = sess.session_info['Meeting']['Circuit']
+        return str(circuit['Key'])
+    except Exception:
+        return str(sess.event['Location'])
+
+
+def matrice_rotation(angle_deg: float) -> np.ndarray:
+    """Matrice 2×2 à appliquer à droite (`xy @ M`) pour tourner de `angle_deg` degrés."""
+    a = np.deg2rad(angle_deg)
+    return np.array([[np.cos(a), np.sin(a)],
+                     [-np.sin(a), np.cos(a)]])
+
+
+def _distances_segment(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distance de chaque point au segment [a, b]."""
+    ab = b - a
+    longueur2 = float(ab @ ab)
+    if longueur2 == 0.0:
+        return np.hypot(*(points - a).T)
+    t = np.clip((points - a) @ ab / longueur2, 0.0, 1.0)
+    return np.hypot(*(points - (a + t[:, None] * ab)).T)
+
+
+def douglas_peucker(points, tolerance: float) -> np.ndarray:
+    """
+    Indices conservés par l'algorithme de Douglas-Peucker.
+
+    Paramètres
+    ----------
+    points : array-like (n, 2)
+        Polyligne.
+    tolerance : float
+        Écart maximal toléré entre la polyligne et sa simplification (unités de `points`).
+
+    Retour
+    ------
+    np.ndarray
+        Indices croissants, extrémités comprises.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n <= 2:
+        return np.arange(n)
+    garder = np.zeros(n, dtype=bool)
+    garder[[0, n - 1]] = True
+    # Pile explicite plutôt que récursion (tracés de plusieurs milliers de points)
+    pile = [(0, n - 1)]
+    while pile:
+        debut, fin = pile.pop()
+        if fin - debut < 2:
+            continue
+        distances = _distances_segment(points[debut + 1:fin], points[debut], points[fin])
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            milieu = debut + 1 + i
+            garder[milieu] = True
+            pile.extend([(debut, milieu), (milieu, fin)])
+    return np.flatnonzero(garder)
+
+
+def simplifier(points, n_points: int = POINTS_PISTE) -> np.ndarray:
+    """
+    Simplifie une polyligne à environ `n_points` points (Douglas-Peucker).
+
+    La tolérance est cherchée par dichotomie pour que le résultat ne dépasse
+    pas `n_points`.
+
+    Retour
+    ------
+    np.ndarray
+        Points conservés (au plus `n_points`, sauf polyligne déjà plus courte).
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) <= n_points:
+        return points
+    bas, haut = 0.0, float(np.ptp(points, axis=0).max())
+    indices = douglas_peucker(points, haut)
+    for _ in range(30):
+        milieu = (bas + haut) / 2
+        essai = douglas_peucker(points, milieu)
+        if len(essai) > n_points:
+            bas = milieu
+        else:
+            haut, indices = milieu, essai
+    return points[indices]
+
+
+class GeometrieCircuit:
+    """
+    Géométrie d'un circuit prête à tracer, commune à toutes les sessions du lieu.
+
+    À obtenir via `geometrie_circuit`.
+
+    Attributs
+    ---------
+    cle : str
+        Identifiant du circuit (voir `cle_circuit`).
+    rotation : float
+        Rotation de la carte (degrés), déjà appliquée aux coordonnées.
+    piste : np.ndarray (n, 2)
+        Tracé simplifié, tourné.
+    virages : pd.DataFrame
+        Une ligne par virage : Texte, X, Y (point sur la piste, tourné) et
+        DX, DY (direction unitaire de l'étiquette, tournée).
+    """
+
+    def __init__(self, cle: str, rotation: float, piste: np.ndarray, virages: pd.DataFrame):
+        self.cle = cle
+        self.rotation = float(rotation)
+        self.piste = piste
+        self.virages = virages
+
+    @classmethod
+    def construire(cls, cle: str, xy, virages: pd.DataFrame | None, rotation: float,
+                   n_points: int = POINTS_PISTE) -> GeometrieCircuit:
+        """
+        Calcule la géométrie depuis un tracé brut et les virages FastF1.
+
+        Paramètres
+        ----------
+        cle : str
+            Identifiant du circuit.
+        xy : array-like (n, 2)
+            Positions X, Y d'un tour.
+        virages : pd.DataFrame | None
+            `CircuitInfo.corners` (X, Y, Number, Letter, Angle).
+        rotation : float
+            `CircuitInfo.rotation`, en degrés.
+        n_points : int, optionnel
+            Taille cible du tracé simplifié.
+        """
+        rot = matrice_rotation(rotation)
+        piste = simplifier(np.asarray(xy, dtype=float), n_points) @ rot
+        if virages is None or virages.empty:
+            tableau = pd.DataFrame(columns=["Texte", "X", "Y", "DX", "DY"])
+        else:
+            angles = np.deg2rad(virages['Angle'].to_numpy(dtype=float))
+            # Tous les virages en un produit matriciel : points et directions des étiquettes
+            points = virages[['X', 'Y']].to_numpy(dtype=float) @ rot
+            directions = np.column_stack([np.cos(angles), np.sin(angles)]) @ rot
+            tableau = pd.DataFrame({
+                "Texte": virages['Number'].astype(str) + virages['Letter'].fillna('').astype(str),
+                "X": points[:, 0], "Y": points[:, 1],
+                "DX": directions[:, 0], "DY": directions[:, 1],
+            })
+        return cls(cle, rotation, piste, tableau)
+
+    def etiquettes(self, longueur: float) -> np.ndarray:
+        """Positions (n, 2) des étiquettes de virage, décalées de `longueur` depuis la piste."""
+        return self.virages[['X', 'Y']].to_numpy() + longueur * self.virages[['DX', 'DY']].to_numpy()
+
+    def vers_json(self) -> dict:
+        return dict(version=VERSION_GEOMETRIE, cle=self.cle, rotation=self.rotation,
+                    piste=self.piste.tolist(), virages=self.virages.to_dict(orient="list"))
+
+    @classmethod
+    def depuis_json(cls, contenu: dict) -> GeometrieCircuit:
+        virages = pd.DataFrame(contenu["virages"], columns=["Texte", "X", "Y", "DX", "DY"])
+        return cls(contenu["cle"], contenu["rotation"], np.asarray(contenu["piste"], dtype=float).reshape(-1, 2),
+                   virages)
+
+
+def fichier_geometrie(cle: str, n_points: int = POINTS_PISTE) -> Path | None:
+    """Fichier de la géométrie dans le cache FastF1 (None si le cache n'est pas activé)."""
+    racine = getattr(fastf1.Cache, "_CACHE_DIR", None)
+    if not racine:
+        return None
+    return Path(racine) / NOM_DOSSIER / f"{cle}_{n_points}.json"
+
+
+def _lire(chemin: Path | None) -> GeometrieCircuit | None:
+    if chemin is None:
+        return None
+    try:
+        contenu = json.loads(chemin.read_text())
+    except (OSError, ValueError):
+        return None
+    if contenu.get("version") != VERSION_GEOMETRIE:
+        return None
+    return GeometrieCircuit.depuis_json(contenu)
+
+
+def _ecrire(chemin: Path | None, geometrie: GeometrieCircuit):
+    if chemin is None:
+        return
+    try:
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        contenu = json.dumps(geometrie.vers_json())
+        _ecrire_atomique(chemin, lambda tmp: tmp.write_text(contenu))
+    except Exception as e:
+        _logger.warning("Géométrie du circuit %s non écrite : %s", geometrie.cle, e)
+
+
+def _depuis_session(sess, contexte, cle: str, n_points: int) -> GeometrieCircuit | None:
+    """Géométrie calculée à partir du tour d'un contexte (positions) et des infos circuit."""
+    if contexte is None:
+        contexte = contexte_tour(sess)
+    pos = contexte.position
+    if pos is None or pos.empty:
+        return None
+    circuit = contexte.circuit
+    try:
+        rotation = float(circuit.rotation) if circuit is not None else 0.0
+    except Exception:
+        rotation = 0.0
+    virages = getattr(circuit, 'corners', None)
+    return GeometrieCircuit.construire(cle, pos[['X', 'Y']].to_numpy(), virages, rotation, n_points)
+
+
+def geometrie_circuit(sess, n_points: int = POINTS_PISTE, contexte=None) -> GeometrieCircuit | None:
+    """
+    Géométrie du circuit d'une session, partagée par toutes les sessions du même lieu.
+
+    Cherchée dans l'ordre : en mémoire (par circuit), dans le fichier du cache
+    FastF1 (`circuits/<clé>_<n>.json`), puis calculée une seule fois à partir
+    des positions d'un tour. Les sessions suivantes sur ce circuit, quelle que
+    soit l'année, n'ont donc plus besoin des données de position.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 (chargée avec la télémétrie si la géométrie n'est pas encore connue).
+    n_points : int, optionnel
+        Taille cible du tracé simplifié.
+    contexte : ContexteTour | None, optionnel
+        Tour à utiliser si la géométrie doit être calculée (par défaut, le
+        meilleur tour de la session).
+
+    Retour
+    ------
+    GeometrieCircuit | None
+        None si elle n'est ni en cache ni calculable (pas de positions).
+    """
+    cle = cle_circuit(sess)
+    chemin = fichier_geometrie(cle, n_points)
+
+    def _charger(_):
+        geometrie = _lire(chemin)
+        if geometrie is None:
+            geometrie = _depuis_session(sess, contexte, cle, n_points)
+            if geometrie is not None:
+                _ecrire(chemin, geometrie)
+        return geometrie
+
+    # Un échec (None) n'est pas servi par le magasin : la géométrie sera recherchée au prochain appel
+    return MAGASIN_TELEMETRIE.obtenir_ou_charger(("circuit", cle, n_points), _charger)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+_logger = logging.getLogger(__name__)
+
+# Une colonne texte devient catégorielle si elle a au plus cette proportion de valeurs distinctes
+RATIO_CATEGORIE = 0.5
+
+# Écart relatif toléré lors du passage en float32 (précision float32 ≈ 6e-8)
+TOLERANCE_FLOAT32 = 1e-6
+
+
+def octets(df: pd.DataFrame) -> int:
+    """Empreinte mémoire d'un DataFrame (index et chaînes compris)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _texte_categoriel(serie: pd.Series) -> bool:
+    if not (pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)):
+        return False
+    valeurs = serie.dropna()
+    if valeurs.empty or not valeurs.map(type).eq(str).all():
+        return False
+    return valeurs.nunique() <= RATIO_CATEGORIE * len(serie)
+
+
+def _flottant_compact(serie: pd.Series) -> pd.Series:
+    """float32 si l'aller-retour reste dans la tolérance, sinon la série d'origine."""
+    valeurs = serie.to_numpy()
+    with np.errstate(over='ignore', invalid='ignore'):
+        compacte = valeurs.astype(np.float32)
+        fidele = np.allclose(compacte, valeurs, rtol=TOLERANCE_FLOAT32, atol=0.0, equal_nan=True)
+    return serie.astype(np.float32) if fidele else serie
+
+
+def compacter(df: pd.DataFrame, exclure=()) -> pd.DataFrame:
+    """
+    Réduit l'empreinte mémoire d'un DataFrame sans en changer le contenu utile.
+
+    - chaînes répétées (Driver, Team, Compound...) → category ;
+    - entiers → plus petit type entier suffisant (int8, int16...) ;
+    - float64 → float32 quand l'écart reste sous `TOLERANCE_FLOAT32` ;
+    - Timedelta, dates et booléens inchangés.
+
+    La classe (Laps, Telemetry...) et ses métadonnées sont conservées.
+
+    Paramètres
+    ----------
+    df : pd.DataFrame
+        Table à compacter (non modifiée).
+    exclure : iterable[str], optionnel
+        Colonnes à laisser telles quelles.
+
+    Retour
+    ------
+    pd.DataFrame
+        Nouvelle table aux types compacts (ou `df` si rien à convertir).
+    """
+    conversions = {}
+    for col in df.columns:
+        if col in exclure:
+            continue
+        serie = df[col]
+        if _texte_categoriel(serie):
+            conversions[col] = "category"
+        elif pd.api.types.is_integer_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            cible = pd.to_numeric(serie, downcast="integer").dtype
+            if cible != serie.dtype:
+                conversions[col] = cible
+        elif pd.api.types.is_float_dtype(serie) and serie.dtype == np.float64:
+            if _flottant_compact(serie).dtype == np.float32:
+                conversions[col] = np.float32
+    if not conversions:
+        return df
+    return df.astype(conversions)
+
+
+def compacter_tables(tables: dict) -> tuple[dict, dict]:
+    """
+    Compacte plusieurs tables et mesure le gain de chacune.
+
+    Paramètres
+    ----------
+    tables : dict
+        Nom → DataFrame.
+
+    Retour
+    ------
+    tuple
+        (nom → table compactée, nom → (octets avant, octets après)).
+    """
+    compactes, rapport = {}, {}
+    for nom, df in tables.items():
+        avant = octets(df)
+        compactes[nom] = compacter(df)
+        rapport[nom] = (avant, octets(compactes[nom]))
+        _logger.debug("Compaction %s : %d → %d octets", nom, *rapport[nom])
+    return compactes, rapport
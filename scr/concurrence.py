@@ -0,0 +1,200 @@
+"""
+Coordination des processus qui partagent le dossier de cache FastF1.
+
+Dans un processus, `MagasinSessions` ne lance déjà qu'un chargement par clé.
+Entre processus (workers Streamlit, conteneurs sur un même volume, export de
+saison), un bail de fichier désigne un seul « meneur » par session : les
+autres attendent la fin de son bail puis relisent ce qu'il a écrit
+(instantané, pickles FastF1) au lieu de tout retélécharger.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote
+
+import fastf1
+import fastf1.req
+
+from .instantane import _ecrire_atomique
+
+_logger = logging.getLogger(__name__)
+
+# Durée de vie d'un bail sans renouvellement (s) : un meneur arrêté net le libère ainsi
+DUREE_BAIL_S = float(os.environ.get("F1_DUREE_BAIL_S", "60"))
+# Attente maximale d'un suiveur (s) ; au-delà, il charge lui-même
+ATTENTE_BAIL_S = float(os.environ.get("F1_ATTENTE_BAIL_S", "900"))
+# Intervalle entre deux essais d'un suiveur (s)
+INTERVALLE_BAIL_S = 0.2
+
+NOM_DOSSIER = "_baux"
+
+
+def fichier_bail(cle: tuple) -> Path | None:
+    """Fichier du bail de `cle` dans le cache FastF1 (None si le cache n'est pas activé)."""
+    racine = getattr(fastf1.Cache, "_CACHE_DIR", None)
+    if not racine:
+        return None
+    return Path(racine) / NOM_DOSSIER / (quote("_".join(map(str, cle)), safe="") + ".bail")
+
+
+class Bail:
+    """
+    Bail exclusif matérialisé par un fichier créé avec O_EXCL.
+
+    Le détenteur renouvelle le bail (date de modification du fichier) tant
+    qu'il le garde ; un bail non renouvelé depuis `duree` secondes est périmé
+    et peut être repris par un autre processus.
+
+    Paramètres
+    ----------
+    chemin : Path
+        Fichier du bail (voir `fichier_bail`).
+    duree : float, optionnel
+        Durée de vie sans renouvellement, en secondes.
+    """
+
+    def __init__(self, chemin: Path, duree: float = DUREE_BAIL_S):
+        self.chemin = Path(chemin)
+        self.duree = duree
+        self.jeton = uuid.uuid4().hex
+        self._fin = threading.Event()
+        self._renouvellement = None
+
+    @staticmethod
+    def _lire(chemin: Path) -> dict | None:
+        try:
+            return json.loads(chemin.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _contenu(self) -> dict | None:
+        return self._lire(self.chemin)
+
+    def _perime(self) -> bool:
+        try:
+            return time.time() - self.chemin.stat().st_mtime > self.duree
+        except FileNotFoundError:
+            return False
+
+    def _reprendre(self) -> bool:
+        """Supprime un bail périmé ; un seul des processus concurrents y parvient."""
+        contenu = self._contenu()
+        ecarte = self.chemin.with_name(f"{self.chemin.name}.{self.jeton}.perime")
+        try:
+            os.rename(self.chemin, ecarte)
+        except FileNotFoundError:
+            return False
+        if self._lire(ecarte) != contenu:
+            # Un autre processus a repris le bail entre-temps : on le lui rend
+            try:
+                os.link(ecarte, self.chemin)
+            except OSError:
+                pass
+        ecarte.unlink(missing_ok=True)
+        return True
+
+    def prendre(self) -> bool:
+        """Tente de prendre le bail, sans attendre ; True en cas de succès."""
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(self.chemin, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if self._perime():
+                _logger.warning("Bail périmé repris : %s (%s)", self.chemin.name, self._contenu())
+                self._reprendre()
+            return False
+        with os.fdopen(fd, "w") as fichier:
+            json.dump(dict(jeton=self.jeton, pid=os.getpid(), hote=socket.gethostname()), fichier)
+        self._fin.clear()
+        self._renouvellement = threading.Thread(target=self._renouveler, daemon=True,
+                                                name=f"bail-{self.chemin.stem}")
+        self._renouvellement.start()
+        return True
+
+    def _renouveler(self):
+        while not self._fin.wait(self.duree / 3):
+            try:
+                os.utime(self.chemin)
+            except OSError:
+                return
+
+    def rendre(self):
+        """Libère le bail s'il est toujours le nôtre."""
+        self._fin.set()
+        if self._renouvellement is not None:
+            self._renouvellement.join()
+            self._renouvellement = None
+        if (self._contenu() or {}).get("jeton") == self.jeton:
+            self.chemin.unlink(missing_ok=True)
+
+
+@contextmanager
+def bail_exclusif(cle: tuple, duree: float = DUREE_BAIL_S, attente: float = ATTENTE_BAIL_S):
+    """
+    Exécute le bloc en détenant le bail de `cle`, tous processus confondus.
+
+    Paramètres
+    ----------
+    cle : tuple
+        Identifiant de la ressource (ex. ("session", 2025, "Australian Grand Prix", "R")).
+    duree : float, optionnel
+        Durée de vie du bail sans renouvellement (s).
+    attente : float, optionnel
+        Attente maximale du bail (s) ; au-delà, le bloc s'exécute sans bail.
+
+    Retour
+    ------
+    bool
+        Valeur du `with` : True si un autre processus détenait le bail et a
+        dû être attendu (ses résultats sont alors normalement sur disque).
+    """
+    chemin = fichier_bail(cle)
+    if chemin is None:
+        yield False
+        return
+    bail = Bail(chemin, duree)
+    limite = time.monotonic() + attente
+    attendu = False
+    while not bail.prendre():
+        if time.monotonic() > limite:
+            _logger.warning("Bail %s toujours tenu après %.0f s : chargement sans bail", chemin.name, attente)
+            yield attendu
+            return
+        attendu = True
+        time.sleep(INTERVALLE_BAIL_S)
+    try:
+        yield attendu
+    finally:
+        bail.rendre()
+
+
+def _ecrire_cache_atomique(cls, data, cache_file_path, **kwargs):
+    contenu = dict(version=cls._API_CORE_VERSION, data=data, **kwargs)
+
+    def ecrire(tmp: Path):
+        with open(tmp, "wb") as fichier:
+            pickle.dump(contenu, fichier)
+
+    _ecrire_atomique(Path(cache_file_path), ecrire)
+
+
+def installer_ecriture_atomique():
+    """
+    Remplace l'écriture des pickles du cache FastF1 par une écriture atomique.
+
+    FastF1 écrit les `.ff1pkl` directement à leur place : un autre processus
+    peut alors lire un fichier à moitié écrit. Ici, le pickle est écrit dans
+    un fichier temporaire puis renommé. Sans effet si déjà installé.
+    """
+    actuelle = fastf1.req.Cache.__dict__.get("_write_cache")
+    if getattr(actuelle, "__func__", None) is not _ecrire_cache_atomique:
+        fastf1.req.Cache._write_cache = classmethod(_ecrire_cache_atomique)
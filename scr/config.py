@@ -1,8 +1,5 @@
 import streamlit as st
 import fastf1
-from streamlit_extras.colored_header import colored_header
-from streamlit_extras.add_vertical_space import add_vertical_space
-from streamlit_extras.metric_cards import style_metric_cards
 
 def configure_page_home(title: str = "F1 Analytics", page_icon: str = "🏎️", menu_items: dict | None = None):
     """
@@ -61,6 +58,8 @@ def section_header(title: str, description: str | None = None, color_name: str =
     color_name : str, optionnel
         Nom de la couleur du thème (par défaut "blue-70").
     """
+    from streamlit_extras.colored_header import colored_header
+
     colored_header(title, description=description, color_name=color_name)
 
 def spacer(lines: int = 1):
@@ -72,6 +71,8 @@ def spacer(lines: int = 1):
     lines : int, optionnel
         Nombre de lignes d'espace à ajouter (par défaut 1).
     """
+    from streamlit_extras.add_vertical_space import add_vertical_space
+
     add_vertical_space(lines)
 
 def style_kpis(
@@ -100,6 +101,8 @@ def style_kpis(
     box_shadow : bool, optionnel
         Activer l'ombre portée.
     """
+    from streamlit_extras.metric_cards import style_metric_cards
+
     style_metric_cards(
         background_color=background_color,
         border_color=border_color,
@@ -1,19 +1,142 @@
 from __future__ import annotations
 
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
-import streamlit as st
 import fastf1
-from .utils import secs, formatage_timedelta
-import matplotlib.pyplot as plt
-import fastf1.plotting
-import numpy as np
-import matplotlib as mpl
-from matplotlib.collections import LineCollection
-
-@st.cache_data(show_spinner=False)
-def chargement_session(annee: int, course: str, sess_type: str):
+from .utils import secs_serie
+from .cache import MAGASIN_SESSIONS, DictionnaireFige
+from .calendrier import calendrier
+from . import championnat, instantane
+from .concurrence import bail_exclusif, installer_ecriture_atomique
+from .compaction import compacter_tables
+from .pilotes import index_pilotes
+from .telemetrie import telemetrie_tour
+from .positions import matrice_positions
+from .derives import materialiser
+
+_logger = logging.getLogger(__name__)
+
+# Pickles FastF1 écrits de façon atomique : le cache peut être partagé entre processus
+installer_ecriture_atomique()
+
+# Parties d'une session qu'une page peut déclarer lors du chargement.
+PARTIES_SESSION = ("tours", "resultats", "meteo", "telemetrie", "messages")
+
+# Matrices du championnat : (année, manche) → (registre source, résultat de `progression_championnat`)
+_PROGRESSIONS: dict[tuple[int, int], tuple] = {}
+
+
+def _normaliser_parties(parties=None) -> tuple[str, ...]:
+    """
+    Valide et complète la liste des parties demandées.
+
+    Les résultats sont toujours chargés (FastF1 les récupère avec la liste des
+    pilotes) et la télémétrie implique les tours, car elle est découpée par tour.
+
+    Paramètres
+    ----------
+    parties : iterable[str] | None
+        Parties souhaitées parmi `PARTIES_SESSION`. None signifie toutes.
+
+    Retour
+    ------
+    tuple[str, ...]
+        Parties normalisées, dans l'ordre de `PARTIES_SESSION`.
+    """
+    if parties is None:
+        return PARTIES_SESSION
+    demandees = set(parties)
+    inconnues = demandees - set(PARTIES_SESSION)
+    if inconnues:
+        raise ValueError(f"Parties de session inconnues : {sorted(inconnues)}")
+    demandees.add("resultats")
+    if "telemetrie" in demandees:
+        demandees.add("tours")
+    return tuple(p for p in PARTIES_SESSION if p in demandees)
+
+
+def _copie_session(sess, manquantes):
+    """
+    Copie d'une Session déjà servie, à compléter sans toucher à l'originale.
+
+    Les tables sont partagées, sauf celles que le chargement des parties
+    `manquantes` modifie sur place : les tours (LapStartDate, Deleted, tours
+    ajoutés) et les résultats (positions calculées d'après les tours), copiés
+    puis rattachés à la copie.
+    """
+    copie = copy.copy(sess)
+    modifiees = []
+    if "tours" in manquantes:
+        modifiees.append("_results")
+    if {"tours", "telemetrie", "messages"} & set(manquantes):
+        modifiees.append("_laps")
+    for attribut in modifiees:
+        table = vars(sess).get(attribut)
+        if table is not None:
+            table = table.copy()
+            if hasattr(table, "session"):
+                table.session = copie
+            setattr(copie, attribut, table)
+    return copie
+
+
+def _completer_session(sess, deja: tuple[str, ...], parties: tuple[str, ...]):
+    """
+    Charge dans `sess` les parties demandées qui ne le sont pas encore.
+
+    Une page légère (Météo, Classements) ne paie pas la télémétrie, et une page
+    qui en a besoin plus tard ne charge qu'elle : le reste est repris de la
+    session déjà servie ou relu depuis l'instantané. Une fois les résultats
+    présents, seules les parties manquantes sont analysées, sans relire la
+    liste des pilotes ni les résultats (Ergast) comme le ferait `Session.load()`.
+    """
+    manquantes = [p for p in parties if p not in deja]
+    if not manquantes:
+        return sess
+    if "resultats" not in deja:
+        sess.load(
+            laps="tours" in manquantes,
+            telemetry="telemetrie" in manquantes,
+            weather="meteo" in manquantes,
+            messages="messages" in manquantes,
+        )
+        return sess
+    if not sess.f1_api_support:
+        return sess
+    # Mêmes étapes que Session.load() (FastF1 3.8), restreintes aux parties manquantes
+    if "tours" in manquantes:
+        sess._load_session_status_data()
+        sess._load_total_lap_count()
+        sess._load_track_status_data()
+        sess._load_laps_data()
+        sess._add_first_lap_time_from_ergast()
+        sess._fix_missing_laps_retired_on_track()
+    if "telemetrie" in manquantes:
+        sess._load_telemetry()
+    if "meteo" in manquantes:
+        sess._load_weather_data()
+    if "messages" in manquantes:
+        sess._load_race_control_messages()
+    if {"tours", "messages"} & set(manquantes):
+        sess._set_laps_deleted_from_rcm()
+    if "tours" in manquantes:
+        sess._calculate_quali_like_session_results()
+        sess._calculate_race_like_session_results()
+    return sess
+
+
+def chargement_session(annee: int, course: str, sess_type: str, parties: tuple[str, ...] | None = None):
     """
     Charge une session F1 (week-end de Grand Prix) et retourne les données principales.
+
+    Les données sont conservées dans `MAGASIN_SESSIONS` et partagées sans copie
+    entre tous les utilisateurs du processus : le dictionnaire renvoyé est en
+    lecture seule et ses DataFrames ne doivent pas être modifiés sur place.
+    Au premier chargement, un instantané columnaire (voir `scr.instantane`) est
+    écrit à côté du cache FastF1 et relu directement aux démarrages suivants.
     
     Paramètres
     ----------
@@ -23,60 +146,177 @@ def chargement_session(annee: int, course: str, sess_type: str):
         Le nom du Grand Prix (ex: "Australian Grand Prix").
     sess_type : str
         Le type de session ("FP1", "FP2", "FP3", "Q", "R").
+    parties : tuple[str, ...] | None, optionnel
+        Parties nécessaires à la page appelante, parmi `PARTIES_SESSION`
+        ("tours", "resultats", "meteo", "telemetrie", "messages").
+        Seules ces parties sont récupérées et analysées par FastF1 ; une
+        demande ultérieure plus large produit de nouvelles données partagées
+        (copie de la Session où seules les parties manquantes sont chargées),
+        sans modifier celles déjà servies.
+        None (par défaut) charge tout.
     
     Retour
     ------
-    dict
+    DictionnaireFige
         Dictionnaire contenant :
         - session : objet Session FastF1
         - nom : nom de la session
-        - tours : DataFrame des tours
+        - tours : DataFrame des tours, types compacts (vide si non demandé)
         - pilotes : liste des codes pilotes
-        - meteo : DataFrame des données météo
+        - meteo : DataFrame des données météo (vide si non demandé)
         - resultats : DataFrame des résultats officiels
+        - parties : parties effectivement chargées
+        - octets : nom de table → (octets avant, octets après compaction)
+        - index_pilotes : `scr.pilotes.IndexPilotes` (identifiants, équipes, styles)
+        - positions : matrice tour × pilote (`scr.positions.matrice_positions`), None sans tours
+        - derivees : tables dérivées calculées une fois (relais, arrets, composes,
+          top_tours, classement... voir `scr.derives`)
+        - empreintes : empreintes des entrées de ces tables
     """
-    sess = fastf1.get_session(annee, course, sess_type)
-    sess.load()
-
-    tours = sess.laps.copy().reset_index(drop=True)
-    if 'LapTime' in tours:
-        tours['LapSeconds'] = tours['LapTime'].apply(secs)
-    for col in ['Sector1Time', 'Sector2Time', 'Sector3Time']:
-        if col in tours:
-            tours[col + 'Sec'] = tours[col].apply(secs)
-
-    driver_codes = sorted(tours['Driver'].dropna().unique().tolist())
-
-    try:
-        meteo = sess.weather_data.copy().reset_index(drop=True)
-        if 'Time' in meteo:
-            meteo['SessionTimeSec'] = meteo['Time'].apply(secs)
-    except Exception:
-        meteo = pd.DataFrame()
-
-    try:
-        results = sess.results.copy().reset_index(drop=True)
-    except Exception:
-        results = pd.DataFrame()
-
-    return dict(
-        session = sess,
+    parties = _normaliser_parties(parties)
+
+    def _charger(precedentes):
+        # Un seul processus charge la session à la fois (bail sur le cache partagé) :
+        # les autres attendent, puis relisent son instantané au lieu de retélécharger
+        with bail_exclusif(("session", annee, course, sess_type)):
+            chargees = _normaliser_parties(set(parties) | set(precedentes["parties"] if precedentes else ()))
+            if precedentes is None:
+                sess, servies = fastf1.get_session(annee, course, sess_type), ()
+            else:
+                # Données déjà partagées : on complète une copie de leur Session
+                # (ses lecteurs la détiennent), avec les parties déjà chargées
+                servies = precedentes["parties"]
+                sess = _copie_session(precedentes["session"], [p for p in chargees if p not in servies])
+            # Instantané columnaire d'abord ; FastF1 ne charge que ce qu'il ne couvre pas
+            deja = (*servies, *instantane.restaurer(sess, [p for p in chargees if p not in servies]))
+            manquantes = [p for p in chargees if p not in deja]
+            _completer_session(sess, deja, chargees)
+            if manquantes:
+                # Le chargement recalcule aussi les résultats (positions d'après les tours) et
+                # annote les tours (LapStartDate, Deleted) : ces tables sont réécrites avec le reste
+                ecrire = set(manquantes)
+                if "resultats" not in deja or "tours" in manquantes:
+                    ecrire.add("resultats")
+                if "resultats" not in deja or {"telemetrie", "messages"} & ecrire:
+                    ecrire.add("tours")
+                instantane.enregistrer(sess, [p for p in chargees if p in ecrire])
+            return _construire_donnees(sess, chargees, sess_type, precedentes)
+
+    return MAGASIN_SESSIONS.obtenir_ou_charger(
+        (annee, course, sess_type),
+        _charger,
+        accepte=lambda d: set(parties) <= set(d["parties"]),
+    )
+
+
+def donnees_disponibles(annee: int, course: str, sess_type: str, parties=()) -> DictionnaireFige | None:
+    """
+    Données partagées d'une session si elles couvrent déjà `parties`, sans rien charger.
+
+    Contrairement à `chargement_session`, n'attend jamais un chargement en
+    cours : une page peut ainsi afficher ce qui est prêt (voir `scr.chargement`).
+
+    Retour
+    ------
+    DictionnaireFige | None
+        Même contenu que `chargement_session`, ou None si les parties manquent.
+    """
+    donnees = MAGASIN_SESSIONS.lire((annee, course, sess_type))
+    if donnees is None or not set(parties) <= set(donnees["parties"]):
+        return None
+    return donnees
+
+
+def _construire_donnees(sess, parties: tuple[str, ...], sess_type: str | None = None,
+                        precedentes: dict | None = None) -> DictionnaireFige:
+    """
+    Construit le dictionnaire partagé à partir d'une session chargée.
+
+    Les tables dérivées (voir `scr.derives`) y sont matérialisées ; celles dont
+    les entrées n'ont pas changé depuis `precedentes` sont reprises sans calcul,
+    comme les tours (compactés, positions) et les résultats (index des pilotes)
+    quand la session complétée partage encore ces tables FastF1 avec la précédente.
+    """
+    servie = vars(precedentes["session"]) if precedentes is not None else {}
+    memes_tours = ("tours" in parties and "tours" in (precedentes or {}).get("parties", ())
+                   and servie.get("_laps") is vars(sess).get("_laps"))
+    memes_resultats = servie.get("_results") is not None and servie.get("_results") is vars(sess).get("_results")
+
+    if "tours" in parties and not memes_tours:
+        tours = sess.laps.copy().reset_index(drop=True)
+        if 'LapTime' in tours:
+            tours['LapSeconds'] = secs_serie(tours['LapTime'])
+        for col in ['Sector1Time', 'Sector2Time', 'Sector3Time']:
+            if col in tours:
+                tours[col + 'Sec'] = secs_serie(tours[col])
+    else:
+        tours = pd.DataFrame()
+
+    meteo = pd.DataFrame()
+    if "meteo" in parties:
+        try:
+            meteo = sess.weather_data.copy().reset_index(drop=True)
+            if 'Time' in meteo:
+                meteo['SessionTimeSec'] = secs_serie(meteo['Time'])
+        except Exception:
+            meteo = pd.DataFrame()
+
+    if memes_resultats:
+        results = precedentes["resultats"]
+    else:
+        try:
+            results = sess.results.copy().reset_index(drop=True)
+        except Exception:
+            results = pd.DataFrame()
+
+    # Types compacts (catégories, float32...) : c'est ce qui reste en mémoire par session
+    tables, rapport = compacter_tables({"tours": tours, "meteo": meteo})
+    if memes_tours:
+        tables["tours"], rapport["tours"] = precedentes["tours"], precedentes["octets"]["tours"]
+    _logger.info("Session %s %s compactée : %s", sess.event['EventName'], sess.name,
+                 ", ".join(f"{nom} {avant // 1024} → {apres // 1024} Ko" for nom, (avant, apres) in rapport.items()))
+
+    if 'Driver' in tables["tours"]:
+        driver_codes = sorted(tables["tours"]['Driver'].dropna().unique().tolist())
+    elif 'Abbreviation' in results:
+        driver_codes = sorted(results['Abbreviation'].dropna().unique().tolist())
+    else:
+        driver_codes = []
+
+    derivees, empreintes = materialiser(
+        dict(tours=tables["tours"], resultats=results, type_session=sess_type), precedentes)
+
+    if memes_tours:
+        positions = precedentes["positions"]
+    else:
+        positions = matrice_positions(sess) if "tours" in parties else None
+
+    return DictionnaireFige(
+        session=sess,
         nom=sess.name,
-        tours=tours,
+        tours=tables["tours"],
         pilotes=driver_codes,
-        meteo=meteo,
+        meteo=tables["meteo"],
         resultats=results,
+        parties=parties,
+        octets=rapport,
+        index_pilotes=precedentes["index_pilotes"] if memes_resultats else index_pilotes(sess),
+        positions=positions,
+        derivees=derivees,
+        empreintes=empreintes,
     )
 
-@st.cache_data(show_spinner=False)
 def tour_rapide_tel(session_key: str, _tours_df: pd.DataFrame, code_pilote: str):
     """
     Obtient les informations sur le tour le plus rapide d'un pilote donné.
+
+    La télémétrie est lue dans le cache partagé de `scr.telemetrie` (clé
+    année / événement / session / pilote / tour), sans copie par appel.
     
     Paramètres
     ----------
     session_key : str
-        Clé unique de la session (non utilisée actuellement, pour compatibilité cache).
+        Clé unique de la session (non utilisée actuellement, pour compatibilité).
     _tours_df : pd.DataFrame
         DataFrame contenant tous les tours de la session.
     code_pilote : str
@@ -85,678 +325,187 @@ def tour_rapide_tel(session_key: str, _tours_df: pd.DataFrame, code_pilote: str)
     Retour
     ------
     tuple
-        (Lap object du tour le plus rapide, DataFrame de télémetrie)
+        (Lap object du tour le plus rapide, DataFrame de télémetrie partagé)
     """
-    tours_df = _tours_df.pick_driver(code_pilote)
+    tours_df = _tours_df.pick_drivers(code_pilote)
     plus_rapide = tours_df.pick_fastest()
-    tel = plus_rapide.get_car_data().add_distance()
+    tel = telemetrie_tour(plus_rapide.session, plus_rapide, "voiture")
     return plus_rapide, tel
 
-@st.cache_data(show_spinner=True)
-def calcul_classement_pilote(annee: int, upto_event: str) -> pd.DataFrame:
+def _resultats_seuls(annee: int, course: str, sess_type: str) -> pd.DataFrame:
     """
-    Calcule le classement cumulé des pilotes jusqu'à un événement donné.
-    
-    Paramètres
-    ----------
-    annee : int
-        L'année de la saison.
-    upto_event : str
-        Le nom du Grand Prix jusqu'auquel calculer le classement.
-    
-    Retour
-    ------
-    pd.DataFrame
-        DataFrame avec colonnes : Position, BroadcastName, TeamName, Points.
-        DataFrame vide si erreur ou données indisponibles.
-    """
-    try:
-        schedule = fastf1.get_event_schedule(annee, include_testing=False)
-    except Exception:
-        return pd.DataFrame()
-    if 'EventName' not in schedule:
-        return pd.DataFrame()
-    nom = schedule['EventName'].tolist()
-    if upto_event not in nom:
-        return pd.DataFrame()
+    Résultats officiels d'une session, sans passer par `chargement_session`.
 
-    upto_idx = nom.index(upto_event)
-    chunks = []
-    for i in range(upto_idx + 1):
-        ev = schedule.iloc[i]
-        try:
-            s = fastf1.get_session(annee, ev['EventName'], 'R')
-            s.load()
-            r = s.results.copy()
-            if not r.empty and 'BroadcastName' in r and 'Points' in r:
-                chunks.append(r[['BroadcastName', 'Points', 'TeamName']])
-        except Exception:
-            continue
+    Ni magasin, ni tables dérivées, ni index des pilotes, ni instantané écrit :
+    une session déjà partagée fournit ses résultats, sinon ils sont relus
+    depuis l'instantané existant ou chargés seuls par FastF1.
+    """
+    partagee = MAGASIN_SESSIONS.lire((annee, course, sess_type))
+    if partagee is not None:
+        return partagee["resultats"]
+    sess = fastf1.get_session(annee, course, sess_type)
+    if "resultats" not in instantane.restaurer(sess, ("resultats",)):
+        sess.load(laps=False, telemetry=False, weather=False, messages=False)
+    return sess.results.copy().reset_index(drop=True)
 
-    if not chunks:
-        return pd.DataFrame()
+def chargement_resultats(annee: int, courses: list[str], sess_type: str = 'R',
+                         max_workers: int = 4) -> tuple[dict, dict]:
+    """
+    Charge en parallèle les seuls résultats de plusieurs sessions d'une saison.
 
-    all_pts = pd.concat(chunks, ignore_index=True)
-    classement = (all_pts.groupby(['BroadcastName', 'TeamName'], dropna=False)['Points']
-                        .sum().reset_index())
-    standings = classement.sort_values('Points', ascending=False).reset_index(drop=True)
-    standings['Position'] = standings.index + 1
-    return standings[['Position', 'BroadcastName', 'TeamName', 'Points']]
+    Ni tours, ni télémétrie, ni météo, ni messages, et rien n'est déposé dans
+    `MAGASIN_SESSIONS` : un classement de saison n'en évince pas les sessions
+    consultées. Une erreur sur une course n'interrompt pas les autres.
 
-@st.cache_data(show_spinner=True)
-def calcul_classement_constructeur(annee: int, upto_event: str) -> pd.DataFrame:
-    """
-    Calcule le classement cumulé des constructeurs jusqu'à un événement donné.
-    
     Paramètres
     ----------
     annee : int
         L'année de la saison.
-    upto_event : str
-        Le nom du Grand Prix jusqu'auquel calculer le classement.
-    
-    Retour
-    ------
-    pd.DataFrame
-        DataFrame avec colonnes : Position, TeamName, Points.
-        DataFrame vide si erreur ou données indisponibles.
-    """
-    try:
-        schedule = fastf1.get_event_schedule(annee, include_testing=False)
-    except Exception:
-        return pd.DataFrame()
-    if 'EventName' not in schedule:
-        return pd.DataFrame()
-    noms = schedule['EventName'].tolist()
-    if upto_event not in noms:
-        return pd.DataFrame()
-
-    upto_idx = noms.index(upto_event)
-    chunks = []
-    for i in range(upto_idx + 1):
-        ev = schedule.iloc[i]
-        try:
-            s = fastf1.get_session(annee, ev['EventName'], 'R')
-            s.load()
-            r = s.results.copy()
-            if not r.empty and 'TeamName' in r and 'Points' in r:
-                chunks.append(r[['TeamName','Points']])
-        except Exception:
-            continue
+    courses : list[str]
+        Noms des Grands Prix (ex: ["Bahrain Grand Prix", "Saudi Arabian Grand Prix"]).
+    sess_type : str, optionnel
+        Type de session (par défaut "R").
+    max_workers : int, optionnel
+        Nombre maximal de chargements simultanés (par défaut 4).
 
-    if not chunks:
-        return pd.DataFrame()
-
-    all_pts = pd.concat(chunks, ignore_index=True)
-    classement = (all_pts.groupby(['TeamName'], dropna=False)['Points']
-                        .sum().reset_index())
-    standings = classement.sort_values('Points', ascending=False).reset_index(drop=True)
-    standings['Position'] = standings.index + 1
-    return standings[['Position','TeamName','Points']]
-
-def classement_session(nb_tours: pd.DataFrame, results_df: pd.DataFrame, sess_type: str) -> pd.DataFrame:
-    """
-    Calcule le classement d'une session donnée.
-    
-    Paramètres
-    ----------
-    nb_tours : pd.DataFrame
-        DataFrame contenant les tours de la session.
-    results_df : pd.DataFrame
-        DataFrame contenant les résultats officiels (si disponibles).
-    sess_type : str
-        Type de session ("FP1", "FP2", "FP3", "Q", "R").
-    
     Retour
     ------
-    pd.DataFrame
-        DataFrame du classement avec colonnes selon le type de session.
-        DataFrame vide si données insuffisantes.
+    tuple[dict, dict]
+        (resultats, echecs) : nom → DataFrame des résultats pour les courses
+        chargées, et nom → message d'erreur pour celles en échec.
     """
-    if sess_type == 'R' and not results_df.empty and 'Position' in results_df:
-        cols = [c for c in ["Position","BroadcastName","DriverNumber","TeamName","TeamColor","Points","Status","Time","FastestLapTime"] if c in results_df.columns]
-        df = results_df[cols].copy()
-        for c in ["Time","FastestLapTime"]:
-            if c in df.columns:
-                try:
-                    df[c] = df[c].apply(formatage_timedelta)
-                except Exception:
-                    pass
-        return df.sort_values('Position').reset_index(drop=True)
-
-    if 'Driver' not in nb_tours or 'LapTime' not in nb_tours:
-        return pd.DataFrame()
-    tmp = (nb_tours.dropna(subset=['Driver','LapTime'])
-                  .groupby('Driver', as_index=False)
-                  .agg(BestLapTime=('LapTime','min'),
-                       BestLapNo=('LapNumber','min')))
-    tmp['BestLapStr'] = tmp['BestLapTime'].apply(formatage_timedelta)
-    if 'Team' in nb_tours.columns:
-        team_map = nb_tours.dropna(subset=['Driver']).drop_duplicates('Driver').set_index('Driver')['Team'].to_dict()
-        tmp['Team'] = tmp['Driver'].map(team_map)
-    tmp = tmp.sort_values('BestLapTime').reset_index(drop=True)
-    tmp['Position'] = tmp.index + 1
-    return tmp[['Position','Driver','Team','BestLapNo','BestLapStr'] if 'Team' in tmp.columns else ['Position','Driver','BestLapNo','BestLapStr']]
-
-
+    resultats, echecs = {}, {}
+    if not courses:
+        return resultats, echecs
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(courses)))) as pool:
+        futurs = {
+            pool.submit(_resultats_seuls, annee, nom, sess_type): nom
+            for nom in courses
+        }
+        for futur in as_completed(futurs):
+            nom = futurs[futur]
+            try:
+                resultats[nom] = futur.result()
+            except Exception as e:
+                echecs[nom] = f"{type(e).__name__}: {e}"
+    return resultats, echecs
 
-def figure_positions_par_tour(sess, pilotes=None):
+def _registre_jusqua(annee: int, upto_event: str):
     """
-    Crée et renvoie une figure Matplotlib qui trace la position de chaque pilote
-    à la fin de chaque tour pour la session donnée.
-
-    Paramètres
-    ---------
-    sess : fastf1.core.Session
-        Session FastF1 déjà chargée (via `chargement_session`).
-    pilotes : list[str] | None
-        Liste optionnelle de codes pilotes (abréviations 3 lettres) ou numéros.
-        Si None, tous les pilotes présents dans la session sont tracés.
+    Complète le registre de points de la saison jusqu'à `upto_event`.
 
     Retour
     ------
-    matplotlib.figure.Figure
-        Figure prête à être affichée dans Streamlit avec `st.pyplot(fig)`.
+    tuple
+        (registre, numéro de manche de `upto_event`), ou (None, None) si le
+        calendrier est indisponible ou l'épreuve inconnue.
     """
-    # Palette de couleurs FastF1 (désactive le support timedelta car non nécessaire ici)
-    fastf1.plotting.setup_mpl(mpl_timedelta_support=False, color_scheme='fastf1')
-
-    # Mapping Abbreviation -> BroadcastName pour des légendes lisibles
-    name_map = {}
-    try:
-        res = getattr(sess, "results", None)
-        if res is not None and not res.empty and "Abbreviation" in res and "BroadcastName" in res:
-            name_map = dict(zip(res["Abbreviation"], res["BroadcastName"]))
-    except Exception:
-        pass
-
-    # Détermine la liste des pilotes à tracer
-    try:
-        if pilotes is None:
-            pilotes = list(sess.drivers)  # numéros
-        # `pick_drivers` accepte numéros ou abréviations
-    except Exception:
-        # fallback : déduire depuis le DataFrame des tours
-        try:
-            pilotes = sorted(sess.laps["Driver"].dropna().unique().tolist())
-        except Exception:
-            pilotes = []
+    cal = calendrier(annee)
+    if cal is None or upto_event not in cal:
+        return None, None
+    manches = cal.jusqua(upto_event)
 
-    fig, ax = plt.subplots(figsize=(8.0, 4.9))
-    fig.patch.set_facecolor('black')
-    ax.set_facecolor('black')
+    def _charger(noms_courses):
+        resultats, echecs = chargement_resultats(annee, noms_courses)
+        for nom, erreur in echecs.items():
+            _logger.warning("Résultats indisponibles pour %s %s : %s", annee, nom, erreur)
+        return resultats
 
-    for drv in pilotes:
-        try:
-            drv_laps = sess.laps.pick_drivers(drv)
-            if drv_laps is None or drv_laps.empty:
-                continue
-
-            # Identifiant style basé sur l'abréviation (colonne 'Driver') du premier tour
-            abb = drv_laps["Driver"].iloc[0]
-            style = fastf1.plotting.get_driver_style(
-                identifier=abb,
-                style=["color", "linestyle"],
-                session=sess,
-            )
-            label = name_map.get(abb, abb)
-
-            ax.plot(drv_laps["LapNumber"], drv_laps["Position"], label=label, **style)
-        except Exception:
-            continue
-
-    # Axes et légendes
-    ax.set_ylim([20.5, 0.5])
-    ax.set_yticks([1, 5, 10, 15, 20])
-    ax.set_xlabel("Tour")
-    ax.set_ylabel("Position")
-    ax.legend(bbox_to_anchor=(1.0, 1.02), title="Pilotes")
-    plt.tight_layout()
-
-    return fig
-
-
-def figure_carte_vitesse(sess,
-                         pilote,
-                         lap_number: int | None = None,
-                         cmap=mpl.cm.plasma,
-                         figsize=(12, 6.75),
-                         dpi=100,
-                         linewidth_track: float = 16,
-                         linewidth_speed: float = 5,
-                         show_colorbar: bool = True):
+    registre = championnat.completer_registre(annee, manches, _charger)
+    return registre, int(manches['RoundNumber'].iloc[-1])
+
+def progression_championnat(annee: int, upto_event: str) -> dict:
     """
-    Crée et renvoie une figure Matplotlib : visualisation de la vitesse sur la trajectoire.
+    Matrices de points cumulés du championnat, manche par manche, jusqu'à un événement.
+
+    Le registre de la saison est complété à chaque appel (les manches en
+    échec, sans points ou aux résultats encore provisoires sont relues, voir
+    `championnat.completer_registre`) ;
+    les matrices ne sont recalculées que si le registre a changé. Le
+    classement après n'importe quelle manche s'en déduit sans recalcul
+    (`championnat.classement_apres`).
 
     Paramètres
     ----------
-    sess : fastf1.core.Session
-        Session FastF1 déjà chargée.
-    pilote : str | int
-        Identifiant pilote (abréviation 3 lettres, numéro ou BroadcastName).
-    lap_number : int | None
-        Numéro de tour à tracer. Si None, utilise le tour le plus rapide.
-    cmap : matplotlib colormap
-        Colormap utilisée (par défaut plasma).
-    figsize : tuple[float, float]
-        Taille de la figure en pouces.
-    dpi : int
-        Résolution de la figure.
-    linewidth_track : float
-        Épaisseur de la ligne de fond (piste).
-    linewidth_speed : float
-        Épaisseur de la ligne colorée par la vitesse.
-    show_colorbar : bool
-        Afficher la barre de couleurs.
+    annee : int
+        L'année de la saison.
+    upto_event : str
+        Le nom du Grand Prix jusqu'auquel suivre le championnat.
 
     Retour
     ------
-    matplotlib.figure.Figure
+    dict
+        Dictionnaire vide si données indisponibles, sinon (partagé, lecture seule) :
+        - pilotes : DataFrame manche × pilote (BroadcastName) des points cumulés
+        - equipes : DataFrame manche × équipe (TeamName) des points cumulés
+        - equipes_pilotes : DataFrame manche × pilote de l'équipe courante
+        - manches : Series RoundNumber → EventName des manches enregistrées
+        - manche : numéro de manche de `upto_event`
     """
-    # Résoudre l'abréviation depuis BroadcastName/numéro si nécessaire
-    drv_identifier = pilote
-    try:
-        res = getattr(sess, "results", None)
-        if res is not None and not res.empty:
-            if isinstance(pilote, str) and 'BroadcastName' in res.columns and 'Abbreviation' in res.columns:
-                m = dict(zip(res['BroadcastName'], res['Abbreviation']))
-                drv_identifier = m.get(pilote, pilote)
-            if 'DriverNumber' in res.columns and 'Abbreviation' in res.columns:
-                mnum = dict(zip(res['DriverNumber'].astype(str), res['Abbreviation']))
-                drv_identifier = mnum.get(str(drv_identifier), drv_identifier)
-    except Exception:
-        pass
-
-    # Récupérer le tour
-    laps = sess.laps.pick_drivers(drv_identifier)
-    if laps is None or laps.empty:
-        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('white')
-        ax.text(0.5, 0.5, "Aucun tour pour ce pilote", ha='center', va='center')
-        ax.axis('off')
-        return fig
-
-    if lap_number is not None:
-        lap = laps.loc[laps['LapNumber'] == lap_number]
-        if lap is None or lap.empty:
-            # fallback sur le plus rapide
-            lap = laps.pick_fastest()
-        else:
-            # lap est un DataFrame d'une seule ligne -> convertir en Lap object
-            lap = lap.iloc[0]
-    else:
-        lap = laps.pick_fastest()
-
-    # Télémetrie avec position XY et vitesse (peut être get_telemetry selon version FastF1)
-    try:
-        tel = lap.get_telemetry()
-    except Exception:
-        # compatibilité avec anciens attributs
-        tel = getattr(lap, 'telemetry', None)
-        if tel is None:
-            fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
-            fig.patch.set_facecolor('white')
-            ax.set_facecolor('white')
-            ax.text(0.5, 0.5, "Télémetrie indisponible", ha='center', va='center')
-            ax.axis('off')
-            return fig
-
-    # Variables de tracé
-    x = tel['X']
-    y = tel['Y']
-    speed = tel['Speed']
-
-    # Segments colorés
-    points = np.array([x, y]).T.reshape(-1, 1, 2)
-    segments = np.concatenate([points[:-1], points[1:]], axis=1)
-
-    fig, ax = plt.subplots(sharex=True, sharey=True, figsize=figsize, dpi=dpi)
-    fig.patch.set_facecolor('black')
-    ax.set_facecolor('black')
-
-    # Titre
-    try:
-        gp_name = sess.event.name
-        year = int(sess.event.year)
-    except Exception:
-        gp_name, year = sess.name, ''
-    title_id = drv_identifier
-    try:
-        # Utiliser BroadcastName si dispo pour le titre, sinon abréviation
-        res = getattr(sess, "results", None)
-        if res is not None and not res.empty and 'Abbreviation' in res and 'BroadcastName' in res:
-            inv = dict(zip(res['Abbreviation'], res['BroadcastName']))
-            title_id = inv.get(str(drv_identifier), str(drv_identifier))
-    except Exception:
-        pass
-    fig.suptitle(f"{gp_name} {year} – {title_id} – Vitesse", size=18, y=0.97)
-
-    # Marges et axes
-    plt.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.12)
-    ax.axis('off')
-
-    # Ligne de fond (piste)
-    ax.plot(x, y, color='black', linestyle='-', linewidth=linewidth_track, zorder=0)
-
-    # Ligne colorée par la vitesse
-    norm = plt.Normalize(speed.min(), speed.max())
-    lc = LineCollection(segments, cmap=cmap, norm=norm, linestyle='-', linewidth=linewidth_speed)
-    lc.set_array(speed)
-    ax.add_collection(lc)
-
-    # Barre de couleurs
-    if show_colorbar:
-        cbaxes = fig.add_axes([0.25, 0.05, 0.5, 0.05])
-        normlegend = mpl.colors.Normalize(vmin=float(speed.min()), vmax=float(speed.max()))
-        mpl.colorbar.ColorbarBase(cbaxes, norm=normlegend, cmap=cmap, orientation="horizontal")
-
-    plt.tight_layout()
-    return fig
-
-
-# --- Visualisation des rapports engagés (nGear) le long de la trajectoire ---
-def figure_carte_rapports(sess,
-                           pilote,
-                           lap_number: int | None = None,
-                           cmap=None,
-                           figsize=(12, 6.75),
-                           dpi=100,
-                           linewidth_track: float = 16,
-                           linewidth_gears: float = 4,
-                           show_colorbar: bool = True):
+    registre, manche = _registre_jusqua(annee, upto_event)
+    if registre is None:
+        return {}
+    connue = _PROGRESSIONS.get((annee, manche))
+    if connue is not None and connue[0] is registre:
+        return connue[1]
+    jusqua = registre[registre['RoundNumber'] <= manche]
+    if jusqua.empty:
+        return {}
+    progression = dict(
+        pilotes=championnat.progression(jusqua, 'BroadcastName'),
+        equipes=championnat.progression(jusqua, 'TeamName'),
+        equipes_pilotes=championnat.equipes_par_manche(jusqua),
+        manches=jusqua.drop_duplicates('RoundNumber').set_index('RoundNumber')['EventName'],
+        manche=manche,
+    )
+    # Le registre complété est un nouvel objet : une manche ajoutée invalide l'entrée
+    _PROGRESSIONS[(annee, manche)] = (registre, progression)
+    return progression
+
+def calcul_classement_pilote(annee: int, upto_event: str) -> pd.DataFrame:
     """
-    Visualisation des rapports engagés (nGear) le long de la trajectoire.
+    Calcule le classement cumulé des pilotes jusqu'à un événement donné.
 
+    Lu dans la matrice de `progression_championnat` (registre de la saison).
+    
     Paramètres
     ----------
-    sess : fastf1.core.Session
-        Session FastF1 déjà chargée.
-    pilote : str | int
-        Identifiant pilote (abréviation 3 lettres, numéro ou BroadcastName).
-    lap_number : int | None
-        Numéro de tour à tracer. Si None, utilise le tour le plus rapide.
-    cmap : matplotlib colormap | None
-        Colormap utilisée. Par défaut 'Paired'.
-    figsize : tuple[float, float]
-        Taille de la figure en pouces.
-    dpi : int
-        Résolution de la figure.
-    linewidth_track : float
-        Épaisseur de la ligne de fond (piste).
-    linewidth_gears : float
-        Épaisseur de la ligne colorée par le rapport engagé.
-    show_colorbar : bool
-        Afficher la barre de couleurs.
-
+    annee : int
+        L'année de la saison.
+    upto_event : str
+        Le nom du Grand Prix jusqu'auquel calculer le classement.
+    
     Retour
     ------
-    matplotlib.figure.Figure
+    pd.DataFrame
+        DataFrame avec colonnes : Position, BroadcastName, TeamName, Points.
+        DataFrame vide si erreur ou données indisponibles.
     """
-    # Choix de la colormap
-    if cmap is None:
-        cmap = mpl.colormaps['Paired']
-
-    # Résoudre l'identifiant pilote (comme dans figure_carte_vitesse)
-    drv_identifier = pilote
-    try:
-        res = getattr(sess, "results", None)
-        if res is not None and not res.empty:
-            if isinstance(pilote, str) and 'BroadcastName' in res.columns and 'Abbreviation' in res.columns:
-                m = dict(zip(res['BroadcastName'], res['Abbreviation']))
-                drv_identifier = m.get(pilote, pilote)
-            if 'DriverNumber' in res.columns and 'Abbreviation' in res.columns:
-                mnum = dict(zip(res['DriverNumber'].astype(str), res['Abbreviation']))
-                drv_identifier = mnum.get(str(drv_identifier), drv_identifier)
-    except Exception:
-        pass
-
-    # Sélection du tour
-    laps = sess.laps.pick_drivers(drv_identifier)
-    if laps is None or laps.empty:
-        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('white')
-        ax.text(0.5, 0.5, "Aucun tour pour ce pilote", ha='center', va='center')
-        ax.axis('off')
-        return fig
-
-    if lap_number is not None:
-        lap = laps.loc[laps['LapNumber'] == lap_number]
-        if lap is None or lap.empty:
-            lap = laps.pick_fastest()
-        else:
-            lap = lap.iloc[0]
-    else:
-        lap = laps.pick_fastest()
-
-    # Télémetrie et données
-    try:
-        tel = lap.get_telemetry()
-    except Exception:
-        tel = getattr(lap, 'telemetry', None)
-        if tel is None:
-            fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
-            fig.patch.set_facecolor('white')
-            ax.set_facecolor('white')
-            ax.text(0.5, 0.5, "Télémetrie indisponible", ha='center', va='center')
-            ax.axis('off')
-            return fig
-
-    x = np.array(tel['X'].values)
-    y = np.array(tel['Y'].values)
-
-    points = np.array([x, y]).T.reshape(-1, 1, 2)
-    segments = np.concatenate([points[:-1], points[1:]], axis=1)
-
-    # nGear en float pour colormap et bornes 1..9 (boîtes 1..8 habituellement)
-    gear = tel['nGear'].to_numpy().astype(float)
-
-    # Figure
-    fig, ax = plt.subplots(sharex=True, sharey=True, figsize=figsize, dpi=dpi)
-    fig.patch.set_facecolor('black')
-    ax.set_facecolor('black')
-
-    # Titre
-    try:
-        gp_name = sess.event.name
-        year = int(sess.event.year)
-    except Exception:
-        gp_name, year = sess.name, ''
-    title_id = drv_identifier
-    try:
-        res = getattr(sess, "results", None)
-        if res is not None and not res.empty and 'Abbreviation' in res and 'BroadcastName' in res:
-            inv = dict(zip(res['Abbreviation'], res['BroadcastName']))
-            title_id = inv.get(str(drv_identifier), str(drv_identifier))
-    except Exception:
-        pass
-    fig.suptitle(f"{gp_name} {year} – {title_id} – Rapports", size=18, y=0.97)
-
-    # Fond de piste
-    ax.plot(x, y, color='black', linestyle='-', linewidth=linewidth_track, zorder=0)
-
-    # Collection de lignes colorées par rapport
-    lc = LineCollection(segments, norm=plt.Normalize(1, cmap.N + 1), cmap=cmap)
-    lc.set_array(gear)
-    lc.set_linewidth(linewidth_gears)
-    ax.add_collection(lc)
-
-    # Aspect & axes
-    ax.axis('equal')
-    ax.tick_params(labelleft=False, left=False, labelbottom=False, bottom=False)
-    ax.axis('off')
-
-    # Colorbar (ticks centrés sur chaque couleur)
-    if show_colorbar:
-        cbar = plt.colorbar(mappable=lc, ax=ax, label="Rapport", boundaries=np.arange(1, 10), fraction=0.046, pad=0.04)
-        cbar.set_ticks(np.arange(1.5, 9.5))
-        cbar.set_ticklabels(np.arange(1, 9))
-
-    plt.tight_layout()
-    return fig
-
-
-# --- Carte du circuit avec numérotation des virages ---
-
-def figure_carte_virages(sess,
-                          pilote: str | int | None = None,
-                          lap_number: int | None = None,
-                          figsize=(12, 6.75),
-                          dpi=100,
-                          track_color='black',
-                          track_linewidth: float = 2.0,
-                          bubble_color='grey',
-                          bubble_size: float = 140.0,
-                          link_color='grey',
-                          offset_length: float = 500.0,
-                          show_title: bool = True):
+    prog = progression_championnat(annee, upto_event)
+    if not prog:
+        return pd.DataFrame()
+    return championnat.classement_apres(prog['pilotes'], prog['manche'], prog['equipes_pilotes'])
+
+def calcul_classement_constructeur(annee: int, upto_event: str) -> pd.DataFrame:
     """
-    Trace la carte du circuit à partir des données de position d'un tour et
-    annote la carte avec les numéros de virage.
+    Calcule le classement cumulé des constructeurs jusqu'à un événement donné.
 
+    Lu dans la matrice de `progression_championnat` (registre de la saison).
+    
     Paramètres
     ----------
-    sess : fastf1.core.Session
-        Session FastF1 déjà chargée.
-    pilote : str | int | None
-        Pilote ciblé (abréviation / numéro / BroadcastName). Si None, on utilise
-        simplement le tour le plus rapide de la session (tous pilotes).
-    lap_number : int | None
-        Numéro de tour à tracer. Si None, utilise le tour le plus rapide pour
-        le pilote choisi (ou celui de la session si `pilote` est None).
-    figsize, dpi :
-        Taille et résolution de la figure.
-    track_color, track_linewidth :
-        Couleur/épaisseur de la ligne du tracé (piste).
-    bubble_color, bubble_size :
-        Couleur/taille des bulles contenant les numéros de virage.
-    link_color :
-        Couleur du trait joignant la piste à la bulle.
-    offset_length :
-        Longueur du vecteur de décalage latéral des étiquettes.
-    show_title : bool
-        Afficher le titre (localisation de l'événement).
-
+    annee : int
+        L'année de la saison.
+    upto_event : str
+        Le nom du Grand Prix jusqu'auquel calculer le classement.
+    
     Retour
     ------
-    matplotlib.figure.Figure
+    pd.DataFrame
+        DataFrame avec colonnes : Position, TeamName, Points.
+        DataFrame vide si erreur ou données indisponibles.
     """
-    import numpy as _np
-
-    def _rotate(xy, *, angle):
-        rot_mat = _np.array([[ _np.cos(angle),  _np.sin(angle)],
-                             [-_np.sin(angle),  _np.cos(angle)]])
-        return _np.matmul(xy, rot_mat)
-
-    # Sélection du tour
-    laps = sess.laps
-    if pilote is not None:
-        # Tenter de résoudre l'identifiant abrégé comme dans les autres helpers
-        drv_identifier = pilote
-        try:
-            res = getattr(sess, "results", None)
-            if res is not None and not res.empty:
-                if isinstance(pilote, str) and 'BroadcastName' in res.columns and 'Abbreviation' in res.columns:
-                    m = dict(zip(res['BroadcastName'], res['Abbreviation']))
-                    drv_identifier = m.get(pilote, pilote)
-                if 'DriverNumber' in res.columns and 'Abbreviation' in res.columns:
-                    mnum = dict(zip(res['DriverNumber'].astype(str), res['Abbreviation']))
-                    drv_identifier = mnum.get(str(drv_identifier), drv_identifier)
-        except Exception:
-            pass
-        laps = laps.pick_drivers(drv_identifier)
-
-    if laps is None or laps.empty:
-        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('white')
-        ax.text(0.5, 0.5, "Aucun tour disponible", ha='center', va='center')
-        ax.axis('off')
-        return fig
-
-    if lap_number is not None:
-        lap = laps.loc[laps['LapNumber'] == lap_number]
-        if lap is None or lap.empty:
-            lap = laps.pick_fastest()
-        else:
-            lap = lap.iloc[0]
-    else:
-        lap = laps.pick_fastest()
-
-    # Position et infos circuit
-    try:
-        pos = lap.get_pos_data()
-    except Exception:
-        pos = None
-    try:
-        circuit_info = sess.get_circuit_info()
-    except Exception:
-        circuit_info = None
-
-    # Créer la figure
-    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
-    fig.patch.set_facecolor('white')
-    ax.set_facecolor('white')
-
-    if pos is None or pos.empty:
-        ax.text(0.5, 0.5, "Données de position indisponibles", ha='center', va='center')
-        ax.axis('off')
-        return fig
-
-    track = pos.loc[:, ('X', 'Y')].to_numpy()
-
-    # Angle global de rotation de la carte
-    track_angle = 0.0
-    if circuit_info is not None and hasattr(circuit_info, 'rotation'):
-        try:
-            track_angle = float(circuit_info.rotation) / 180.0 * _np.pi
-        except Exception:
-            track_angle = 0.0
-
-    rotated_track = _rotate(track, angle=track_angle)
-
-    # Tracé piste
-    ax.plot(rotated_track[:, 0], rotated_track[:, 1], color=track_color, linewidth=track_linewidth)
-
-    # Annoter les virages
-    if circuit_info is not None and getattr(circuit_info, 'corners', None) is not None and not circuit_info.corners.empty:
-        offset_vec = _np.array([offset_length, 0])
-        for _, corner in circuit_info.corners.iterrows():
-            try:
-                txt = f"{corner['Number']}{corner['Letter']}"
-
-                # Angle local de la pancarte
-                offset_angle = float(corner['Angle']) / 180.0 * _np.pi
-                offset_x, offset_y = _rotate(offset_vec, angle=offset_angle)
-
-                # Position texte
-                text_x = float(corner['X']) + offset_x
-                text_y = float(corner['Y']) + offset_y
-
-                # Rotation globale pour rester cohérent avec la piste
-                text_x, text_y = _rotate([text_x, text_y], angle=track_angle)
-                track_x, track_y = _rotate([float(corner['X']), float(corner['Y'])], angle=track_angle)
-
-                # Bulle + lien
-                ax.scatter(text_x, text_y, color=bubble_color, s=bubble_size)
-                ax.plot([track_x, text_x], [track_y, text_y], color=link_color)
-                ax.text(text_x, text_y, txt, va='center_baseline', ha='center', size='small', color='white')
-            except Exception:
-                continue
-
-    # Finition
-    if show_title:
-        try:
-            title_txt = sess.event['Location'] if isinstance(sess.event, dict) else getattr(sess.event, 'Location', None)
-            if not title_txt:
-                title_txt = getattr(sess.event, 'name', '')
-            plt.title(title_txt)
-        except Exception:
-            pass
-    plt.xticks([])
-    plt.yticks([])
-    plt.axis('equal')
-    plt.tight_layout()
-    return fig
-
+    prog = progression_championnat(annee, upto_event)
+    if not prog:
+        return pd.DataFrame()
+    return championnat.classement_apres(prog['equipes'], prog['manche'])
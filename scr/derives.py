@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import logging
+
+import pandas as pd
+
+from .cache import DictionnaireFige
+from .utils import formatage_timedelta_serie
+
+_logger = logging.getLogger(__name__)
+
+# Tables dérivées matérialisées au chargement : nom → (entrées dont elle dépend, fonction)
+TABLES_DERIVEES: dict = {}
+
+
+def table_derivee(nom: str, depend: tuple[str, ...]):
+    """
+    Déclare une table dérivée calculée une fois par session par `materialiser`.
+
+    Paramètres
+    ----------
+    nom : str
+        Clé de la table dans `donnees["derivees"]`.
+    depend : tuple[str, ...]
+        Entrées utilisées ("tours", "resultats", "type_session"...), passées
+        en arguments nommés à la fonction. La table n'est recalculée que si
+        l'une d'elles change.
+    """
+    def _enregistrer(fonction):
+        TABLES_DERIVEES[nom] = (tuple(depend), fonction)
+        return fonction
+    return _enregistrer
+
+
+def empreinte(valeur):
+    """Empreinte d'une entrée, pour savoir si une table dérivée est à recalculer."""
+    if isinstance(valeur, pd.DataFrame):
+        try:
+            contenu = int(pd.util.hash_pandas_object(valeur, index=True).sum())
+        except TypeError:
+            # Colonne non hachable : l'objet lui-même fait foi
+            contenu = id(valeur)
+        return valeur.shape, tuple(map(str, valeur.columns)), contenu
+    return valeur
+
+
+def materialiser(entrees: dict, precedentes: dict | None = None) -> tuple[DictionnaireFige, dict]:
+    """
+    Calcule toutes les tables déclarées par `table_derivee`.
+
+    Paramètres
+    ----------
+    entrees : dict
+        Nom → valeur des entrées disponibles (tables de la session, type de session).
+    precedentes : dict | None
+        Données partagées précédentes de la même session (clés "derivees" et
+        "empreintes") : une table dont les entrées n'ont pas changé est reprise telle quelle.
+
+    Retour
+    ------
+    tuple
+        (nom → table, lecture seule ; nom d'entrée → empreinte).
+    """
+    empreintes = {nom: empreinte(valeur) for nom, valeur in entrees.items()}
+    anciennes = (precedentes or {}).get("derivees") or {}
+    anciennes_empreintes = (precedentes or {}).get("empreintes") or {}
+
+    tables = {}
+    for nom, (depend, fonction) in TABLES_DERIVEES.items():
+        inchangee = nom in anciennes and all(
+            d in anciennes_empreintes and anciennes_empreintes[d] == empreintes.get(d) for d in depend
+        )
+        if inchangee:
+            tables[nom] = anciennes[nom]
+            continue
+        try:
+            tables[nom] = fonction(**{d: entrees.get(d) for d in depend})
+        except Exception as e:
+            _logger.warning("Table dérivée %s non calculée : %s", nom, e)
+            tables[nom] = pd.DataFrame()
+    return DictionnaireFige(tables), empreintes
+
+
+# --- Tables dérivées des tours ---
+
+@table_derivee("relais", depend=("tours",))
+def relais(tours: pd.DataFrame) -> pd.DataFrame:
+    """Premier et dernier tour de chaque relais, avec le composé (vide sans infos de relais)."""
+    if not {'Stint', 'Compound', 'LapNumber'}.issubset(tours.columns):
+        return pd.DataFrame()
+    return (tours.dropna(subset=['Stint'])
+                 .groupby(['Driver', 'Stint'], observed=True)
+                 .agg(StartLap=('LapNumber', 'min'), EndLap=('LapNumber', 'max'),
+                      Compound=('Compound', 'last'))
+                 .reset_index())
+
+
+@table_derivee("relais_moyennes", depend=("tours",))
+def relais_moyennes(tours: pd.DataFrame) -> pd.DataFrame:
+    """Temps moyen au tour (s) par pilote, relais et composé."""
+    if not {'Stint', 'Compound', 'LapSeconds'}.issubset(tours.columns):
+        return pd.DataFrame()
+    return (tours.dropna(subset=['LapSeconds', 'Stint'])
+                 .groupby(['Driver', 'Stint', 'Compound'], observed=True)['LapSeconds']
+                 .mean().reset_index(name='AvgLapSec'))
+
+
+@table_derivee("arrets", depend=("tours",))
+def arrets(tours: pd.DataFrame) -> pd.DataFrame:
+    """Tours d'entrée ou de sortie des stands, temps formatés pour l'affichage."""
+    if not {'PitInTime', 'PitOutTime', 'PitStop'} & set(tours.columns):
+        return pd.DataFrame()
+    cols = [c for c in ['Driver', 'LapNumber', 'PitInTime', 'PitOutTime', 'PitStop', 'Compound'] if c in tours.columns]
+    pits = tours[cols]
+    mask = pd.Series(False, index=pits.index)
+    if 'PitInTime' in pits:  mask = mask | pits['PitInTime'].notna()
+    if 'PitOutTime' in pits: mask = mask | pits['PitOutTime'].notna()
+    if 'PitStop' in pits:    mask = mask | (pits['PitStop'].fillna(0).astype(int) > 0)
+    pits = pits[mask].copy()
+    for c in ['PitInTime', 'PitOutTime']:
+        if c in pits:
+            pits[c] = formatage_timedelta_serie(pits[c])
+    return pits
+
+
+@table_derivee("composes", depend=("tours",))
+def composes(tours: pd.DataFrame) -> pd.DataFrame:
+    """Nombre de tours par pilote et par composé."""
+    if 'Compound' not in tours:
+        return pd.DataFrame()
+    return (tours.dropna(subset=['Compound'])
+                 .groupby(['Driver', 'Compound'], observed=True).size()
+                 .reset_index(name='Tours'))
+
+
+@table_derivee("top_tours", depend=("tours",))
+def top_tours(tours: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Les `n` meilleurs tours de la session, avec le temps formaté (LapTimeStr)."""
+    if tours.empty or 'LapTime' not in tours:
+        return pd.DataFrame()
+    cols = [c for c in ['Driver', 'LapNumber', 'LapTime', 'LapSeconds', 'Compound', 'Stint'] if c in tours.columns]
+    top = tours.loc[tours['LapTime'].notna(), cols].nsmallest(n, 'LapTime').copy()
+    top['LapTimeStr'] = formatage_timedelta_serie(top['LapTime'])
+    return top
+
+
+@table_derivee("classement", depend=("tours", "resultats", "type_session"))
+def classement_session(tours: pd.DataFrame, resultats: pd.DataFrame, type_session: str) -> pd.DataFrame:
+    """
+    Calcule le classement d'une session donnée.
+
+    Paramètres
+    ----------
+    tours : pd.DataFrame
+        DataFrame contenant les tours de la session.
+    resultats : pd.DataFrame
+        DataFrame contenant les résultats officiels (si disponibles).
+    type_session : str
+        Type de session ("FP1", "FP2", "FP3", "Q", "R").
+
+    Retour
+    ------
+    pd.DataFrame
+        DataFrame du classement avec colonnes selon le type de session.
+        DataFrame vide si données insuffisantes.
+    """
+    if type_session == 'R' and not resultats.empty and 'Position' in resultats:
+        cols = [c for c in ["Position","BroadcastName","DriverNumber","TeamName","TeamColor","Points","Status","Time","FastestLapTime"] if c in resultats.columns]
+        df = resultats[cols].copy()
+        for c in ["Time","FastestLapTime"]:
+            if c in df.columns:
+                try:
+                    df[c] = formatage_timedelta_serie(df[c])
+                except Exception:
+                    pass
+        return df.sort_values('Position').reset_index(drop=True)
+
+    if 'Driver' not in tours or 'LapTime' not in tours:
+        return pd.DataFrame()
+    tmp = (tours.dropna(subset=['Driver','LapTime'])
+                .groupby('Driver', as_index=False, observed=True)
+                .agg(BestLapTime=('LapTime','min'),
+                     BestLapNo=('LapNumber','min')))
+    tmp['BestLapStr'] = formatage_timedelta_serie(tmp['BestLapTime'])
+    if 'Team' in tours.columns:
+        team_map = tours.dropna(subset=['Driver']).drop_duplicates('Driver').set_index('Driver')['Team'].to_dict()
+        tmp['Team'] = tmp['Driver'].map(team_map)
+    tmp = tmp.sort_values('BestLapTime').reset_index(drop=True)
+    tmp['Position'] = tmp.index + 1
+    return tmp[['Position','Driver','Team','BestLapNo','BestLapStr'] if 'Team' in tmp.columns else ['Position','Driver','BestLapNo','BestLapStr']]
@@ -0,0 +1,274 @@
+"""
+Export d'une saison complète vers un jeu de données Parquet partitionné.
+
+Utilisation :
+    python -m scr.export_saison 2025 --sortie dataset --sessions R Q --telemetrie
+
+Arborescence produite (partitions « hive », relues par `pyarrow.dataset`
+ou `pd.read_parquet(dossier)` avec les colonnes year / event / session) :
+    dataset/laps/year=2025/event=Australian%20Grand%20Prix/session=R/part-0.parquet
+    dataset/results/...   dataset/weather/...   dataset/telemetry/...
+
+Chaque session terminée est notée dans dataset/_manifestes/ ; une relance
+saute les sessions à jour et reprend les autres.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import quote
+
+import fastf1
+import numpy as np
+import pandas as pd
+
+from .calendrier import calendrier
+from .data import chargement_session
+from .exports import ecrire_export
+from .instantane import _ecrire_atomique
+
+_logger = logging.getLogger(__name__)
+
+# À incrémenter si le contenu exporté change : les partitions d'une autre version sont réécrites
+VERSION_EXPORT = 1
+
+# Table du jeu de données → clé dans les données de `chargement_session`
+TABLES_SESSION = {"laps": "tours", "results": "resultats", "weather": "meteo"}
+TABLE_TELEMETRIE = "telemetry"
+
+SESSIONS_DEFAUT = ("R",)
+
+
+def dossier_partition(sortie, table: str, annee: int, course: str, sess_type: str) -> Path:
+    """Dossier d'une partition : <sortie>/<table>/year=…/event=…/session=…"""
+    return (Path(sortie) / table / f"year={annee}" / f"event={quote(course, safe='')}"
+            / f"session={quote(sess_type, safe='')}")
+
+
+def _manifeste(sortie, annee: int, course: str, sess_type: str) -> Path:
+    # Hors des dossiers de tables : la lecture du jeu de données ne le voit pas
+    return Path(sortie) / "_manifestes" / str(annee) / quote(course, safe='') / f"{quote(sess_type, safe='')}.json"
+
+
+def partition_a_jour(sortie, annee: int, course: str, sess_type: str, tables) -> bool:
+    """True si la session a déjà été exportée (même version, toutes les `tables`)."""
+    try:
+        contenu = json.loads(_manifeste(sortie, annee, course, sess_type).read_text())
+    except (OSError, ValueError):
+        return False
+    return (contenu.get("version") == VERSION_EXPORT
+            and contenu.get("fastf1") == fastf1.__version__
+            and set(tables) <= set(contenu.get("tables", ())))
+
+
+def telemetrie_par_tour(sess) -> pd.DataFrame:
+    """
+    Télémétrie voiture de toute la session, chaque échantillon rattaché à son tour.
+
+    Retour
+    ------
+    pd.DataFrame
+        Colonnes de `car_data` + DriverNumber et LapNumber ; les échantillons
+        hors tour (stands, avant le départ) sont écartés.
+    """
+    morceaux = []
+    for numero, tours in sess.laps.dropna(subset=['LapStartTime', 'Time']).groupby('DriverNumber', observed=True):
+        car = sess.car_data.get(str(numero))
+        if car is None or car.empty:
+            continue
+        tours = tours.sort_values('LapStartTime')
+        temps = car['SessionTime'].to_numpy()
+        debuts = tours['LapStartTime'].to_numpy()
+        # Tour de chaque échantillon en une recherche dichotomique
+        i = np.searchsorted(debuts, temps, side='right') - 1
+        dans_tour = i >= 0
+        dans_tour[dans_tour] = temps[dans_tour] <= tours['Time'].to_numpy()[i[dans_tour]]
+        tranche = pd.DataFrame(car.loc[dans_tour])
+        tranche.insert(0, 'LapNumber', tours['LapNumber'].to_numpy()[i[dans_tour]])
+        tranche.insert(0, 'DriverNumber', str(numero))
+        morceaux.append(tranche)
+    if not morceaux:
+        return pd.DataFrame()
+    return pd.concat(morceaux, ignore_index=True)
+
+
+def exporter_session(annee: int, course: str, sess_type: str, sortie,
+                     telemetrie: bool = False, forcer: bool = False) -> tuple[str, str]:
+    """
+    Exporte une session dans le jeu de données (une partition par table).
+
+    Paramètres
+    ----------
+    annee, course, sess_type :
+        Session à exporter (ex. 2025, "Australian Grand Prix", "R").
+    sortie : str | Path
+        Racine du jeu de données.
+    telemetrie : bool, optionnel
+        Exporter aussi la télémétrie voiture par tour (volumineux).
+    forcer : bool, optionnel
+        Réécrire la partition même si elle est à jour.
+
+    Retour
+    ------
+    tuple[str, str]
+        (statut, détail) avec statut parmi "ecrite", "a_jour", "vide", "echec".
+    """
+    tables = [*TABLES_SESSION, *([TABLE_TELEMETRIE] if telemetrie else [])]
+    if not forcer and partition_a_jour(sortie, annee, course, sess_type, tables):
+        return "a_jour", ""
+    parties = ("tours", "resultats", "meteo", *(("telemetrie",) if telemetrie else ()))
+    try:
+        data = chargement_session(annee, course, sess_type, parties=parties)
+        contenus = {table: data[cle] for table, cle in TABLES_SESSION.items()}
+        if telemetrie:
+            contenus[TABLE_TELEMETRIE] = telemetrie_par_tour(data["session"])
+        ecrites, vides = [], []
+        for table, df in contenus.items():
+            dossier = dossier_partition(sortie, table, annee, course, sess_type)
+            if df is None or df.empty:
+                # Table vide pour cette session (météo absente...) : pas de fichier,
+                # ni celui d'un export précédent
+                (dossier / "part-0.parquet").unlink(missing_ok=True)
+                vides.append(table)
+                continue
+            dossier.mkdir(parents=True, exist_ok=True)
+            _ecrire_atomique(dossier / "part-0.parquet", lambda tmp, df=df: ecrire_export(df, "parquet", tmp))
+            ecrites.append(table)
+        if not ecrites:
+            return "vide", "aucune donnée"
+        # Manifeste écrit en dernier : une partition interrompue sera refaite à la relance.
+        # Les tables vides y sont notées comme faites : la session est à jour à la relance.
+        manifeste = _manifeste(sortie, annee, course, sess_type)
+        manifeste.parent.mkdir(parents=True, exist_ok=True)
+        contenu = json.dumps(dict(version=VERSION_EXPORT, fastf1=fastf1.__version__, tables=[*ecrites, *vides],
+                                  vides=vides, lignes={t: int(len(contenus[t])) for t in ecrites}))
+        _ecrire_atomique(manifeste, lambda tmp: tmp.write_text(contenu))
+        return "ecrite", ", ".join(ecrites)
+    except Exception as e:
+        return "echec", f"{type(e).__name__}: {e}"
+
+
+def sessions_saison(annee: int, sessions=SESSIONS_DEFAUT, courses=None,
+                    maintenant: pd.Timestamp | None = None) -> list[tuple[str, str]]:
+    """
+    Sessions déjà courues d'une saison, d'après le calendrier (`scr.calendrier`).
+
+    Paramètres
+    ----------
+    annee : int
+        Saison.
+    sessions : iterable[str]
+        Types de session voulus ("R", "Q", "S", "FP1"...).
+    courses : iterable[str] | None
+        Restreint aux Grands Prix nommés.
+    maintenant : pd.Timestamp | None
+        Date de référence (UTC), par défaut l'heure courante.
+
+    Retour
+    ------
+    list[tuple[str, str]]
+        (nom du Grand Prix, type de session), dans l'ordre du calendrier.
+    """
+    maintenant = maintenant if maintenant is not None else pd.Timestamp.now(tz="UTC").tz_localize(None)
+    cal = calendrier(annee)
+    if cal is None:
+        raise ValueError(f"Calendrier indisponible pour {annee}")
+    plan = []
+    for nom in cal.noms:
+        if courses and nom not in courses:
+            continue
+        for sess_type in sessions:
+            date = cal.date_session(nom, sess_type)
+            # None : session absente de ce week-end (pas de sprint...)
+            if date is not None and pd.notna(date) and pd.Timestamp(date) <= maintenant:
+                plan.append((nom, sess_type))
+    return plan
+
+
+def _initialiser_processus(cache: str | None):
+    if cache:
+        fastf1.Cache.enable_cache(cache)
+    fastf1.set_log_level("WARNING")
+
+
+def exporter_saison(annee: int, sortie, sessions=SESSIONS_DEFAUT, courses=None, telemetrie: bool = False,
+                    forcer: bool = False, processus: int = 4, cache: str | None = "cache",
+                    plan: list | None = None) -> dict:
+    """
+    Exporte toutes les sessions courues d'une saison, en parallèle.
+
+    Paramètres
+    ----------
+    annee : int
+        Saison.
+    sortie : str | Path
+        Racine du jeu de données.
+    sessions, courses :
+        Voir `sessions_saison`.
+    telemetrie, forcer :
+        Voir `exporter_session`.
+    processus : int, optionnel
+        Taille du pool de processus ; 0 exporte dans le processus courant.
+    cache : str | None, optionnel
+        Dossier du cache FastF1 utilisé par chaque processus.
+    plan : list | None, optionnel
+        (course, type de session) à exporter, à la place du calendrier.
+
+    Retour
+    ------
+    dict
+        (course, type de session) → (statut, détail).
+    """
+    if plan is None:
+        _initialiser_processus(cache)
+        plan = sessions_saison(annee, sessions, courses)
+    bilan = {}
+    if processus <= 0:
+        for course, sess_type in plan:
+            bilan[(course, sess_type)] = exporter_session(annee, course, sess_type, sortie, telemetrie, forcer)
+            _logger.info("%s %s : %s %s", course, sess_type, *bilan[(course, sess_type)])
+        return bilan
+    with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_processus, initargs=(cache,)) as pool:
+        futurs = {pool.submit(exporter_session, annee, course, sess_type, str(sortie), telemetrie, forcer):
+                  (course, sess_type) for course, sess_type in plan}
+        for futur in as_completed(futurs):
+            cle = futurs[futur]
+            try:
+                bilan[cle] = futur.result()
+            except Exception as e:
+                bilan[cle] = ("echec", f"{type(e).__name__}: {e}")
+            _logger.info("%s %s : %s %s", *cle, *bilan[cle])
+    return bilan
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scr.export_saison",
+                                     description="Exporte une saison vers un jeu de données Parquet partitionné.")
+    parser.add_argument("annee", type=int, help="saison (ex. 2025)")
+    parser.add_argument("--sortie", default="dataset", help="racine du jeu de données (défaut : dataset)")
+    parser.add_argument("--sessions", nargs="+", default=list(SESSIONS_DEFAUT),
+                        help="types de session (défaut : R)")
+    parser.add_argument("--courses", nargs="+", help="Grands Prix à exporter (défaut : tous ceux déjà courus)")
+    parser.add_argument("--telemetrie", action="store_true", help="exporter aussi la télémétrie par tour")
+    parser.add_argument("--forcer", action="store_true", help="réécrire les partitions déjà à jour")
+    parser.add_argument("--processus", type=int, default=min(4, os.cpu_count() or 1),
+                        help="processus en parallèle (0 : aucun pool)")
+    parser.add_argument("--cache", default="cache", help="dossier du cache FastF1 (défaut : cache)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    bilan = exporter_saison(args.annee, args.sortie, args.sessions, args.courses, args.telemetrie,
+                            args.forcer, args.processus, args.cache)
+    statuts = Counter(statut for statut, _ in bilan.values())
+    print(", ".join(f"{n} {statut}" for statut, n in statuts.items()) or "Aucune session à exporter.")
+    return 1 if "echec" in statuts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
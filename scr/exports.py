@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .cache import MAGASIN_EXPORTS, cle_session
+
+# Format → (extension, type MIME, libellé)
+FORMATS_EXPORT = {
+    "csv": ("csv", "text/csv", "CSV"),
+    "csv.gz": ("csv.gz", "application/gzip", "CSV (gzip)"),
+    "csv.zst": ("csv.zst", "application/zstd", "CSV (zstd)"),
+    "parquet": ("parquet", "application/vnd.apache.parquet", "Parquet"),
+    "feather": ("feather", "application/vnd.apache.arrow.file", "Feather"),
+}
+
+# Lignes écrites par bloc : la table n'est jamais convertie d'un seul tenant
+LIGNES_PAR_BLOC = int(os.environ.get("F1_LIGNES_PAR_BLOC", "50000"))
+
+# Compression des formats binaires (Parquet, Feather)
+COMPRESSION_ARROW = "zstd"
+
+# Au-delà (octets), un export en cours d'écriture passe de la mémoire à un fichier temporaire
+SEUIL_MEMOIRE_EXPORT = int(os.environ.get("F1_SEUIL_MEMOIRE_EXPORT_MO", "8")) * 1024 * 1024
+# Taille maximale (octets) d'un export conservé dans `MAGASIN_EXPORTS` ; les plus gros sont refaits à la demande
+TAILLE_MAX_EXPORT_EN_CACHE = int(os.environ.get("F1_TAILLE_MAX_EXPORT_EN_CACHE_MO", "16")) * 1024 * 1024
+
+
+def _blocs(df: pd.DataFrame, lignes: int):
+    for debut in range(0, max(len(df), 1), lignes):
+        yield df.iloc[debut:debut + lignes]
+
+
+def _csv(df: pd.DataFrame, sortie, lignes: int, compresser=None):
+    for i, bloc in enumerate(_blocs(df, lignes)):
+        contenu = bloc.to_csv(index=False, header=(i == 0)).encode("utf-8")
+        sortie.write(compresser(contenu) if compresser else contenu)
+
+
+def ecrire_export(df: pd.DataFrame, format: str, sortie, lignes: int = LIGNES_PAR_BLOC):
+    """
+    Écrit une table dans un format d'export, bloc par bloc.
+
+    Paramètres
+    ----------
+    df : pd.DataFrame
+        Table à exporter (index ignoré).
+    format : str
+        Clé de `FORMATS_EXPORT`.
+    sortie : str | Path | flux binaire
+        Fichier de destination ou flux ouvert en écriture (non fermé).
+    lignes : int, optionnel
+        Nombre de lignes converties à la fois.
+    """
+    if format not in FORMATS_EXPORT:
+        raise ValueError(f"Format d'export inconnu : {format!r}")
+    if isinstance(sortie, (str, Path)):
+        with open(sortie, "wb") as fichier:
+            return ecrire_export(df, format, fichier, lignes)
+
+    df = pd.DataFrame(df)
+    if format == "csv":
+        _csv(df, sortie, lignes)
+    elif format == "csv.gz":
+        # GzipFile ne ferme pas `sortie` ; mtime fixe : même table, mêmes octets
+        with gzip.GzipFile(fileobj=sortie, mode="wb", mtime=0) as gz:
+            _csv(df, gz, lignes)
+    elif format == "csv.zst":
+        # Une trame zstd par bloc : le flux concaténé reste un fichier .zst valide
+        _csv(df, sortie, lignes, compresser=lambda b: pa.compress(b, "zstd", asbytes=True))
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if format == "parquet":
+            with pq.ParquetWriter(sortie, table.schema, compression=COMPRESSION_ARROW) as ecrivain:
+                for lot in table.to_batches(lignes):
+                    ecrivain.write_batch(lot)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=COMPRESSION_ARROW)
+            with pa.ipc.new_file(sortie, table.schema, options=options) as ecrivain:
+                for lot in table.to_batches(lignes):
+                    ecrivain.write_batch(lot)
+
+
+class FluxExport(io.RawIOBase):
+    """
+    Export prêt à être lu, écrit bloc par bloc dans un fichier temporaire
+    (en mémoire jusqu'à `SEUIL_MEMOIRE_EXPORT`, sur disque au-delà).
+
+    Flux binaire en lecture seule, rembobiné, accepté tel quel par
+    `st.download_button` ; le fichier temporaire disparaît à la fermeture.
+    """
+
+    def __init__(self, fichier):
+        super().__init__()
+        self._fichier = fichier
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, position: int, depart: int = io.SEEK_SET) -> int:
+        return self._fichier.seek(position, depart)
+
+    def tell(self) -> int:
+        return self._fichier.tell()
+
+    def readinto(self, tampon) -> int:
+        donnees = self._fichier.read(len(tampon))
+        tampon[:len(donnees)] = donnees
+        return len(donnees)
+
+    def close(self):
+        self._fichier.close()
+        super().close()
+
+
+def export_table(df: pd.DataFrame, format: str = "csv") -> FluxExport:
+    """Export d'une table (voir `ecrire_export`), sans le matérialiser en un seul `bytes`."""
+    fichier = tempfile.SpooledTemporaryFile(max_size=SEUIL_MEMOIRE_EXPORT)
+    try:
+        ecrire_export(df, format, fichier)
+    except Exception:
+        fichier.close()
+        raise
+    fichier.seek(0)
+    return FluxExport(fichier)
+
+
+def nom_fichier(base: str, format: str) -> str:
+    """Nom de fichier avec l'extension du format (ex. 'laps_2025.parquet')."""
+    return f"{base}.{FORMATS_EXPORT[format][0]}"
+
+
+def export_session(data: dict, nom: str, format: str = "csv"):
+    """
+    Export d'une table d'une session chargée, produit à la première demande.
+
+    Un export d'au plus `TAILLE_MAX_EXPORT_EN_CACHE` octets est conservé dans
+    `MAGASIN_EXPORTS` par (session, table, format) : un second téléchargement,
+    ou un autre utilisateur, le relit. Un export plus gros n'est jamais gardé
+    en mémoire : il est servi depuis son fichier temporaire et refait à la
+    demande suivante.
+
+    Paramètres
+    ----------
+    data : dict
+        Données partagées renvoyées par `chargement_session`.
+    nom : str
+        Table à exporter ("tours", "meteo", "resultats"...).
+    format : str, optionnel
+        Clé de `FORMATS_EXPORT`.
+
+    Retour
+    ------
+    io.BytesIO | FluxExport
+        Flux binaire rembobiné, à passer à `st.download_button`.
+    """
+    if format not in FORMATS_EXPORT:
+        raise ValueError(f"Format d'export inconnu : {format!r}")
+    cle = (*cle_session(data["session"]), nom, format)
+    volumineux = {}
+
+    def _produire(_):
+        flux = export_table(data[nom], format)
+        if flux.seek(0, io.SEEK_END) > TAILLE_MAX_EXPORT_EN_CACHE:
+            # None : rien n'est conservé dans le magasin
+            volumineux["flux"] = flux
+            flux.seek(0)
+            return None
+        flux.seek(0)
+        with flux:
+            return flux.read()
+
+    contenu = MAGASIN_EXPORTS.obtenir_ou_charger(cle, _produire)
+    return io.BytesIO(contenu) if contenu is not None else volumineux["flux"]
@@ -0,0 +1,480 @@
+"""
+Figures Matplotlib des pages Performances et Cartographie.
+
+Séparées de `scr.data` : Matplotlib et `fastf1.plotting` (plus d'une demi-seconde
+d'import) ne sont chargés que par les pages qui dessinent.
+"""
+from __future__ import annotations
+
+import fastf1.plotting
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from fastf1.exceptions import DataNotLoadedError
+from matplotlib.collections import LineCollection
+
+from .circuit import geometrie_circuit
+from .pilotes import index_pilotes
+from .positions import matrice_positions
+from .telemetrie import ContexteTour, contexte_tour, mini_secteurs, telemetrie_tour
+
+
+def figure_indisponible(fig, ax, message: str):
+    """
+    Figure de repli : `message` centré à la place du tracé.
+
+    La figure est marquée `donnees_indisponibles` : `scr.rendu.image_figure`
+    la sert sans la mettre en cache, pour que les données soient redemandées
+    au prochain affichage (échec réseau passager, session encore incomplète).
+    """
+    ax.text(0.5, 0.5, message, ha='center', va='center')
+    ax.axis('off')
+    fig.donnees_indisponibles = True
+    return fig
+
+
+def figure_positions_par_tour(sess, pilotes=None):
+    """
+    Crée et renvoie une figure Matplotlib qui trace la position de chaque pilote
+    à la fin de chaque tour pour la session donnée.
+
+    Paramètres
+    ---------
+    sess : fastf1.core.Session
+        Session FastF1 déjà chargée (via `chargement_session`).
+    pilotes : list[str] | None
+        Liste optionnelle de codes pilotes (abréviations 3 lettres) ou numéros.
+        Si None, tous les pilotes présents dans la session sont tracés.
+
+    Retour
+    ------
+    matplotlib.figure.Figure
+        Figure prête à être affichée dans Streamlit avec `st.pyplot(fig)`.
+    """
+    # Palette de couleurs FastF1 (désactive le support timedelta car non nécessaire ici)
+    fastf1.plotting.setup_mpl(mpl_timedelta_support=False, color_scheme='fastf1')
+
+    # Positions pivotées une fois par session ; noms, couleurs et styles précalculés
+    index = index_pilotes(sess)
+    matrice = matrice_positions(sess)
+    positions = matrice["positions"] if matrice is not None else pd.DataFrame()
+    if pilotes is not None:
+        choisis = {index.resoudre(p) for p in pilotes}
+        positions = positions.reindex(columns=[c for c in positions.columns if c in choisis])
+
+    fig, ax = plt.subplots(figsize=(8.0, 4.9))
+    fig.patch.set_facecolor('black')
+    ax.set_facecolor('black')
+
+    # Toutes les courbes dans une seule LineCollection (un seul objet à dessiner)
+    tours = positions.index.to_numpy(dtype=float)
+    valeurs = positions.to_numpy(dtype=float)
+    segments, styles = [], []
+    for j, abb in enumerate(positions.columns):
+        valides = ~np.isnan(valeurs[:, j])
+        if valides.any():
+            segments.append(np.column_stack([tours[valides], valeurs[valides, j]]))
+            styles.append(index.style(abb))
+    if segments:
+        ax.add_collection(LineCollection(segments, colors=[s['color'] for s in styles],
+                                         linestyles=[s['linestyle'] for s in styles]))
+        ax.set_xlim(tours.min() - 3, tours.max() + 3)
+        handles = [mpl.lines.Line2D([0], [0], label=index.nom(abb), **index.style(abb))
+                   for abb in positions.columns if positions[abb].notna().any()]
+        ax.legend(handles=handles, bbox_to_anchor=(1.0, 1.02), loc="upper left", title="Pilotes")
+
+    # Axes et légendes
+    ax.set_ylim([20.5, 0.5])
+    ax.set_yticks([1, 5, 10, 15, 20])
+    ax.set_xlabel("Tour")
+    ax.set_ylabel("Position")
+    plt.tight_layout()
+
+    return fig
+
+
+def figure_carte_vitesse(sess,
+                         pilote,
+                         lap_number: int | None = None,
+                         cmap=mpl.cm.plasma,
+                         figsize=(12, 6.75),
+                         dpi=100,
+                         linewidth_track: float = 16,
+                         linewidth_speed: float = 5,
+                         show_colorbar: bool = True,
+                         contexte: ContexteTour | None = None):
+    """
+    Crée et renvoie une figure Matplotlib : visualisation de la vitesse sur la trajectoire.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 déjà chargée.
+    pilote : str | int
+        Identifiant pilote (abréviation 3 lettres, numéro ou BroadcastName).
+    lap_number : int | None
+        Numéro de tour à tracer. Si None, utilise le tour le plus rapide.
+    cmap : matplotlib colormap
+        Colormap utilisée (par défaut plasma).
+    figsize : tuple[float, float]
+        Taille de la figure en pouces.
+    dpi : int
+        Résolution de la figure.
+    linewidth_track : float
+        Épaisseur de la ligne de fond (piste).
+    linewidth_speed : float
+        Épaisseur de la ligne colorée par la vitesse.
+    show_colorbar : bool
+        Afficher la barre de couleurs.
+    contexte : ContexteTour | None
+        Contexte de tour déjà résolu (voir `scr.telemetrie.contexte_tour`) ;
+        construit (ou relu en cache) à partir de `pilote` et `lap_number` si None.
+
+    Retour
+    ------
+    matplotlib.figure.Figure
+    """
+    # Pilote, tour et télémétrie résolus une seule fois pour toutes les cartes
+    if contexte is None:
+        contexte = contexte_tour(sess, pilote, lap_number)
+    if contexte.lap is None:
+        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+        fig.patch.set_facecolor('white')
+        ax.set_facecolor('white')
+        return figure_indisponible(fig, ax, "Aucun tour pour ce pilote")
+
+    tel = contexte.telemetrie
+    if tel is None:
+        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+        fig.patch.set_facecolor('white')
+        ax.set_facecolor('white')
+        return figure_indisponible(fig, ax, "Télémetrie indisponible")
+
+    # Variables de tracé
+    x = tel['X']
+    y = tel['Y']
+    speed = tel['Speed']
+
+    # Segments colorés
+    points = np.array([x, y]).T.reshape(-1, 1, 2)
+    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+
+    fig, ax = plt.subplots(sharex=True, sharey=True, figsize=figsize, dpi=dpi)
+    fig.patch.set_facecolor('black')
+    ax.set_facecolor('black')
+
+    # Titre
+    try:
+        gp_name = sess.event.name
+        year = int(sess.event.year)
+    except Exception:
+        gp_name, year = sess.name, ''
+    fig.suptitle(f"{gp_name} {year} – {contexte.titre} – Vitesse", size=18, y=0.97)
+
+    # Marges et axes
+    plt.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.12)
+    ax.axis('off')
+
+    # Ligne de fond (piste)
+    ax.plot(x, y, color='black', linestyle='-', linewidth=linewidth_track, zorder=0)
+
+    # Ligne colorée par la vitesse
+    norm = plt.Normalize(speed.min(), speed.max())
+    lc = LineCollection(segments, cmap=cmap, norm=norm, linestyle='-', linewidth=linewidth_speed)
+    lc.set_array(speed)
+    ax.add_collection(lc)
+
+    # Barre de couleurs
+    if show_colorbar:
+        cbaxes = fig.add_axes([0.25, 0.05, 0.5, 0.05])
+        normlegend = mpl.colors.Normalize(vmin=float(speed.min()), vmax=float(speed.max()))
+        mpl.colorbar.ColorbarBase(cbaxes, norm=normlegend, cmap=cmap, orientation="horizontal")
+
+    plt.tight_layout()
+    return fig
+
+
+# --- Visualisation des rapports engagés (nGear) le long de la trajectoire ---
+def figure_carte_rapports(sess,
+                           pilote,
+                           lap_number: int | None = None,
+                           cmap=None,
+                           figsize=(12, 6.75),
+                           dpi=100,
+                           linewidth_track: float = 16,
+                           linewidth_gears: float = 4,
+                           show_colorbar: bool = True,
+                           contexte: ContexteTour | None = None):
+    """
+    Visualisation des rapports engagés (nGear) le long de la trajectoire.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 déjà chargée.
+    pilote : str | int
+        Identifiant pilote (abréviation 3 lettres, numéro ou BroadcastName).
+    lap_number : int | None
+        Numéro de tour à tracer. Si None, utilise le tour le plus rapide.
+    cmap : matplotlib colormap | None
+        Colormap utilisée. Par défaut 'Paired'.
+    figsize : tuple[float, float]
+        Taille de la figure en pouces.
+    dpi : int
+        Résolution de la figure.
+    linewidth_track : float
+        Épaisseur de la ligne de fond (piste).
+    linewidth_gears : float
+        Épaisseur de la ligne colorée par le rapport engagé.
+    show_colorbar : bool
+        Afficher la barre de couleurs.
+    contexte : ContexteTour | None
+        Contexte de tour déjà résolu (voir `scr.telemetrie.contexte_tour`) ;
+        construit (ou relu en cache) à partir de `pilote` et `lap_number` si None.
+
+    Retour
+    ------
+    matplotlib.figure.Figure
+    """
+    # Choix de la colormap
+    if cmap is None:
+        cmap = mpl.colormaps['Paired']
+
+    # Contexte partagé avec figure_carte_vitesse (même pilote, même tour)
+    if contexte is None:
+        contexte = contexte_tour(sess, pilote, lap_number)
+    if contexte.lap is None:
+        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+        fig.patch.set_facecolor('white')
+        ax.set_facecolor('white')
+        return figure_indisponible(fig, ax, "Aucun tour pour ce pilote")
+
+    tel = contexte.telemetrie
+    if tel is None:
+        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+        fig.patch.set_facecolor('white')
+        ax.set_facecolor('white')
+        return figure_indisponible(fig, ax, "Télémetrie indisponible")
+
+    x = np.array(tel['X'].values)
+    y = np.array(tel['Y'].values)
+
+    points = np.array([x, y]).T.reshape(-1, 1, 2)
+    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+
+    # nGear en float pour colormap et bornes 1..9 (boîtes 1..8 habituellement)
+    gear = tel['nGear'].to_numpy().astype(float)
+
+    # Figure
+    fig, ax = plt.subplots(sharex=True, sharey=True, figsize=figsize, dpi=dpi)
+    fig.patch.set_facecolor('black')
+    ax.set_facecolor('black')
+
+    # Titre
+    try:
+        gp_name = sess.event.name
+        year = int(sess.event.year)
+    except Exception:
+        gp_name, year = sess.name, ''
+    fig.suptitle(f"{gp_name} {year} – {contexte.titre} – Rapports", size=18, y=0.97)
+
+    # Fond de piste
+    ax.plot(x, y, color='black', linestyle='-', linewidth=linewidth_track, zorder=0)
+
+    # Collection de lignes colorées par rapport
+    lc = LineCollection(segments, norm=plt.Normalize(1, cmap.N + 1), cmap=cmap)
+    lc.set_array(gear)
+    lc.set_linewidth(linewidth_gears)
+    ax.add_collection(lc)
+
+    # Aspect & axes
+    ax.axis('equal')
+    ax.tick_params(labelleft=False, left=False, labelbottom=False, bottom=False)
+    ax.axis('off')
+
+    # Colorbar (ticks centrés sur chaque couleur)
+    if show_colorbar:
+        cbar = plt.colorbar(mappable=lc, ax=ax, label="Rapport", boundaries=np.arange(1, 10), fraction=0.046, pad=0.04)
+        cbar.set_ticks(np.arange(1.5, 9.5))
+        cbar.set_ticklabels(np.arange(1, 9))
+
+    plt.tight_layout()
+    return fig
+
+
+# --- Mini-secteurs : pilote (ou équipe) le plus rapide sur chaque portion du tour ---
+def figure_carte_mini_secteurs(sess,
+                               n_secteurs: int = 25,
+                               par: str = "pilote",
+                               figsize=(12, 6.75),
+                               dpi=100,
+                               linewidth: float = 5):
+    """
+    Colore la trajectoire selon le pilote (ou l'équipe) le plus rapide de chaque mini-secteur.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 déjà chargée avec la télémétrie.
+    n_secteurs : int
+        Nombre de mini-secteurs de même longueur.
+    par : str
+        'pilote' ou 'equipe' : qui est colorié sur chaque secteur.
+    figsize, dpi :
+        Taille et résolution de la figure.
+    linewidth : float
+        Épaisseur du tracé.
+
+    Retour
+    ------
+    matplotlib.figure.Figure
+    """
+    ms = mini_secteurs(sess, n_secteurs)
+    pos = None
+    if ms is not None:
+        try:
+            pos = telemetrie_tour(sess, ms["tours"][ms["reference"]], "position")
+        except (DataNotLoadedError, KeyError):
+            # Positions non chargées pour cette session
+            pos = None
+    if pos is None or pos.empty:
+        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+        fig.patch.set_facecolor('white')
+        ax.set_facecolor('white')
+        return figure_indisponible(fig, ax, "Télémetrie indisponible")
+
+    # Vainqueur de chaque secteur, puis sa couleur FastF1
+    noms = ms["equipes"] if par == "equipe" else ms["pilotes"]
+    vainqueurs = [noms[i] for i in ms["meilleurs"]]
+    index = index_pilotes(sess)
+    couleurs = {}
+    for k, nom in enumerate(dict.fromkeys(vainqueurs)):
+        couleurs[nom] = index.couleur_equipe(nom) if par == "equipe" else index.couleur(nom)
+        if couleurs[nom] == 'white':
+            # Couleur inconnue : palette qualitative
+            couleurs[nom] = mpl.colormaps['tab10'](k % 10)
+
+    # Secteur de chaque point du tracé, d'après la distance parcourue sur XY
+    xy = pos.loc[:, ('X', 'Y')].to_numpy(dtype=float)
+    parcouru = np.r_[0.0, np.cumsum(np.hypot(*np.diff(xy, axis=0).T))]
+    secteur = np.minimum((parcouru / parcouru[-1] * n_secteurs).astype(int), n_secteurs - 1)
+    points = xy.reshape(-1, 1, 2)
+    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    fig.patch.set_facecolor('black')
+    ax.set_facecolor('black')
+    lc = LineCollection(segments, colors=[couleurs[vainqueurs[k]] for k in secteur[:-1]],
+                        linewidth=linewidth, capstyle='round')
+    ax.add_collection(lc)
+    ax.axis('equal')
+    ax.axis('off')
+
+    try:
+        gp_name = sess.event.name
+        year = int(sess.event.year)
+    except Exception:
+        gp_name, year = sess.name, ''
+    fig.suptitle(f"{gp_name} {year} – Mini-secteurs ({n_secteurs})", size=18, y=0.97, color='white')
+    handles = [mpl.lines.Line2D([0], [0], color=c, linewidth=linewidth, label=nom) for nom, c in couleurs.items()]
+    ax.legend(handles=handles, loc='lower right', title="Plus rapide")
+
+    plt.tight_layout()
+    return fig
+
+
+# --- Carte du circuit avec numérotation des virages ---
+
+def figure_carte_virages(sess,
+                          pilote: str | int | None = None,
+                          lap_number: int | None = None,
+                          figsize=(12, 6.75),
+                          dpi=100,
+                          track_color='black',
+                          track_linewidth: float = 2.0,
+                          bubble_color='grey',
+                          bubble_size: float = 140.0,
+                          link_color='grey',
+                          offset_length: float = 500.0,
+                          show_title: bool = True,
+                          contexte: ContexteTour | None = None):
+    """
+    Trace la carte du circuit et annote la carte avec les numéros de virage.
+
+    Le tracé et les virages viennent de la géométrie du circuit (voir
+    `scr.circuit.geometrie_circuit`), partagée par toutes les sessions du même
+    lieu : les positions d'un tour ne sont lues que si elle n'est pas encore connue.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 déjà chargée.
+    pilote : str | int | None
+        Pilote dont le tour sert à calculer la géométrie si elle n'est pas en
+        cache (abréviation / numéro / BroadcastName). Si None, le tour le plus
+        rapide de la session (tous pilotes).
+    lap_number : int | None
+        Numéro de tour pour ce calcul. Si None, le tour le plus rapide du
+        pilote choisi (ou de la session si `pilote` est None).
+    figsize, dpi :
+        Taille et résolution de la figure.
+    track_color, track_linewidth :
+        Couleur/épaisseur de la ligne du tracé (piste).
+    bubble_color, bubble_size :
+        Couleur/taille des bulles contenant les numéros de virage.
+    link_color :
+        Couleur du trait joignant la piste à la bulle.
+    offset_length :
+        Longueur du vecteur de décalage latéral des étiquettes.
+    show_title : bool
+        Afficher le titre (localisation de l'événement).
+    contexte : ContexteTour | None
+        Contexte de tour déjà résolu (voir `scr.telemetrie.contexte_tour`),
+        utilisé pour le calcul de la géométrie ; construit (ou relu en cache)
+        à partir de `pilote` et `lap_number` si nécessaire.
+
+    Retour
+    ------
+    matplotlib.figure.Figure
+    """
+    if contexte is None and (pilote is not None or lap_number is not None):
+        contexte = contexte_tour(sess, pilote, lap_number)
+    geometrie = geometrie_circuit(sess, contexte=contexte)
+
+    # Créer la figure
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    fig.patch.set_facecolor('white')
+    ax.set_facecolor('white')
+
+    if geometrie is None:
+        return figure_indisponible(fig, ax, "Données de position indisponibles")
+
+    # Tracé piste (déjà simplifié et tourné)
+    ax.plot(geometrie.piste[:, 0], geometrie.piste[:, 1], color=track_color, linewidth=track_linewidth)
+
+    # Annoter les virages : bulles en un seul scatter, liens en une seule collection
+    virages = geometrie.virages
+    if not virages.empty:
+        piste_xy = virages[['X', 'Y']].to_numpy()
+        texte_xy = geometrie.etiquettes(offset_length)
+        ax.add_collection(LineCollection(np.stack([piste_xy, texte_xy], axis=1), colors=link_color))
+        ax.scatter(texte_xy[:, 0], texte_xy[:, 1], color=bubble_color, s=bubble_size, zorder=3)
+        for txt, (x, y) in zip(virages['Texte'], texte_xy):
+            ax.text(x, y, txt, va='center_baseline', ha='center', size='small', color='white', zorder=4)
+
+    # Finition
+    if show_title:
+        try:
+            title_txt = sess.event['Location'] if isinstance(sess.event, dict) else getattr(sess.event, 'Location', None)
+            if not title_txt:
+                title_txt = getattr(sess.event, 'name', '')
+            plt.title(title_txt)
+        except Exception:
+            pass
+    plt.xticks([])
+    plt.yticks([])
+    plt.axis('equal')
+    plt.tight_layout()
+    return fig
+
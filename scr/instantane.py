@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+import fastf1
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from fastf1.core import Laps, SessionResults, Telemetry
+
+_logger = logging.getLogger(__name__)
+
+# À incrémenter dès que le contenu des tables ou leur dérivation change :
+# les instantanés d'une autre version sont ignorés puis réécrits.
+# v2 : les résultats incomplets (points ou positions absents) ne sont plus figés.
+VERSION_INSTANTANE = 2
+
+# Délai après le départ d'une session avant de figer ses résultats (pénalités, réclamations)
+DELAI_RESULTATS_DEFINITIFS = pd.Timedelta(hours=24)
+
+# Colonne des résultats qui doit être renseignée pour figer une session, par type de session
+COLONNES_CLASSEMENT = {
+    "Race": ("Points", "Position"), "Sprint": ("Points", "Position"),
+    "Qualifying": ("Position",), "Sprint Qualifying": ("Position",), "Sprint Shootout": ("Position",),
+}
+
+NOM_MANIFESTE = "manifeste.json"
+
+# Attributs de la Session FastF1 sauvegardés pour chaque partie (cf. scr.data.PARTIES_SESSION)
+TABLES_PAR_PARTIE = {
+    "resultats": {"resultats": "_results"},
+    "tours": {"tours": "_laps", "statut_session": "_session_status", "etat_piste": "_track_status"},
+    "meteo": {"meteo": "_weather_data"},
+    "telemetrie": {"car_data": "_car_data", "pos_data": "_pos_data"},
+    "messages": {"messages": "_race_control_messages"},
+}
+
+# Valeurs scalaires de la Session nécessaires aux méthodes de FastF1 (Timedelta / Timestamp)
+SCALAIRES_PAR_PARTIE = {
+    "tours": ("_total_laps", "_session_start_time"),
+    "telemetrie": ("_t0_date",),
+}
+
+
+def dossier_instantane(sess) -> Path | None:
+    """
+    Dossier de l'instantané d'une session, à côté des pickles FastF1.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 (chargée ou non).
+
+    Retour
+    ------
+    Path | None
+        Par ex. cache/2025/2025-03-16_Australian_Grand_Prix/2025-03-16_Race/instantane,
+        ou None si le cache FastF1 n'est pas activé.
+    """
+    # FastF1 n'expose le dossier que via get_cache_info(), qui parcourt tout le cache
+    racine = getattr(fastf1.Cache, "_CACHE_DIR", None)
+    if not racine:
+        return None
+    return Path(racine) / sess.api_path.split("/static/")[-1] / "instantane"
+
+
+def lire_manifeste(dossier: Path | None) -> dict | None:
+    """Retourne le manifeste s'il existe et correspond aux versions courantes."""
+    if dossier is None:
+        return None
+    try:
+        manifeste = json.loads((dossier / NOM_MANIFESTE).read_text())
+    except (OSError, ValueError):
+        return None
+    if (manifeste.get("version") != VERSION_INSTANTANE
+            or manifeste.get("fastf1") != fastf1.__version__):
+        return None
+    return manifeste
+
+
+def _ecrire_atomique(chemin: Path, ecrire):
+    """Écrit via un fichier temporaire puis renomme, pour ne jamais exposer un fichier partiel."""
+    # Nom propre au processus et au thread : deux écrivains concurrents ne se mélangent pas
+    tmp = chemin.with_name(f".{chemin.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        ecrire(tmp)
+        os.replace(tmp, chemin)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def ecrire_table(df: pd.DataFrame, chemin: Path):
+    """Écrit un DataFrame (index compris) en Arrow IPC non compressé, de façon atomique."""
+    # Non compressé : relu ensuite par memory-map, sans décodage
+    table = pa.Table.from_pandas(pd.DataFrame(df), preserve_index=True)
+    _ecrire_atomique(chemin, lambda tmp: feather.write_feather(table, tmp, compression="uncompressed"))
+
+
+def lire_table(chemin: Path) -> pd.DataFrame:
+    """
+    Relit une table écrite par `ecrire_table`.
+
+    Le fichier est ouvert par memory-map (pas de décodage ni de lecture
+    intermédiaire), mais la conversion en DataFrame copie les colonnes en mémoire.
+    """
+    return feather.read_table(chemin, memory_map=True).to_pandas()
+
+
+def _vers_table(valeur) -> pd.DataFrame:
+    """Aplatit un dict {numéro pilote: Telemetry} en une seule table."""
+    if isinstance(valeur, dict):
+        if not valeur:
+            return pd.DataFrame({"DriverNumber": pd.Series(dtype=str)})
+        return pd.concat(
+            [pd.DataFrame(tel).assign(DriverNumber=drv) for drv, tel in valeur.items()],
+            ignore_index=True,
+        )
+    return pd.DataFrame(valeur)
+
+
+def _scalaire_json(v):
+    if v is None or (not isinstance(v, str) and pd.isna(v)):
+        return None
+    if isinstance(v, (datetime.timedelta, np.timedelta64)):
+        return {"timedelta": pd.Timedelta(v).value}
+    if isinstance(v, (datetime.datetime, np.datetime64)):
+        return {"timestamp": pd.Timestamp(v).value}
+    if isinstance(v, np.generic):
+        return v.item()
+    return v
+
+
+def _scalaire_python(v):
+    if isinstance(v, dict) and "timedelta" in v:
+        return pd.Timedelta(v["timedelta"])
+    if isinstance(v, dict) and "timestamp" in v:
+        return pd.Timestamp(v["timestamp"])
+    return v
+
+
+def resultats_definitifs(sess) -> bool:
+    """
+    Indique si les résultats d'une session peuvent être figés sur disque.
+
+    Faux tant que la session est trop récente (`DELAI_RESULTATS_DEFINITIFS`)
+    ou que ses points / positions manquent (source Ergast en échec, course à
+    peine terminée) : ils seront rechargés plus tard au lieu d'être servis
+    incomplets indéfiniment.
+    """
+    date = getattr(sess, "date", None)
+    if date is not None and not pd.isna(date):
+        date = pd.Timestamp(date)
+        if date.tzinfo is not None:
+            date = date.tz_convert("UTC").tz_localize(None)
+        if pd.Timestamp.now("UTC").tz_localize(None) < date + DELAI_RESULTATS_DEFINITIFS:
+            return False
+    resultats = getattr(sess, "_results", None)
+    if resultats is None:
+        return False
+    for colonne in COLONNES_CLASSEMENT.get(getattr(sess, "name", None), ()):
+        if colonne not in resultats.columns or resultats[colonne].isna().all():
+            return False
+    return True
+
+
+def _partie_complete(sess, partie: str, tables: dict) -> bool:
+    """Une partie absente, vide ou incomplète (échec réseau côté FastF1...) n'est pas figée sur disque."""
+    if any(v is None or len(v) == 0 for v in tables.values()):
+        return False
+    if partie == "resultats":
+        return resultats_definitifs(sess)
+    if partie == "telemetrie":
+        # Un pilote sans données voiture ou position : téléchargement partiel
+        pilotes = set(tables["car_data"]) | set(tables["pos_data"])
+        return all(pilote in tables[nom] and len(tables[nom][pilote]) > 0
+                   for nom in ("car_data", "pos_data") for pilote in pilotes)
+    return True
+
+
+def enregistrer(sess, parties) -> bool:
+    """
+    Écrit (ou complète) l'instantané columnaire des parties chargées d'une session.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 dont les `parties` sont chargées.
+    parties : iterable[str]
+        Parties à écrire (clés de `TABLES_PAR_PARTIE`).
+
+    Retour
+    ------
+    bool
+        True si au moins une partie a été écrite, False sinon (cache désactivé,
+        données vides ou incomplètes, résultats pas encore définitifs, type de
+        colonne non supporté par Arrow...). Un échec n'est jamais bloquant.
+    """
+    dossier = dossier_instantane(sess)
+    if dossier is None:
+        return False
+    try:
+        dossier.mkdir(parents=True, exist_ok=True)
+        manifeste = lire_manifeste(dossier) or dict(
+            version=VERSION_INSTANTANE, fastf1=fastf1.__version__, parties=[], scalaires={},
+        )
+        ecrites = []
+        for partie in parties:
+            tables = {nom: getattr(sess, attribut, None) for nom, attribut in TABLES_PAR_PARTIE[partie].items()}
+            if not _partie_complete(sess, partie, tables):
+                continue
+            for nom, valeur in tables.items():
+                ecrire_table(_vers_table(valeur), dossier / f"{nom}.arrow")
+            for attribut in SCALAIRES_PAR_PARTIE.get(partie, ()):
+                manifeste["scalaires"][attribut] = _scalaire_json(getattr(sess, attribut, None))
+            ecrites.append(partie)
+        if not ecrites:
+            return False
+        if "resultats" in ecrites:
+            manifeste["session_info"] = sess.session_info
+        manifeste["parties"] = sorted(set(manifeste["parties"]) | set(ecrites))
+        contenu = json.dumps(manifeste, default=str)
+        # Le manifeste est écrit en dernier : il ne référence que des tables complètes
+        _ecrire_atomique(dossier / NOM_MANIFESTE, lambda tmp: tmp.write_text(contenu))
+        return True
+    except Exception as e:
+        _logger.warning("Instantané non écrit pour %s : %s", sess.api_path, e)
+        return False
+
+
+def restaurer(sess, parties) -> tuple[str, ...]:
+    """
+    Réhydrate une Session FastF1 non chargée à partir de son instantané.
+
+    Les tables sont relues (voir `lire_table`) et rattachées à la session : ses
+    propriétés (laps, results, car_data...) et méthodes se comportent ensuite
+    comme après un `Session.load()`, sans analyse des données FastF1.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 non chargée, ou chargée partiellement.
+    parties : iterable[str]
+        Parties souhaitées.
+
+    Retour
+    ------
+    tuple[str, ...]
+        Parties effectivement restaurées (vide si pas d'instantané valide).
+    """
+    dossier = dossier_instantane(sess)
+    manifeste = lire_manifeste(dossier)
+    if manifeste is None:
+        return ()
+    disponibles = [p for p in parties if p in manifeste["parties"]]
+    # Sans résultats, FastF1 rechargera la liste des pilotes : inutile de restaurer le reste
+    if "resultats" not in disponibles and not hasattr(sess, "_results"):
+        return ()
+    try:
+        for partie in disponibles:
+            for nom, attribut in TABLES_PAR_PARTIE[partie].items():
+                df = lire_table(dossier / f"{nom}.arrow")
+                if attribut == "_results":
+                    valeur = SessionResults(df, _force_default_cols=True)
+                elif attribut == "_laps":
+                    valeur = Laps(df, session=sess)
+                elif attribut in ("_car_data", "_pos_data"):
+                    valeur = {
+                        drv: Telemetry(tel.drop(columns="DriverNumber").reset_index(drop=True),
+                                       session=sess, driver=drv)
+                        for drv, tel in df.groupby("DriverNumber", sort=False)
+                    }
+                else:
+                    valeur = df
+                setattr(sess, attribut, valeur)
+            for attribut in SCALAIRES_PAR_PARTIE.get(partie, ()):
+                setattr(sess, attribut, _scalaire_python(manifeste["scalaires"].get(attribut)))
+        if "session_info" in manifeste and not hasattr(sess, "_session_info"):
+            sess._session_info = manifeste["session_info"]
+    except Exception as e:
+        _logger.warning("Instantané illisible pour %s : %s", sess.api_path, e)
+        for partie in disponibles:
+            for attribut in (*TABLES_PAR_PARTIE[partie].values(), *SCALAIRES_PAR_PARTIE.get(partie, ())):
+                if attribut in vars(sess):
+                    delattr(sess, attribut)
+        return ()
+    return tuple(disponibles)
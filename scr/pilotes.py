@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from .cache import MAGASIN_TELEMETRIE, cle_session
+from .derives import empreinte
+
+# Colonnes des résultats reconnues comme identifiants d'un pilote
+COLONNES_IDENTIFIANTS = ("Abbreviation", "DriverNumber", "BroadcastName", "FullName")
+
+
+class IndexPilotes:
+    """
+    Index des pilotes d'une session : tout identifiant (abréviation, numéro,
+    BroadcastName, nom complet) est résolu en abréviation par un seul accès
+    dictionnaire. Équipe, couleur et style de tracé y sont précalculés.
+
+    À obtenir via `index_pilotes` (un index par session, mis en cache).
+
+    Attributs
+    ---------
+    pilotes : pd.DataFrame
+        Une ligne par abréviation : DriverNumber, BroadcastName, FullName,
+        TeamName, Couleur, CouleurEquipe, Trait.
+    """
+
+    def __init__(self, pilotes: pd.DataFrame):
+        self.pilotes = pilotes
+        self._alias = {}
+        for abb, ligne in pilotes.iterrows():
+            for valeur in (abb, *(ligne[c] for c in COLONNES_IDENTIFIANTS[1:])):
+                if valeur is not None and not pd.isna(valeur) and str(valeur):
+                    self._alias.setdefault(str(valeur), abb)
+                    self._alias.setdefault(str(valeur).upper(), abb)
+        self._couleurs_equipes = dict(zip(pilotes['TeamName'], pilotes['CouleurEquipe']))
+
+    @classmethod
+    def depuis_session(cls, sess) -> IndexPilotes:
+        """Construit l'index depuis les résultats (et les tours) d'une session chargée."""
+        # fastf1.plotting importe Matplotlib : différé jusqu'au premier index construit
+        import fastf1.plotting
+
+        colonnes = ['DriverNumber', 'BroadcastName', 'FullName', 'TeamName', 'TeamColor']
+        try:
+            res = pd.DataFrame(sess.results)
+        except Exception:
+            res = pd.DataFrame()
+        if 'Abbreviation' in res:
+            pilotes = (res.dropna(subset=['Abbreviation']).drop_duplicates('Abbreviation')
+                          .set_index('Abbreviation').reindex(columns=colonnes))
+        else:
+            pilotes = pd.DataFrame(columns=colonnes).rename_axis('Abbreviation')
+        # Pilotes présents dans les tours mais absents des résultats
+        try:
+            tours = sess.laps.drop_duplicates('Driver').set_index('Driver')
+            manquants = tours.index.difference(pilotes.index)
+            if len(manquants):
+                ajout = pd.DataFrame({'DriverNumber': tours.loc[manquants, 'DriverNumber'],
+                                      'TeamName': tours.loc[manquants, 'Team']}).reindex(columns=colonnes)
+                pilotes = pd.concat([pilotes, ajout])
+        except Exception:
+            pass
+        pilotes['DriverNumber'] = [None if pd.isna(n) else str(n) for n in pilotes['DriverNumber']]
+        pilotes['BroadcastName'] = pilotes['BroadcastName'].fillna(pd.Series(pilotes.index, index=pilotes.index))
+
+        # Styles FastF1, calculés ici une fois au lieu d'un appel par pilote et par rendu
+        couleurs, couleurs_equipe, traits, vus = [], [], [], set()
+        for abb, ligne in pilotes.iterrows():
+            couleur_resultats = f"#{ligne['TeamColor']}" if isinstance(ligne['TeamColor'], str) and ligne['TeamColor'] else 'white'
+            try:
+                style = fastf1.plotting.get_driver_style(identifier=abb, style=['color', 'linestyle'], session=sess)
+                couleur, trait = style['color'], style['linestyle']
+            except Exception:
+                # Sans infos FastF1 (hors ligne) : couleur d'équipe, pointillés pour le 2e pilote
+                couleur = couleur_resultats
+                trait = 'dashed' if ligne['TeamName'] in vus else 'solid'
+            try:
+                couleur_equipe = fastf1.plotting.get_team_color(ligne['TeamName'], session=sess)
+            except Exception:
+                couleur_equipe = couleur_resultats
+            vus.add(ligne['TeamName'])
+            couleurs.append(couleur)
+            couleurs_equipe.append(couleur_equipe)
+            traits.append(trait)
+        pilotes['Couleur'] = couleurs
+        pilotes['CouleurEquipe'] = couleurs_equipe
+        pilotes['Trait'] = traits
+        return cls(pilotes.drop(columns='TeamColor'))
+
+    def resoudre(self, identifiant):
+        """Abréviation du pilote, ou l'identifiant tel quel s'il est inconnu."""
+        if identifiant is None:
+            return None
+        cle = str(identifiant)
+        return self._alias.get(cle, self._alias.get(cle.upper(), identifiant))
+
+    def __contains__(self, identifiant) -> bool:
+        return self.resoudre(identifiant) in self.pilotes.index
+
+    def _valeur(self, identifiant, colonne, defaut=None):
+        abb = self.resoudre(identifiant)
+        if abb in self.pilotes.index:
+            valeur = self.pilotes.at[abb, colonne]
+            return defaut if valeur is None or (not isinstance(valeur, str) and pd.isna(valeur)) else valeur
+        return defaut
+
+    def nom(self, identifiant) -> str:
+        """BroadcastName (ou l'identifiant s'il est inconnu)."""
+        return self._valeur(identifiant, 'BroadcastName', str(identifiant))
+
+    def numero(self, identifiant) -> str | None:
+        return self._valeur(identifiant, 'DriverNumber')
+
+    def equipe(self, identifiant) -> str | None:
+        return self._valeur(identifiant, 'TeamName')
+
+    def couleur(self, identifiant) -> str:
+        return self._valeur(identifiant, 'Couleur', 'white')
+
+    def couleur_equipe(self, equipe: str) -> str:
+        """Couleur d'une équipe (par son TeamName)."""
+        return self._couleurs_equipes.get(equipe, 'white')
+
+    def style(self, identifiant) -> dict:
+        """Arguments `color` et `linestyle` prêts pour `ax.plot`."""
+        return dict(color=self.couleur(identifiant), linestyle=self._valeur(identifiant, 'Trait', 'solid'))
+
+
+def index_pilotes(sess) -> IndexPilotes:
+    """
+    Index des pilotes d'une session, construit une seule fois (au chargement
+    par `chargement_session`) puis partagé.
+
+    La clé comprend l'empreinte des résultats : une session rechargée avec
+    d'autres résultats (plus complets, définitifs) obtient un nouvel index.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 chargée (résultats au minimum).
+
+    Retour
+    ------
+    IndexPilotes
+    """
+    cle = (*cle_session(sess), "index_pilotes", empreinte(vars(sess).get("_results")))
+    return MAGASIN_TELEMETRIE.obtenir_ou_charger(cle, lambda _: IndexPilotes.depuis_session(sess))
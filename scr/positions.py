@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .cache import MAGASIN_TELEMETRIE, cle_session
+from .derives import empreinte
+from .pilotes import index_pilotes
+
+
+def _pivoter(tours: pd.DataFrame, valeurs: str) -> pd.DataFrame:
+    """Table tour × pilote d'une colonne des tours (une ligne par tour, une colonne par pilote)."""
+    table = tours.pivot_table(index='LapNumber', columns='Driver', values=valeurs, aggfunc='first', dropna=False)
+    return table.rename_axis(index='LapNumber', columns='Driver')
+
+
+def _calculer_matrice(sess) -> dict | None:
+    laps = sess.laps
+    if laps is None or laps.empty:
+        return None
+    tours = pd.DataFrame({
+        'LapNumber': laps['LapNumber'].astype(int),
+        'Driver': laps['Driver'].astype(str),
+        'Position': laps['Position'].astype(float),
+        'Temps': laps['Time'].dt.total_seconds(),
+    })
+    tours = tours.dropna(subset=['LapNumber', 'Driver'])
+
+    # Pilotes dans l'ordre du classement (index des pilotes), puis les autres
+    index = index_pilotes(sess)
+    presents = set(tours['Driver'])
+    ordre = [abb for abb in index.pilotes.index if abb in presents]
+    ordre += sorted(presents.difference(ordre))
+
+    positions = _pivoter(tours, 'Position').reindex(columns=ordre)
+    temps = _pivoter(tours, 'Temps').reindex(index=positions.index, columns=ordre)
+    # Écart au premier à avoir bouclé chaque tour (à nombre de tours égal)
+    ecarts = temps.sub(temps.min(axis=1), axis=0)
+
+    grille = pd.Series(np.nan, index=pd.Index(ordre, name='Driver'), name='Grille')
+    try:
+        res = sess.results.set_index('Abbreviation')['GridPosition'].astype(float)
+        # 0 : départ des stands, sans place sur la grille
+        grille = res.where(res > 0).reindex(grille.index).rename('Grille')
+    except Exception:
+        pass
+
+    return dict(
+        tours=positions.index.to_numpy(),
+        pilotes=ordre,
+        positions=positions.astype(np.float32),
+        temps=temps,
+        ecarts=ecarts,
+        grille=grille,
+    )
+
+
+def matrice_positions(sess) -> dict | None:
+    """
+    Positions de tous les pilotes à la fin de chaque tour, en une seule table.
+
+    Calculée une fois par session (à partir des tours chargés) puis partagée
+    par la figure des positions et les statistiques (`bilan_positions`).
+    La clé comprend l'empreinte des tours et des résultats : une session
+    rechargée (tours complétés, classement corrigé) obtient une nouvelle matrice.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 chargée avec les tours.
+
+    Retour
+    ------
+    dict | None
+        tours (numéros), pilotes (abréviations, ordre du classement),
+        positions, temps (temps de session en fin de tour, s) et ecarts (au
+        premier du tour, s) : DataFrames tour × pilote, NaN après un abandon ;
+        grille (Series, NaN pour un départ des stands). None sans tours.
+    """
+    tables = vars(sess)
+    cle = (*cle_session(sess), "positions", empreinte(tables.get("_laps")), empreinte(tables.get("_results")))
+    return MAGASIN_TELEMETRIE.obtenir_ou_charger(cle, lambda _: _calculer_matrice(sess))
+
+
+def bilan_positions(matrice: dict) -> pd.DataFrame:
+    """
+    Statistiques de course par pilote, tirées de la matrice des positions.
+
+    Paramètres
+    ----------
+    matrice : dict
+        Résultat de `matrice_positions`.
+
+    Retour
+    ------
+    pd.DataFrame
+        Une ligne par pilote : Depart, Arrivee (dernier tour bouclé),
+        Gagnees (Depart - Arrivee), Meilleure, Pire, ToursEnTete et EcartFinal
+        (s, au premier à nombre de tours égal).
+    """
+    positions = matrice["positions"]
+    arrivee = positions.ffill().iloc[-1]
+    ecart_final = matrice["ecarts"].ffill().iloc[-1]
+    bilan = pd.DataFrame({
+        'Depart': matrice["grille"],
+        'Arrivee': arrivee,
+        'Meilleure': positions.min(),
+        'Pire': positions.max(),
+        'ToursEnTete': (positions == 1).sum(),
+        'EcartFinal': ecart_final,
+    })
+    bilan.insert(2, 'Gagnees', bilan['Depart'] - bilan['Arrivee'])
+    return bilan.rename_axis('Driver')
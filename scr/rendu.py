@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import io
+
+from .cache import MAGASIN_FIGURES, cle_session
+
+FORMATS_IMAGE = ("png", "svg")
+
+# Même résolution et recadrage que `st.pyplot`
+DPI_RENDU = 200
+
+
+def _cle_parametre(valeur):
+    """Forme hashable et stable d'un paramètre de style (colormap, liste...)."""
+    if hasattr(valeur, "name") and hasattr(valeur, "N"):  # colormap matplotlib
+        return ("cmap", valeur.name)
+    if isinstance(valeur, (list, tuple)):
+        return tuple(_cle_parametre(v) for v in valeur)
+    return valeur
+
+
+def image_figure(construire, sess, *, format: str = "png", dpi: int = DPI_RENDU, **parametres) -> bytes:
+    """
+    Image d'une figure Matplotlib, rendue une seule fois puis servie depuis le cache.
+
+    La clé est (année, événement, session, fonction, format, dpi, paramètres) :
+    pilote, tour et options de style font partie des paramètres. La figure est
+    fermée dès qu'elle est rastérisée, pour ne pas s'accumuler dans pyplot.
+    Une figure marquée `donnees_indisponibles` (message de repli) n'est pas
+    mise en cache.
+
+    Paramètres
+    ----------
+    construire : callable
+        Fonction `construire(sess, **parametres)` renvoyant une Figure
+        (par ex. `figure_carte_vitesse`).
+    sess : fastf1.core.Session
+        Session FastF1 chargée.
+    format : str, optionnel
+        'png' (par défaut) ou 'svg'.
+    dpi : int, optionnel
+        Résolution du rendu.
+    **parametres :
+        Arguments transmis à `construire` (pilote, lap_number, cmap...).
+
+    Retour
+    ------
+    bytes
+        Contenu de l'image, à passer à `st.image`.
+    """
+    if format not in FORMATS_IMAGE:
+        raise ValueError(f"Format d'image inconnu : {format!r}")
+    cle = (
+        *cle_session(sess),
+        construire.__name__,
+        format,
+        dpi,
+        tuple(sorted((nom, _cle_parametre(v)) for nom, v in parametres.items())),
+    )
+
+    repli = {}
+
+    def _rendre(_):
+        # Matplotlib n'est importé qu'au premier rendu (démarrage des pages plus rapide)
+        import matplotlib.pyplot as plt
+
+        fig = construire(sess, **parametres)
+        try:
+            tampon = io.BytesIO()
+            fig.savefig(tampon, format=format, dpi=dpi, bbox_inches="tight")
+            if getattr(fig, "donnees_indisponibles", False):
+                # Figure de repli (`scr.graphiques.figure_indisponible`) : servie mais
+                # jamais conservée (None), les données seront redemandées au prochain appel
+                repli["image"] = tampon.getvalue()
+                return None
+            return tampon.getvalue()
+        finally:
+            plt.close(fig)
+
+    image = MAGASIN_FIGURES.obtenir_ou_charger(cle, _rendre)
+    return image if image is not None else repli["image"]
@@ -0,0 +1,477 @@
+from __future__ import annotations
+
+import weakref
+
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps
+from fastf1.exceptions import DataNotLoadedError
+
+from .cache import MAGASIN_TELEMETRIE, cle_session
+from .compaction import compacter
+from .pilotes import index_pilotes
+
+# Genres de télémétrie mis en cache pour un tour :
+#   voiture  : car_data découpé sur le tour + Distance (courbes vitesse / distance)
+#   position : pos_data découpé sur le tour (tracé du circuit)
+#   complete : fusion car + pos de `Lap.get_telemetry()` (cartes colorées)
+GENRES_TELEMETRIE = ("voiture", "position", "complete")
+
+
+def cle_tour(sess, lap, genre: str) -> tuple:
+    """
+    Clé du cache de télémétrie : (année, événement, session, pilote, tour, genre).
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 du tour.
+    lap : fastf1.core.Lap
+        Tour concerné (DriverNumber et LapNumber sont lus).
+    genre : str
+        Un des `GENRES_TELEMETRIE`.
+    """
+    numero = lap['LapNumber']
+    return (
+        *cle_session(sess),
+        str(lap['DriverNumber']),
+        int(numero) if pd.notna(numero) else None,
+        genre,
+    )
+
+
+def _bornes(temps: np.ndarray, debut, fin) -> tuple[int, int]:
+    """Indices [i0, i1[ des échantillons avec debut <= SessionTime <= fin (temps trié)."""
+    i0 = int(np.searchsorted(temps, debut, side='left'))
+    i1 = int(np.searchsorted(temps, fin, side='right'))
+    return i0, i1
+
+
+def _tranche_voiture(car, debut: pd.Timedelta, fin: pd.Timedelta):
+    """
+    Équivalent de `lap.get_car_data().add_distance()`.
+
+    FastF1 copie toute la télémétrie du pilote puis applique un masque booléen ;
+    ici la colonne SessionTime (triée) est bornée par recherche dichotomique et
+    seule la tranche du tour est copiée.
+    """
+    i0, i1 = _bornes(car['SessionTime'].to_numpy(), debut.to_timedelta64(), fin.to_timedelta64())
+    if i0 >= i1:
+        return None
+    tel = car.iloc[i0:i1].copy().reset_index(drop=True)
+    if 'Time' in tel.columns:
+        tel['Time'] = tel['SessionTime'] - debut
+    return compacter(tel.add_distance())
+
+
+def sans_session(lap) -> pd.Series:
+    """
+    Copie d'une ligne de tour sans la référence à sa Session FastF1.
+
+    À utiliser pour tout tour conservé dans un cache : un `Lap` garderait sa
+    session en vie après son éviction de `MAGASIN_SESSIONS`.
+    """
+    return pd.Series(lap.to_numpy(), index=lap.index, name=lap.name)
+
+
+def _tour_fastf1(sess, lap):
+    """`Lap` rattaché à `sess` pour une ligne de tour (méthodes get_pos_data, get_telemetry)."""
+    if getattr(lap, "session", None) is sess:
+        return lap
+    return sess.laps.loc[lap.name]
+
+
+def _extraire(sess, lap, genre: str):
+    if genre == "voiture":
+        car = sess.car_data.get(lap['DriverNumber'])
+        if car is None or pd.isna(lap['LapStartTime']) or pd.isna(lap['Time']):
+            return None
+        return _tranche_voiture(car, lap['LapStartTime'], lap['Time'])
+    if genre == "position":
+        return compacter(_tour_fastf1(sess, lap).get_pos_data())
+    return compacter(_tour_fastf1(sess, lap).get_telemetry())
+
+
+def telemetrie_tour(sess, lap, genre: str = "voiture"):
+    """
+    Télémétrie d'un tour, partagée par toutes les pages via un cache LRU borné.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 chargée avec la télémétrie.
+    lap : fastf1.core.Lap | pd.Series
+        Tour à extraire (un `Lap`, ou une ligne de `sess.laps` comme celles de `sans_session`).
+    genre : str, optionnel
+        'voiture' (par défaut), 'position' ou 'complete' (voir `GENRES_TELEMETRIE`).
+
+    Retour
+    ------
+    fastf1.core.Telemetry | None
+        Objet partagé, à copier avant toute modification. None si le tour n'a
+        pas de télémétrie exploitable.
+    """
+    if genre not in GENRES_TELEMETRIE:
+        raise ValueError(f"Genre de télémétrie inconnu : {genre!r}")
+    return MAGASIN_TELEMETRIE.obtenir_ou_charger(cle_tour(sess, lap, genre),
+                                                 lambda _: _extraire(sess, lap, genre))
+
+
+def tours_rapides(tours: Laps) -> Laps:
+    """
+    Tour le plus rapide de chaque pilote, en un seul groupby.
+
+    Même règle que `Laps.pick_fastest()` : seuls les meilleurs tours personnels
+    (IsPersonalBest) sont retenus, le premier en cas d'égalité.
+
+    Retour
+    ------
+    fastf1.core.Laps
+        Un tour par pilote (les pilotes sans tour chronométré sont absents).
+    """
+    candidats = tours.loc[(tours['IsPersonalBest'] == True) & tours['LapTime'].notna()]  # noqa: E712
+    if candidats.empty:
+        return candidats
+    return tours.loc[candidats.groupby('DriverNumber', sort=False)['LapTime'].idxmin().to_numpy()]
+
+
+def telemetrie_tours_rapides(sess, pilotes=None) -> dict:
+    """
+    Télémétrie voiture (avec Distance) du tour le plus rapide de chaque pilote.
+
+    Les tours rapides sont sélectionnés en une passe sur les tours, puis chaque
+    car_data de pilote est découpé par bornes dichotomiques ; les tranches
+    alimentent le même cache que `telemetrie_tour`.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 chargée avec la télémétrie.
+    pilotes : list | None, optionnel
+        Identifiants acceptés par `Laps.pick_drivers` (tous les pilotes si None).
+
+    Retour
+    ------
+    dict
+        DriverNumber → (Lap, Telemetry), dans l'ordre des tours de la session.
+        Les pilotes sans tour rapide ou sans télémétrie sont absents.
+    """
+    tours = sess.laps if pilotes is None else sess.laps.pick_drivers(pilotes)
+    rapides = tours_rapides(tours)
+    try:
+        car_data = sess.car_data
+    except DataNotLoadedError:
+        # Télémétrie non chargée (ou absente du cache) : aucun pilote
+        return {}
+    colonnes = rapides[['DriverNumber', 'LapStartTime', 'Time']].to_numpy()
+
+    resultat = {}
+    for i, (numero, debut, fin) in enumerate(colonnes):
+        car = car_data.get(numero)
+        if car is None or pd.isna(debut) or pd.isna(fin):
+            continue
+        lap = rapides.iloc[i]
+        tel = MAGASIN_TELEMETRIE.obtenir_ou_charger(
+            cle_tour(sess, lap, "voiture"),
+            lambda _: _tranche_voiture(car, pd.Timedelta(debut), pd.Timedelta(fin)),
+        )
+        if tel is not None:
+            resultat[numero] = (lap, tel)
+    return resultat
+
+
+# --- Comparaison de tours alignés sur la distance ---
+
+CANAUX_COMPARAISON = ("Speed", "Throttle", "Brake", "nGear", "RPM")
+# Canaux discrets : on reprend l'échantillon précédent au lieu d'interpoler
+_CANAUX_DISCRETS = ("Brake", "nGear")
+
+# Pas de la grille de distance commune (en mètres)
+PAS_DISTANCE = 5.0
+
+
+def _lecture_seule(tableau: np.ndarray) -> np.ndarray:
+    tableau.flags.writeable = False
+    return tableau
+
+
+def reechantillonner(tel, grille: np.ndarray) -> dict:
+    """
+    Rééchantillonne la télémétrie d'un tour sur une grille de distance.
+
+    Paramètres
+    ----------
+    tel : fastf1.core.Telemetry
+        Télémétrie voiture avec Distance et Time (voir `telemetrie_tour`).
+    grille : np.ndarray
+        Distances (m) croissantes.
+
+    Retour
+    ------
+    dict
+        'Temps' (s depuis le début du tour) et un tableau par canal de
+        `CANAUX_COMPARAISON` présent, chacun de la taille de la grille.
+    """
+    # La distance intégrée est croissante ; on neutralise d'éventuels replis numériques
+    distance = np.maximum.accumulate(tel['Distance'].to_numpy(dtype=float))
+    resultat = {'Temps': np.interp(grille, distance, tel['Time'].dt.total_seconds().to_numpy())}
+    precedents = np.clip(np.searchsorted(distance, grille, side='right') - 1, 0, len(distance) - 1)
+    for canal in CANAUX_COMPARAISON:
+        if canal not in tel.columns:
+            continue
+        valeurs = tel[canal].to_numpy(dtype=float)
+        resultat[canal] = valeurs[precedents] if canal in _CANAUX_DISCRETS else np.interp(grille, distance, valeurs)
+    return resultat
+
+
+def _comparer_paire(sess, ref_lap, lap, pas: float):
+    """Tour `lap` rééchantillonné sur la grille du tour de référence, avec son écart cumulé."""
+    ref = telemetrie_tour(sess, ref_lap, "voiture")
+    tel = telemetrie_tour(sess, lap, "voiture")
+    if ref is None or tel is None or ref.empty or tel.empty:
+        return None
+    grille = np.arange(0.0, float(ref['Distance'].max()), pas)
+    temps_ref = np.interp(grille, np.maximum.accumulate(ref['Distance'].to_numpy(dtype=float)),
+                          ref['Time'].dt.total_seconds().to_numpy())
+    paire = reechantillonner(tel, grille)
+    paire['Distance'] = grille
+    paire['Delta'] = paire['Temps'] - temps_ref
+    return {canal: _lecture_seule(valeurs) for canal, valeurs in paire.items()}
+
+
+def comparer_tours(sess, laps: list, reference: int = 0, pas: float = PAS_DISTANCE) -> dict | None:
+    """
+    Aligne plusieurs tours sur la grille de distance du tour de référence.
+
+    Chaque couple (référence, tour) est calculé une seule fois puis conservé
+    dans le cache de télémétrie : ajouter un pilote à la comparaison ne
+    recalcule que son propre tour.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 chargée avec la télémétrie.
+    laps : list[fastf1.core.Lap]
+        Tours à comparer (par ex. les tours rapides de 5 à 10 pilotes).
+    reference : int, optionnel
+        Position du tour de référence dans `laps` (le premier par défaut).
+    pas : float, optionnel
+        Pas de la grille, en mètres.
+
+    Retour
+    ------
+    dict | None
+        - distance : np.ndarray (m), grille commune ;
+        - pilotes : list[str], un libellé (colonne Driver) par ligne ;
+        - tours : list[Lap], tours effectivement comparés ;
+        - canaux : dict canal → np.ndarray (n_tours, n_points) ;
+        - temps : np.ndarray (n_tours, n_points), temps écoulé depuis le début du tour (s) ;
+        - delta : np.ndarray (n_tours, n_points), écart cumulé à la référence (s).
+        Les tours sans télémétrie sont ignorés ; None si la référence n'en a pas.
+        La grille est partagée (lecture seule) ; les matrices sont propres à l'appel.
+    """
+    ref_lap = laps[reference]
+    paires, tours = [], []
+    reference_comparee = False
+    for i, lap in enumerate(laps):
+        paire = MAGASIN_TELEMETRIE.obtenir_ou_charger(
+            ("comparaison", cle_tour(sess, ref_lap, "voiture"), cle_tour(sess, lap, "voiture"), float(pas)),
+            lambda _: _comparer_paire(sess, ref_lap, lap, float(pas)),
+        )
+        if paire is not None:
+            paires.append(paire)
+            tours.append(lap)
+            reference_comparee = reference_comparee or i == reference
+    if not reference_comparee:
+        return None
+    canaux = [c for c in CANAUX_COMPARAISON if all(c in p for p in paires)]
+    return dict(
+        distance=paires[0]['Distance'],
+        pilotes=[lap['Driver'] for lap in tours],
+        tours=tours,
+        canaux={c: np.vstack([p[c] for p in paires]) for c in canaux},
+        temps=np.vstack([p['Temps'] for p in paires]),
+        delta=np.vstack([p['Delta'] for p in paires]),
+    )
+
+
+# --- Mini-secteurs ---
+
+def _calculer_mini_secteurs(sess, n_secteurs: int):
+    lot = telemetrie_tours_rapides(sess)
+    if not lot:
+        return None
+    bornes = np.linspace(0.0, 1.0, n_secteurs + 1)
+    laps = [lap for lap, _ in lot.values()]
+    longueurs = np.empty(len(lot))
+    temps_bornes = np.empty((len(lot), n_secteurs + 1))
+    for i, (_, tel) in enumerate(lot.values()):
+        # Origine (0 m, 0 s) ajoutée : la distance intégrée part du premier échantillon
+        distance = np.r_[0.0, np.maximum.accumulate(tel['Distance'].to_numpy(dtype=float))]
+        temps = np.r_[0.0, tel['Time'].dt.total_seconds().to_numpy()]
+        longueurs[i] = distance[-1]
+        temps_bornes[i] = np.interp(bornes * distance[-1], distance, temps)
+
+    # Toute la suite en opérations matricielles (pilotes × secteurs)
+    temps_secteurs = np.diff(temps_bornes, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vitesses = (longueurs[:, None] / n_secteurs) / temps_secteurs * 3.6
+    meilleurs = np.argmin(np.where(temps_secteurs > 0, temps_secteurs, np.inf), axis=0)
+    reference = int(np.argmin(temps_bornes[:, -1]))
+    return dict(
+        bornes=_lecture_seule(bornes),
+        pilotes=[lap['Driver'] for lap in laps],
+        equipes=[lap['Team'] if 'Team' in lap.index else None for lap in laps],
+        tours=[sans_session(lap) for lap in laps],
+        temps=_lecture_seule(temps_secteurs),
+        vitesses=_lecture_seule(vitesses),
+        meilleurs=_lecture_seule(meilleurs),
+        reference=reference,
+    )
+
+
+def mini_secteurs(sess, n_secteurs: int = 25) -> dict | None:
+    """
+    Découpe le tour en `n_secteurs` portions de même longueur et compare le
+    tour le plus rapide de chaque pilote sur chacune d'elles.
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 chargée avec la télémétrie.
+    n_secteurs : int, optionnel
+        Nombre de mini-secteurs (25 par défaut).
+
+    Retour
+    ------
+    dict | None
+        - bornes : np.ndarray (n_secteurs + 1,), bornes en fraction du tour ;
+        - pilotes, equipes, tours : une entrée par pilote (ordre des lignes ;
+          tours sans lien vers la session, cf. `sans_session`) ;
+        - temps : np.ndarray (n_pilotes, n_secteurs), temps par secteur (s) ;
+        - vitesses : np.ndarray (n_pilotes, n_secteurs), vitesse moyenne (km/h) ;
+        - meilleurs : np.ndarray (n_secteurs,), ligne du pilote le plus rapide ;
+        - reference : ligne du tour le plus rapide (pour le tracé du circuit).
+        None si aucune télémétrie. Résultat partagé, mis en cache par session
+        et nombre de secteurs.
+    """
+    if n_secteurs < 1:
+        raise ValueError("Le nombre de mini-secteurs doit être au moins 1.")
+    return MAGASIN_TELEMETRIE.obtenir_ou_charger((*cle_session(sess), "mini_secteurs", int(n_secteurs)),
+                                                 lambda _: _calculer_mini_secteurs(sess, int(n_secteurs)))
+
+
+# --- Contexte de tour partagé par les cartes ---
+
+def infos_circuit(sess):
+    """`Session.get_circuit_info()` mis en cache par session (None si indisponible)."""
+    def _charger(_):
+        try:
+            return sess.get_circuit_info()
+        except Exception:
+            return None
+    return MAGASIN_TELEMETRIE.obtenir_ou_charger((*cle_session(sess), "circuit"), _charger)
+
+
+class ContexteTour:
+    """
+    Tour résolu une fois pour toutes les cartes d'un pilote : identifiant,
+    ligne du tour, télémétrie fusionnée, positions et infos circuit.
+
+    Les données lourdes sont lues à la première utilisation, dans les caches
+    partagés de ce module ; le contexte est alors redéposé dans
+    `MAGASIN_TELEMETRIE` pour que sa taille comptée les inclue. Il ne garde
+    qu'une référence faible à la session (la durée de vie des sessions reste
+    celle de `MAGASIN_SESSIONS`). À obtenir via `contexte_tour`.
+
+    Attributs
+    ---------
+    cle : tuple
+        Identifiant de la session (`cle_session`).
+    pilote : str | None
+        Abréviation du pilote (None : tous les pilotes).
+    titre : str
+        Nom à afficher (BroadcastName si connu, sinon l'abréviation).
+    lap : pd.Series | None
+        Ligne du tour retenu (sans lien vers la session), None si le pilote n'a aucun tour.
+    """
+
+    def __init__(self, sess, pilote=None, lap_number: int | None = None, cle_magasin=None):
+        self.cle = cle_session(sess)
+        self._session = weakref.ref(sess)
+        self._cle_magasin = cle_magasin
+        self._donnees: dict = {}
+        index = index_pilotes(sess)
+        self.pilote = index.resoudre(pilote)
+        self.titre = index.nom(self.pilote)
+
+        laps = sess.laps if self.pilote is None else sess.laps.pick_drivers(self.pilote)
+        self.lap = None
+        if laps is not None and not laps.empty:
+            choisi = laps.loc[laps['LapNumber'] == lap_number] if lap_number is not None else None
+            # Tour demandé introuvable : repli sur le plus rapide
+            lap = choisi.iloc[0] if choisi is not None and not choisi.empty else laps.pick_fastest()
+            self.lap = sans_session(lap) if lap is not None else None
+
+    @property
+    def valide(self) -> bool:
+        """False si la session du contexte a été libérée (le contexte doit être reconstruit)."""
+        return self._session() is not None
+
+    def _charger(self, nom: str, charger):
+        if nom not in self._donnees:
+            sess = self._session()
+            if sess is None:
+                return None
+            try:
+                valeur = charger(sess)
+            except Exception:
+                valeur = None
+            if valeur is None:
+                # Indisponible : redemandé au prochain accès, comme dans les magasins
+                return None
+            self._donnees[nom] = valeur
+            if self._cle_magasin is not None:
+                # Taille réévaluée avec les données désormais retenues par le contexte
+                MAGASIN_TELEMETRIE.deposer(self._cle_magasin, self)
+        return self._donnees[nom]
+
+    def _telemetrie(self, genre: str):
+        return self._charger(genre, lambda sess: telemetrie_tour(sess, self.lap, genre))
+
+    @property
+    def telemetrie(self):
+        """Télémétrie fusionnée car + pos (X, Y, Speed, nGear...), ou None."""
+        return self._telemetrie("complete") if self.lap is not None else None
+
+    @property
+    def position(self):
+        """Données de position du tour (X, Y), ou None."""
+        return self._telemetrie("position") if self.lap is not None else None
+
+    @property
+    def circuit(self):
+        """Infos circuit FastF1 (virages, rotation), ou None."""
+        return self._charger("circuit", infos_circuit)
+
+
+def contexte_tour(sess, pilote=None, lap_number: int | None = None) -> ContexteTour:
+    """
+    Contexte de tour partagé, construit une seule fois par (session, pilote, tour).
+
+    Paramètres
+    ----------
+    sess : fastf1.core.Session
+        Session FastF1 chargée.
+    pilote : str | int | None
+        Abréviation, numéro ou BroadcastName ; None pour le meilleur tour de la session.
+    lap_number : int | None
+        Numéro de tour ; None (ou tour introuvable) pour le tour le plus rapide.
+
+    Retour
+    ------
+    ContexteTour
+    """
+    cle = (*cle_session(sess), "contexte", None if pilote is None else str(pilote), lap_number)
+    return MAGASIN_TELEMETRIE.obtenir_ou_charger(cle, lambda _: ContexteTour(sess, pilote, lap_number, cle),
+                                                 accepte=lambda contexte: contexte.valide)
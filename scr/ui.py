@@ -1,5 +1,4 @@
 import streamlit as st
-from streamlit_extras.colored_header import colored_header
 
 def selecteurs_session():
     """
@@ -10,26 +9,22 @@ def selecteurs_session():
     tuple
         (année, grand_prix, session_type, loaded)
     """
-    import fastf1
-    from datetime import datetime
-    from streamlit_extras.colored_header import colored_header
+    from scr.calendrier import noms_courses, precharger, saisons
+
+    # Calendriers servis par scr.calendrier (mémoire, puis disque) : aucun accès
+    # réseau aux réexécutions, les revalidations se font en arrière-plan ; la
+    # saison en cours est préchargée, les autres à leur première sélection
+    precharger()
+    annees = saisons()
 
     # Préremplir avec dernier choix stocké si dispo, sinon valeurs par défaut
-    annee_def = st.session_state.get("annee", datetime.now().year)
-    try:
-        schedule = fastf1.get_event_schedule(annee_def, include_testing=False)
-        events = schedule['EventName'].tolist()
-    except Exception:
-        events = []
+    annee_def = st.session_state.get("annee", annees[0])
+    events = list(noms_courses(annee_def))
     grand_prix_def = st.session_state.get("grand_prix", events[0] if events else "")
     session_type_def = st.session_state.get("session_type", "R")
 
-    annee = st.selectbox("Saison", list(range(2018, datetime.now().year + 1))[::-1], index=list(range(2018, datetime.now().year + 1))[::-1].index(annee_def), key="sb_annee")
-    try:
-        schedule = fastf1.get_event_schedule(annee, include_testing=False)
-        events = schedule['EventName'].tolist()
-    except Exception:
-        events = []
+    annee = st.selectbox("Saison", annees, index=annees.index(annee_def) if annee_def in annees else 0, key="sb_annee")
+    events = list(noms_courses(annee))
     grand_prix = st.selectbox("Grand Prix", options=events if events else ["Bahrain", "Monaco", "Monza"], index=events.index(grand_prix_def) if grand_prix_def in events else 0, key="sb_gp")
     session_labels = {
         "FP1": "Essais libres 1",
@@ -53,10 +48,14 @@ def selecteurs_session():
             st.session_state["grand_prix"] = grand_prix
             st.session_state["session_type"] = session_type
             st.session_state["loaded"] = True
+            # Un chargement précédent en échec est retenté
+            st.session_state["relancer"] = True
 
     with col_reset:
         if st.button("Réinitialiser", key="reset_btn_home"):
-            for key in ["annee", "grand_prix", "session_type", "loaded"]:
+            if st.session_state.get("chargement") is not None:
+                st.session_state["chargement"].abandonner()
+            for key in ["annee", "grand_prix", "session_type", "loaded", "chargement"]:
                 if key in st.session_state:
                     del st.session_state[key]
 
@@ -67,6 +66,95 @@ def selecteurs_session():
         st.session_state.get("loaded", False),
     )
 
+def chargement_arriere_plan(annee: int, grand_prix: str, session_type: str, parties=None):
+    """
+    Lance (ou retrouve) le chargement en arrière-plan de la session choisie.
+
+    Le chargement précédent de l'utilisateur, s'il portait sur une autre
+    session, est abandonné (annulé si personne d'autre ne l'attend). Pour la
+    même session, il est repris s'il est en cours ou si ses données sont
+    encore en mémoire ; sinon (données évincées depuis, annulation, ou échec
+    et nouveau clic sur Charger), un nouveau chargement est lancé.
+
+    Paramètres
+    ----------
+    annee, grand_prix, session_type :
+        Session choisie.
+    parties : tuple[str, ...] | None, optionnel
+        Parties dont la page a besoin (voir `scr.data.PARTIES_SESSION`), None pour toutes.
+
+    Retour
+    ------
+    scr.chargement.Chargement
+    """
+    from scr.chargement import lancer_chargement
+    from scr.data import PARTIES_SESSION
+
+    cle = (annee, grand_prix, session_type)
+    relancer = st.session_state.pop("relancer", False)
+    precedent = st.session_state.get("chargement")
+    voulues = set(PARTIES_SESSION if parties is None else parties)
+    if precedent is not None and precedent.cle == cle and voulues <= set(precedent.parties) and (
+            not precedent.termine
+            or precedent.etat == "termine" and precedent.disponible(precedent.parties)
+            or precedent.etat == "echec" and not relancer):
+        return precedent
+    if precedent is not None:
+        precedent.abandonner()
+    chargement = lancer_chargement(*cle, parties=parties)
+    st.session_state["chargement"] = chargement
+    return chargement
+
+def donnees_session(annee: int, grand_prix: str, session_type: str, parties: tuple[str, ...]):
+    """
+    Données de la session pour une page, chargées en arrière-plan.
+
+    Tant que les `parties` ne sont pas prêtes, la page affiche la progression
+    du chargement puis s'arrête (`st.stop()`) ; elle est réexécutée dès
+    qu'elles arrivent.
+
+    Retour
+    ------
+    DictionnaireFige
+        Données de `scr.data.chargement_session` pour ces parties.
+    """
+    from scr.data import donnees_disponibles
+
+    chargement = chargement_arriere_plan(annee, grand_prix, session_type, parties)
+    data = donnees_disponibles(annee, grand_prix, session_type, parties=parties)
+    suivi_chargement(chargement, requises=() if data is not None else tuple(parties))
+    if data is None:
+        st.stop()
+    return data
+
+@st.fragment(run_every=0.5)
+def suivi_chargement(chargement, requises: tuple[str, ...] = ()):
+    """
+    Barre de progression d'un chargement en arrière-plan, rafraîchie seule.
+
+    Paramètres
+    ----------
+    chargement : scr.chargement.Chargement
+        Chargement suivi.
+    requises : tuple[str, ...], optionnel
+        Parties attendues par la page : dès qu'elles sont prêtes, toute la
+        page est réexécutée pour les afficher.
+    """
+    if chargement.etat == "echec":
+        st.info("Données indisponibles pour cette sélection (connexion, calendrier ou session non disponible).")
+        with st.expander("Détails techniques (debug)"):
+            st.write(chargement.erreur)
+        return
+    if requises and chargement.disponible(requises):
+        st.rerun()
+    if chargement.termine:
+        return
+    st.progress(chargement.progression, text=f"Chargement de la session : {chargement.libelle}…")
+    if st.button("Annuler le chargement", key="annuler_chargement"):
+        chargement.abandonner()
+        st.session_state["loaded"] = False
+        st.rerun()
+
 def selecteur_pilote_unique(pilotes: list[str]):
     """
     Affiche un sélecteur pour choisir un seul pilote dans la sidebar.
@@ -81,6 +169,8 @@ def selecteur_pilote_unique(pilotes: list[str]):
     str
         Le code du pilote sélectionné (par défaut "HAM" si disponible).
     """
+    from streamlit_extras.colored_header import colored_header
+
     colored_header(
         "Pilotes",
         description="Choisissez un pilotes",
@@ -112,6 +202,8 @@ def selecteurs_pilotes(pilotes: list[str]):
     tuple
         (pilote_1, pilote_2) où pilote_2 peut être une chaîne vide.
     """
+    from streamlit_extras.colored_header import colored_header
+
     colored_header(
         "Pilotes",
         description="Choisissez un ou deux pilotes à comparer",
@@ -38,4 +38,72 @@ def secs(td) -> float:
     """
     if pd.isna(td):
         return np.nan
-    return td.total_seconds()
\ No newline at end of file
+    return td.total_seconds()
+
+def _nanosecondes(valeurs):
+    """
+    Convertit une Series / un tableau de Timedelta en entiers de nanosecondes.
+
+    Retour
+    ------
+    tuple
+        (tableau int64 des nanosecondes, masque des NaT, index ou None, nom ou None)
+    """
+    index = getattr(valeurs, "index", None) if isinstance(valeurs, pd.Series) else None
+    nom = valeurs.name if isinstance(valeurs, pd.Series) else None
+    td = np.asarray(pd.to_timedelta(valeurs), dtype="timedelta64[ns]")
+    ns = td.view("i8")
+    return ns, np.isnat(td), index, nom
+
+
+def secs_serie(valeurs):
+    """
+    Version colonne de `secs` : convertit toute une série de Timedelta en secondes.
+
+    Paramètres
+    ----------
+    valeurs : pandas.Series | array-like
+        Les intervalles de temps (Timedelta, NaT ou None).
+
+    Retour
+    ------
+    pandas.Series | numpy.ndarray
+        Les secondes en float (np.nan pour NaT/None). Une Series garde son index.
+    """
+    ns, nat, index, nom = _nanosecondes(valeurs)
+    out = ns / 1e9
+    out[nat] = np.nan
+    if index is not None:
+        return pd.Series(out, index=index, name=nom)
+    return out
+
+
+def formatage_timedelta_serie(valeurs):
+    """
+    Version colonne de `formatage_timedelta` : formate toute une série en mm:ss.ms.
+
+    Paramètres
+    ----------
+    valeurs : pandas.Series | array-like
+        Les intervalles de temps (Timedelta, NaT ou None).
+
+    Retour
+    ------
+    pandas.Series | numpy.ndarray
+        Les temps formatés, "—" pour NaT/None. Une Series garde son index.
+    """
+    ns, nat, index, nom = _nanosecondes(valeurs)
+    ns = np.where(nat, 0, ns)
+    # Troncature vers zéro à la milliseconde, comme int(td.total_seconds() * 1000)
+    total_ms = np.sign(ns) * (np.abs(ns) // 1_000_000)
+    minutes, ms_rem = np.divmod(total_ms, 60_000)
+    seconds, ms = np.divmod(ms_rem, 1000)
+    txt = np.strings.add(
+        np.strings.add(np.strings.zfill(minutes.astype(str), 2), ":"),
+        np.strings.add(np.strings.add(np.strings.zfill(seconds.astype(str), 2), "."),
+                       np.strings.zfill(ms.astype(str), 3)),
+    )
+    out = np.where(nat, "—", txt).astype(object)
+    if index is not None:
+        return pd.Series(out, index=index, name=nom)
+    return out
@@ -0,0 +1,56 @@
+import shutil
+
+import pytest
+import fastf1
+
+import scr.calendrier
+import scr.circuit
+import scr.data
+import scr.pilotes
+import scr.positions
+import scr.telemetrie
+from benchmarks.hors_ligne import CACHE_DEPOT, COURSE as COURSE_ENREGISTREE
+from benchmarks.hors_ligne import session_australie_2025 as _session_australie_2025
+from scr.cache import MagasinSessions
+
+def session_australie_2025():
+    """Session FastF1 (non chargée) du GP d'Australie 2025, points tels que lus dans le cache."""
+    return _session_australie_2025(points=False)
+
+@pytest.fixture
+def fabrique_session():
+    return session_australie_2025
+
+@pytest.fixture
+def fastf1_hors_ligne(tmp_path, monkeypatch):
+    """
+    Doublure locale de l'API : FastF1 en mode hors ligne sur une copie du cache
+    enregistré (GP d'Australie 2025, course). Toute autre course échoue comme
+    une course inconnue. Ergast et le calendrier en ligne échouent comme sans
+    réseau, sans requête. Les magasins de sessions et de télémétrie sont isolés pour le test.
+    """
+    shutil.copytree(CACHE_DEPOT / '2025', tmp_path / '2025',
+                    ignore=shutil.ignore_patterns('instantane', '*.arrow', '.DS_Store'))
+    for attr in ('_CACHE_DIR', '_requests_session_cached', '_IGNORE_VERSION', '_FORCE_RENEW'):
+        monkeypatch.setattr(fastf1.Cache, attr, getattr(fastf1.Cache, attr))
+    fastf1.Cache.enable_cache(str(tmp_path))
+    fastf1.Cache.offline_mode(True)
+
+    def get_session(annee, course, sess_type, *args, **kwargs):
+        if (annee, course, sess_type) != (2025, COURSE_ENREGISTREE, 'R'):
+            raise ValueError(f"Aucune donnée enregistrée pour {annee} {course} {sess_type}")
+        return session_australie_2025()
+
+    def hors_reseau(*args, **kwargs):
+        raise ConnectionError("réseau indisponible (tests hors ligne)")
+
+    monkeypatch.setattr(fastf1, 'get_session', get_session)
+    monkeypatch.setattr(fastf1, 'get_event_schedule', hors_reseau)
+    monkeypatch.setattr(fastf1.ergast.Ergast, '_get', hors_reseau)
+    monkeypatch.setattr(scr.calendrier, '_CALENDRIERS', {})
+    monkeypatch.setattr(scr.calendrier, '_REVALIDATIONS', {})
+    monkeypatch.setattr(scr.data, 'MAGASIN_SESSIONS', MagasinSessions(10**9))
+    magasin_telemetrie = MagasinSessions(10**9)
+    for module in (scr.telemetrie, scr.pilotes, scr.circuit, scr.positions):
+        monkeypatch.setattr(module, 'MAGASIN_TELEMETRIE', magasin_telemetrie)
+    return tmp_path
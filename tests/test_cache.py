@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scr.cache import MagasinSessions, DictionnaireFige, estimer_taille
+
+def _df(n):
+    return pd.DataFrame({'x': np.zeros(n, dtype='float64')})
+
+def test_estimer_taille_dataframe():
+    assert estimer_taille(_df(1000)) >= 8000
+
+def test_meme_objet_sans_copie():
+    magasin = MagasinSessions(10**9)
+    v1 = magasin.obtenir_ou_charger('a', lambda prec: {'df': _df(10)})
+    v2 = magasin.obtenir_ou_charger('a', lambda prec: pytest.fail('rechargement inattendu'))
+    assert v1 is v2
+    stats = magasin.statistiques()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+def test_eviction_lru_par_taille():
+    magasin = MagasinSessions(estimer_taille(_df(1000)) * 2 + 10)
+    for cle in ['a', 'b']:
+        magasin.obtenir_ou_charger(cle, lambda prec: _df(1000))
+    magasin.obtenir_ou_charger('a', lambda prec: _df(1000))  # 'a' devient le plus récent
+    magasin.obtenir_ou_charger('c', lambda prec: _df(1000))
+    stats = magasin.statistiques()
+    assert stats['evictions'] == 1
+    assert stats['octets'] <= stats['budget_octets']
+    magasin.obtenir_ou_charger('a', lambda prec: pytest.fail('a ne devait pas être évincé'))
+
+def test_valeur_refusee_rechargee_avec_precedente():
+    magasin = MagasinSessions(10**9)
+    magasin.obtenir_ou_charger('a', lambda prec: {'parties': ('tours',)})
+    v = magasin.obtenir_ou_charger('a', lambda prec: {'parties': prec['parties'] + ('meteo',)},
+                                   accepte=lambda d: 'meteo' in d['parties'])
+    assert v['parties'] == ('tours', 'meteo')
+    assert magasin.statistiques()['misses'] == 2
+
+def test_echec_non_conserve_et_verrous_liberes():
+    magasin = MagasinSessions(10**9)
+    appels = []
+    for _ in range(2):
+        assert magasin.obtenir_ou_charger('a', lambda prec: appels.append(prec)) is None
+    assert len(appels) == 2
+    for cle in range(100):
+        magasin.obtenir_ou_charger(('tour', cle), lambda prec: _df(1))
+    stats = magasin.statistiques()
+    assert (stats['entrees'], stats['octets']) == (100, 100 * estimer_taille(_df(1)))
+    assert magasin._verrous_cles == {}
+    magasin.deposer(('tour', 0), None)
+    assert magasin.lire(('tour', 0)) is None and magasin.statistiques()['entrees'] == 99
+
+def test_dictionnaire_fige():
+    d = DictionnaireFige(a=1)
+    with pytest.raises(TypeError):
+        d['a'] = 2
+    with pytest.raises(TypeError):
+        d.update(b=3)
+    assert isinstance(d, dict) and d['a'] == 1
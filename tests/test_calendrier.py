@@ -0,0 +1,89 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import fastf1
+import pandas as pd
+import pytest
+from fastf1.events import EventSchedule
+
+import scr.calendrier
+from scr.calendrier import calendrier, noms_courses
+from tests.conftest import COURSE_ENREGISTREE, session_australie_2025
+
+@pytest.fixture
+def telechargements(tmp_path, monkeypatch):
+    """Calendrier FastF1 factice (une épreuve) ; `appels` liste les saisons téléchargées."""
+    monkeypatch.setattr(fastf1.Cache, '_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(scr.calendrier, '_CALENDRIERS', {})
+    monkeypatch.setattr(scr.calendrier, '_REVALIDATIONS', {})
+    etat = SimpleNamespace(appels=[], hors_ligne=False)
+
+    def get_event_schedule(annee, include_testing=True):
+        etat.appels.append(annee)
+        if etat.hors_ligne:
+            raise ConnectionError("réseau indisponible")
+        return EventSchedule(pd.DataFrame([dict(session_australie_2025().event)]), year=annee)
+
+    monkeypatch.setattr(fastf1, 'get_event_schedule', get_event_schedule)
+    return etat
+
+def test_recherches_par_nom(telechargements):
+    cal = calendrier(2025)
+    assert cal.noms == (COURSE_ENREGISTREE,) and COURSE_ENREGISTREE in cal
+    assert cal.manche(COURSE_ENREGISTREE) == 1
+    assert cal.types_session(COURSE_ENREGISTREE) == ('FP1', 'FP2', 'FP3', 'Q', 'R')
+    assert cal.date_session(COURSE_ENREGISTREE, 'R') == pd.Timestamp('2025-03-16 04:00')
+    assert cal.date_session(COURSE_ENREGISTREE, 'S') is None
+    assert cal.jusqua(COURSE_ENREGISTREE)['RoundNumber'].tolist() == [1]
+
+def test_saison_passee_lue_une_fois_puis_sur_disque(telechargements, monkeypatch):
+    assert calendrier(2025) is calendrier(2025)
+    assert noms_courses(2025) == (COURSE_ENREGISTREE,)
+    assert telechargements.appels == [2025]
+    # Nouveau processus : mémoire vide, le fichier suffit
+    monkeypatch.setattr(scr.calendrier, '_CALENDRIERS', {})
+    assert calendrier(2025).manche(COURSE_ENREGISTREE) == 1
+    assert telechargements.appels == [2025]
+
+def attendre_revalidation(annee):
+    futur = scr.calendrier._REVALIDATIONS.pop(annee, None)
+    if futur is not None:
+        futur.result(timeout=10)
+
+def test_saison_en_cours_revalidee(telechargements, monkeypatch):
+    annee = datetime.now().year
+    premier = calendrier(annee)
+    assert calendrier(annee) is premier and telechargements.appels == [annee]
+
+    # Périmé : servi tel quel, revalidé en arrière-plan
+    monkeypatch.setattr(scr.calendrier, 'TTL_CALENDRIER_S', 0)
+    assert calendrier(annee) is premier
+    attendre_revalidation(annee)
+    assert telechargements.appels == [annee] * 2 and calendrier(annee) is not premier
+
+    # Revalidation en échec : l'ancien calendrier reste servi, sans réessayer à chaque appel
+    monkeypatch.setattr(scr.calendrier, 'TTL_CALENDRIER_S', 3600)
+    scr.calendrier._CALENDRIERS[annee] = (premier, 0.0)
+    telechargements.hors_ligne = True
+    assert calendrier(annee) is premier
+    attendre_revalidation(annee)
+    assert calendrier(annee) is premier and calendrier(annee) is premier
+    assert scr.calendrier._REVALIDATIONS == {}
+    assert telechargements.appels == [annee] * 3
+
+def test_calendrier_introuvable(telechargements, monkeypatch):
+    telechargements.hors_ligne = True
+    assert calendrier(2019) is None and noms_courses(2019) == ()
+    assert telechargements.appels == [2019]
+    # Nouvel essai après TTL_ECHEC_S, en arrière-plan : l'appel répond sans attendre
+    monkeypatch.setattr(scr.calendrier, 'TTL_ECHEC_S', 0)
+    telechargements.hors_ligne = False
+    assert calendrier(2019) is None
+    attendre_revalidation(2019)
+    assert noms_courses(2019) == (COURSE_ENREGISTREE,) and telechargements.appels == [2019] * 2
+
+def test_prechargement_de_la_saison_en_cours(telechargements, monkeypatch):
+    monkeypatch.setattr(scr.calendrier, '_PRECHARGEMENT', None)
+    for futur in scr.calendrier.precharger():
+        futur.result(timeout=10)
+    assert telechargements.appels == [datetime.now().year]
@@ -0,0 +1,110 @@
+import threading
+
+import fastf1
+import pytest
+
+import scr.chargement
+import scr.data
+from scr.chargement import lancer_chargement
+from scr.data import donnees_disponibles
+from tests.conftest import COURSE_ENREGISTREE
+
+@pytest.fixture
+def etape_bloquee(monkeypatch):
+    """Chargement factice dont l'étape 'tours' attend le signal `liberer`."""
+    en_cours, liberer, appels = threading.Event(), threading.Event(), []
+
+    def charger(annee, course, sess_type, parties):
+        appels.append(parties)
+        en_cours.set()
+        liberer.wait(10)
+
+    monkeypatch.setattr(scr.chargement, 'chargement_session', charger)
+    monkeypatch.setattr(scr.chargement, 'calendrier', lambda annee: None)
+    monkeypatch.setattr(scr.chargement, 'donnees_disponibles', lambda *args, **kwargs: None)
+    return en_cours, liberer, appels
+
+def test_chargement_par_etapes(fastf1_hors_ligne, monkeypatch):
+    appels = []
+    for nom in ('_load_drivers_results', '_load_laps_data', '_load_weather_data'):
+        origine = getattr(fastf1.core.Session, nom)
+        monkeypatch.setattr(fastf1.core.Session, nom,
+                            lambda self, *a, nom=nom, origine=origine, **k: appels.append(nom) or origine(self, *a, **k))
+    assert donnees_disponibles(2025, COURSE_ENREGISTREE, 'R') is None
+    chargement = lancer_chargement(2025, COURSE_ENREGISTREE, 'R', parties=('tours', 'meteo'))
+    chargement.futur.result(timeout=60)
+    assert chargement.etat == 'termine' and chargement.progression == 1.0
+    assert chargement.terminees == ['calendrier', 'tours', 'meteo']
+    # Chaque étape n'analyse que sa partie, sans reprendre les précédentes
+    assert appels == ['_load_drivers_results', '_load_laps_data', '_load_weather_data']
+    donnees = donnees_disponibles(2025, COURSE_ENREGISTREE, 'R', parties=('tours', 'meteo'))
+    assert donnees is not None and not donnees['meteo'].empty
+    assert donnees_disponibles(2025, COURSE_ENREGISTREE, 'R', parties=('telemetrie',)) is None
+
+def test_echec_signale(fastf1_hors_ligne, monkeypatch):
+    # Course absente du calendrier : échec dès la première étape, sans appel à FastF1
+    monkeypatch.setattr(scr.chargement, 'calendrier', lambda annee: {COURSE_ENREGISTREE})
+    chargement = lancer_chargement(2025, 'Grand Prix inconnu', 'R')
+    chargement.futur.result(timeout=60)
+    assert chargement.etat == 'echec' and isinstance(chargement.erreur, ValueError)
+    assert chargement.terminees == []
+    # Calendrier indisponible : l'épreuve inconnue échoue au chargement FastF1
+    monkeypatch.setattr(scr.chargement, 'calendrier', lambda annee: None)
+    chargement = lancer_chargement(2025, 'Grand Prix inconnu', 'R')
+    chargement.futur.result(timeout=60)
+    assert chargement.etat == 'echec' and chargement.terminees == ['calendrier']
+
+def test_seules_les_parties_demandees(etape_bloquee):
+    en_cours, liberer, appels = etape_bloquee
+    liberer.set()
+    chargement = lancer_chargement(2030, 'Test', 'R', parties=('tours', 'telemetrie'))
+    chargement.futur.result(timeout=10)
+    assert [nom for nom, _, _ in chargement.etapes] == ['calendrier', 'tours', 'telemetrie']
+    assert appels == [('tours',), ('tours', 'telemetrie')]
+    # Autres parties : chargement distinct, pas partagé avec le précédent
+    autre = lancer_chargement(2030, 'Test', 'R', parties=('meteo',))
+    autre.futur.result(timeout=10)
+    assert autre.parties == ('meteo',) and autre is not chargement
+
+def test_annulation_entre_deux_etapes(etape_bloquee):
+    en_cours, liberer, appels = etape_bloquee
+    premier = lancer_chargement(2030, 'Test', 'R')
+    second = lancer_chargement(2030, 'Test', 'R')
+    assert second is premier
+    assert en_cours.wait(10) and premier.etape == 'tours' and premier.libelle.startswith('Temps au tour')
+
+    premier.abandonner()          # un demandeur reste : on continue
+    assert not premier._annule.is_set()
+    second.abandonner()           # plus personne : annulé après l'étape en cours
+    liberer.set()
+    premier.futur.result(timeout=10)
+    assert premier.etat == 'annule' and len(appels) == 1
+    nouveau = lancer_chargement(2030, 'Test', 'R')
+    assert nouveau is not premier
+    nouveau.futur.result(timeout=10)
+
+def test_relance_apres_eviction(fastf1_hors_ligne, monkeypatch):
+    import scr.ui
+    etat = {}
+    monkeypatch.setattr(scr.ui.st, 'session_state', etat)
+    chargement = scr.ui.chargement_arriere_plan(2025, COURSE_ENREGISTREE, 'R')
+    chargement.futur.result(timeout=60)
+    assert scr.ui.chargement_arriere_plan(2025, COURSE_ENREGISTREE, 'R') is chargement
+    # Session évincée du magasin : un nouveau chargement est lancé
+    scr.data.MAGASIN_SESSIONS.vider()
+    relance = scr.ui.chargement_arriere_plan(2025, COURSE_ENREGISTREE, 'R')
+    assert relance is not chargement and etat['chargement'] is relance
+    relance.futur.result(timeout=60)
+
+def test_echec_retente_au_clic(fastf1_hors_ligne, monkeypatch):
+    import scr.ui
+    etat = {}
+    monkeypatch.setattr(scr.ui.st, 'session_state', etat)
+    echec = scr.ui.chargement_arriere_plan(2025, 'Grand Prix inconnu', 'R')
+    echec.futur.result(timeout=60)
+    # Simple réexécution : l'échec reste affiché ; nouveau clic sur Charger : nouvel essai
+    assert scr.ui.chargement_arriere_plan(2025, 'Grand Prix inconnu', 'R') is echec
+    etat['relancer'] = True
+    relance = scr.ui.chargement_arriere_plan(2025, 'Grand Prix inconnu', 'R')
+    assert relance is not echec
+    relance.futur.result(timeout=60)
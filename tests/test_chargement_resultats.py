@@ -0,0 +1,18 @@
+import scr.data
+from scr.data import chargement_resultats, chargement_session, donnees_disponibles
+
+def test_resultats_seuls_et_echecs_isoles(fastf1_hors_ligne):
+    resultats, echecs = chargement_resultats(2025, ['Australian Grand Prix', 'Atlantis Grand Prix'], max_workers=2)
+    assert list(resultats) == ['Australian Grand Prix']
+    assert len(resultats['Australian Grand Prix']) == 20
+    assert list(echecs) == ['Atlantis Grand Prix']
+
+def test_resultats_seuls_hors_du_magasin(fastf1_hors_ligne):
+    chargement_resultats(2025, ['Australian Grand Prix'])
+    # Rien de déposé dans le magasin des sessions consultées par les pages
+    assert scr.data.MAGASIN_SESSIONS.statistiques()['entrees'] == 0
+    assert donnees_disponibles(2025, 'Australian Grand Prix', 'R') is None
+    # Session déjà partagée : ses résultats sont repris tels quels
+    d = chargement_session(2025, 'Australian Grand Prix', 'R', parties=('resultats',))
+    resultats, _ = chargement_resultats(2025, ['Australian Grand Prix'])
+    assert resultats['Australian Grand Prix'] is d['resultats']
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+import fastf1
+
+import scr.circuit
+from scr.cache import MagasinSessions
+from scr.circuit import GeometrieCircuit, douglas_peucker, geometrie_circuit, simplifier
+
+VIRAGES = pd.DataFrame({'X': [100.0, -250.0, 30.0], 'Y': [0.0, 400.0, -80.0],
+                        'Number': [1, 2, 3], 'Letter': ['', 'a', ''], 'Angle': [0.0, 135.0, -60.0]})
+
+class _Contexte:
+    def __init__(self, position, circuit):
+        self.position = position
+        self.circuit = circuit
+
+class _Circuit:
+    rotation = 44.0
+    corners = VIRAGES
+
+class _Session:
+    def __init__(self, cle=10):
+        self.session_info = {'Meeting': {'Circuit': {'Key': cle, 'ShortName': 'Melbourne'}}}
+        self.event = {'Location': 'Melbourne'}
+
+def _tour(n=3000):
+    t = np.linspace(0, 2 * np.pi, n)
+    return pd.DataFrame({'X': 4000 * np.cos(t) + 300 * np.cos(7 * t), 'Y': 2500 * np.sin(t)})
+
+def test_douglas_peucker_garde_les_angles():
+    points = np.array([[0, 0], [1, 0], [2, 0], [3, 0], [3, 1], [3, 2], [3, 3]], dtype=float)
+    assert douglas_peucker(points, 0.01).tolist() == [0, 3, 6]
+    assert douglas_peucker(points[:2], 0.01).tolist() == [0, 1]
+
+def test_simplifier_respecte_le_budget():
+    xy = _tour().to_numpy()
+    reduit = simplifier(xy, 200)
+    assert 150 <= len(reduit) <= 200
+    assert np.array_equal(reduit[0], xy[0]) and np.array_equal(reduit[-1], xy[-1])
+    assert len(simplifier(xy[:50], 200)) == 50
+
+def test_virages_identiques_au_calcul_point_par_point():
+    geometrie = GeometrieCircuit.construire('10', _tour().to_numpy(), VIRAGES, _Circuit.rotation)
+
+    def _rotate(xy, *, angle):
+        rot_mat = np.array([[np.cos(angle), np.sin(angle)], [-np.sin(angle), np.cos(angle)]])
+        return np.matmul(xy, rot_mat)
+
+    angle = _Circuit.rotation / 180.0 * np.pi
+    textes = geometrie.etiquettes(500.0)
+    for i, corner in VIRAGES.iterrows():
+        offset = _rotate(np.array([500.0, 0]), angle=corner['Angle'] / 180.0 * np.pi)
+        attendu = _rotate([corner['X'] + offset[0], corner['Y'] + offset[1]], angle=angle)
+        np.testing.assert_allclose(textes[i], attendu)
+        np.testing.assert_allclose(geometrie.virages.loc[i, ['X', 'Y']].to_numpy(dtype=float),
+                                   _rotate([corner['X'], corner['Y']], angle=angle))
+    assert geometrie.virages['Texte'].tolist() == ['1', '2a', '3']
+
+def test_geometrie_partagee_entre_sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(fastf1.Cache, '_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(scr.circuit, 'MAGASIN_TELEMETRIE', MagasinSessions(10**8))
+
+    geometrie = geometrie_circuit(_Session(), contexte=_Contexte(_tour(), _Circuit()))
+    assert geometrie is not None and len(geometrie.piste) <= scr.circuit.POINTS_PISTE
+    assert (tmp_path / 'circuits' / f'10_{scr.circuit.POINTS_PISTE}.json').exists()
+
+    # Autre session sur le même circuit, sans positions : relue en mémoire...
+    sans_positions = _Contexte(None, None)
+    assert geometrie_circuit(_Session(), contexte=sans_positions) is geometrie
+    # ... puis sur disque par un nouveau processus
+    monkeypatch.setattr(scr.circuit, 'MAGASIN_TELEMETRIE', MagasinSessions(10**8))
+    relue = geometrie_circuit(_Session(), contexte=sans_positions)
+    np.testing.assert_allclose(relue.piste, geometrie.piste)
+    pd.testing.assert_frame_equal(relue.virages, geometrie.virages)
+    assert relue.rotation == geometrie.rotation
+
+    # Autre circuit : à calculer, donc indisponible sans positions
+    assert geometrie_circuit(_Session(cle=63), contexte=sans_positions) is None
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from scr.compaction import compacter, compacter_tables
+from scr.data import chargement_session
+from tests.conftest import COURSE_ENREGISTREE
+
+def test_compacter_types():
+    df = pd.DataFrame({'Driver': ['VER', 'NOR'] * 50, 'Stint': np.arange(100) % 3,
+                       'LapSeconds': np.linspace(80, 100, 100), 'Unique': [f'x{i}' for i in range(100)],
+                       'LapTime': pd.to_timedelta(np.arange(100), unit='s')})
+    compact = compacter(df)
+    assert compact['Driver'].dtype == 'category'
+    assert compact['Stint'].dtype == np.int8
+    assert compact['LapSeconds'].dtype == np.float32
+    assert compact['Unique'].dtype == object
+    assert compact['LapTime'].dtype == df['LapTime'].dtype
+    np.testing.assert_allclose(compact['LapSeconds'], df['LapSeconds'], rtol=1e-6)
+
+def test_rapport_octets():
+    _, rapport = compacter_tables({'t': pd.DataFrame({'Compound': ['SOFT'] * 1000})})
+    avant, apres = rapport['t']
+    assert apres < avant
+
+def test_tours_compacts_a_l_identique(fastf1_hors_ligne):
+    d = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=("tours",))
+    tours = d['tours']
+    assert tours['Driver'].dtype == 'category'
+    avant, apres = d['octets']['tours']
+    assert apres < avant
+    assert tours.pick_drivers('VER')['LapNumber'].max() == d['session'].laps.pick_drivers('VER')['LapNumber'].max()
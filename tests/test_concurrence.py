@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+
+import fastf1
+import fastf1.req
+import pytest
+
+from scr.concurrence import Bail, bail_exclusif, fichier_bail, installer_ecriture_atomique
+
+@pytest.fixture
+def cache_partage(tmp_path, monkeypatch):
+    monkeypatch.setattr(fastf1.Cache, '_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+def test_suiveur_attend_le_meneur(cache_partage):
+    cle = ('session', 2025, 'Australian Grand Prix', 'R')
+    ordre, attendus = [], []
+
+    def suiveur():
+        with bail_exclusif(cle) as attendu:
+            attendus.append(attendu)
+            ordre.append('suiveur')
+
+    with bail_exclusif(cle) as attendu:
+        assert attendu is False and fichier_bail(cle).exists()
+        fil = threading.Thread(target=suiveur)
+        fil.start()
+        time.sleep(0.5)
+        ordre.append('meneur')
+    fil.join(10)
+    assert ordre == ['meneur', 'suiveur'] and attendus == [True]
+    assert not fichier_bail(cle).exists()
+
+def test_bail_perime_repris(cache_partage):
+    chemin = fichier_bail(('session', 2030, 'Test', 'R'))
+    chemin.parent.mkdir(parents=True)
+    chemin.write_text('{"jeton": "processus-disparu"}')
+    ancien = time.time() - 120
+    os.utime(chemin, (ancien, ancien))
+    debut = time.monotonic()
+    with bail_exclusif(('session', 2030, 'Test', 'R'), duree=60, attente=5):
+        assert '"processus-disparu"' not in chemin.read_text()
+    assert time.monotonic() - debut < 2
+
+def test_bail_renouvele_par_son_detenteur(cache_partage):
+    bail = Bail(cache_partage / 'x.bail', duree=0.3)
+    assert bail.prendre()
+    time.sleep(0.5)
+    assert not bail._perime() and not Bail(bail.chemin, duree=0.3).prendre()
+    bail.rendre()
+    assert not bail.chemin.exists()
+
+def _section_critique(journal):
+    with bail_exclusif(('session', 2025, 'Processus', 'R')):
+        with open(journal, 'a') as f:
+            f.write('debut\n')
+        time.sleep(0.2)
+        with open(journal, 'a') as f:
+            f.write('fin\n')
+
+def test_exclusion_entre_processus(cache_partage):
+    journal = cache_partage / 'journal.txt'
+    contexte = multiprocessing.get_context('fork')
+    processus = [contexte.Process(target=_section_critique, args=(journal,)) for _ in range(3)]
+    for p in processus:
+        p.start()
+    for p in processus:
+        p.join(30)
+    assert [p.exitcode for p in processus] == [0, 0, 0]
+    assert journal.read_text().split() == ['debut', 'fin'] * 3
+
+def test_pickles_fastf1_ecrits_atomiquement(tmp_path, monkeypatch):
+    monkeypatch.setattr(fastf1.req.Cache, '_write_cache', fastf1.req.Cache.__dict__['_write_cache'])
+    installer_ecriture_atomique()
+    installer_ecriture_atomique()
+    chemin = tmp_path / 'timing_data.ff1pkl'
+    fastf1.req.Cache._write_cache({'tours': [1, 2]}, str(chemin))
+    contenu = pickle.loads(chemin.read_bytes())
+    assert contenu['data'] == {'tours': [1, 2]} and contenu['version'] == fastf1.req.Cache._API_CORE_VERSION
+
+    # Écriture interrompue : l'ancien fichier reste intact, aucun temporaire ne traîne
+    with pytest.raises(Exception):
+        fastf1.req.Cache._write_cache(lambda: None, str(chemin))
+    assert pickle.loads(chemin.read_bytes())['data'] == {'tours': [1, 2]}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['timing_data.ff1pkl']
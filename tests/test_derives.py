@@ -0,0 +1,79 @@
+import fastf1
+import pandas as pd
+
+import scr.derives
+from scr.data import chargement_session
+from scr.derives import TABLES_DERIVEES, classement_session, materialiser, table_derivee
+from tests.conftest import COURSE_ENREGISTREE
+
+def _tours():
+    return pd.DataFrame({
+        'Driver': ['AAA', 'AAA', 'AAA', 'BBB', 'BBB'],
+        'LapNumber': [1, 2, 3, 1, 2],
+        'LapTime': pd.to_timedelta([92.0, 90.5, 91.0, 91.5, None], unit='s'),
+        'LapSeconds': [92.0, 90.5, 91.0, 91.5, None],
+        'Stint': [1.0, 1.0, 2.0, 1.0, 1.0],
+        'Compound': ['SOFT', 'SOFT', 'HARD', 'MEDIUM', 'MEDIUM'],
+        'PitInTime': pd.to_timedelta([None, 3000.0, None, None, None], unit='s'),
+        'PitOutTime': pd.to_timedelta([None, None, 3020.0, None, None], unit='s'),
+    })
+
+def test_tables_derivees_des_tours():
+    tables, _ = materialiser(dict(tours=_tours(), resultats=pd.DataFrame(), type_session='Q'))
+    assert tables['relais'][['Driver', 'Stint', 'StartLap', 'EndLap']].values.tolist() == [
+        ['AAA', 1.0, 1, 2], ['AAA', 2.0, 3, 3], ['BBB', 1.0, 1, 2]]
+    assert tables['arrets']['LapNumber'].tolist() == [2, 3]
+    assert tables['composes'].set_index(['Driver', 'Compound'])['Tours'].to_dict() == {
+        ('AAA', 'HARD'): 1, ('AAA', 'SOFT'): 2, ('BBB', 'MEDIUM'): 2}
+    assert tables['top_tours']['LapSeconds'].tolist() == [90.5, 91.0, 91.5, 92.0]
+    assert tables['classement']['Driver'].tolist() == ['AAA', 'BBB']
+    assert set(tables) == set(TABLES_DERIVEES)
+
+def test_recalcul_selon_les_dependances(monkeypatch):
+    monkeypatch.setattr(scr.derives, 'TABLES_DERIVEES', dict(TABLES_DERIVEES))
+    appels = []
+
+    @table_derivee('nb_tours', depend=('tours',))
+    def nb_tours(tours):
+        appels.append(len(tours))
+        return pd.DataFrame({'n': [len(tours)]})
+
+    entrees = dict(tours=_tours(), resultats=pd.DataFrame(), type_session='R')
+    tables, empreintes = materialiser(entrees)
+    precedentes = dict(derivees=tables, empreintes=empreintes)
+    # Tours identiques (nouvelle copie), autre entrée modifiée : table reprise telle quelle
+    suivantes, _ = materialiser(dict(entrees, tours=_tours().copy(), type_session='Q'), precedentes)
+    assert suivantes['nb_tours'] is tables['nb_tours'] and appels == [5]
+    assert suivantes['classement'] is not tables['classement']
+    # Tours modifiés : recalcul
+    suivantes, _ = materialiser(dict(entrees, tours=_tours().iloc[:3]), precedentes)
+    assert appels == [5, 3] and suivantes['nb_tours']['n'].tolist() == [3]
+
+def test_tables_materialisees_au_chargement(fastf1_hors_ligne):
+    d = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('tours', 'resultats'))
+    derivees = d['derivees']
+    pd.testing.assert_frame_equal(derivees['classement'], classement_session(d['tours'], d['resultats'], 'R'))
+    assert derivees['top_tours']['LapTime'].is_monotonic_increasing and len(derivees['top_tours']) == 10
+    assert not derivees['relais'].empty
+    # Complément de la session (météo) : tours et résultats inchangés, tables reprises
+    d2 = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('tours', 'resultats', 'meteo'))
+    assert d2 is not d and d2['derivees']['relais'] is derivees['relais']
+    # Nouvelle Session : celle déjà servie n'est pas modifiée par le complément
+    assert d2['session'] is not d['session'] and '_weather_data' not in vars(d['session'])
+    assert not d2['meteo'].empty
+
+def test_complement_sans_recharger_les_parties_servies(fastf1_hors_ligne, monkeypatch):
+    d = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('tours', 'resultats'))
+    appels = []
+    for nom in ('load', '_load_drivers_results', '_load_laps_data', '_load_weather_data'):
+        origine = getattr(fastf1.core.Session, nom)
+        monkeypatch.setattr(fastf1.core.Session, nom,
+                            lambda self, *a, nom=nom, origine=origine, **k: appels.append(nom) or origine(self, *a, **k))
+    d2 = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('tours', 'resultats', 'meteo'))
+    # Seule la météo est analysée ; tours et résultats de la session servie sont repris
+    assert appels == ['_load_weather_data'] and not d2['meteo'].empty
+    assert d2['session']._laps is d['session']._laps
+    # Messages : ils annotent les tours, copiés pour ne pas toucher à ceux déjà servis
+    d3 = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('tours', 'resultats', 'messages'))
+    assert d3['session']._laps is not d2['session']._laps and d3['session'].laps.session is d3['session']
+    assert '_race_control_messages' not in vars(d2['session'])
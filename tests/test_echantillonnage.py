@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from scr.echantillonnage import indices_lttb, indices_minmax, reduire
+
+def _signal(n=10_000):
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 300.0)
+    y[4321] = 5.0  # pic isolé
+    return x, y
+
+def test_lttb_taille_extremites_et_pic():
+    x, y = _signal()
+    idx = indices_lttb(x, y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 4321 in idx
+
+def test_minmax_conserve_les_extremes():
+    _, y = _signal()
+    idx = indices_minmax(y, 200)
+    assert len(idx) <= 202
+    assert y[idx].max() == y.max() and y[idx].min() == y.min()
+
+def test_serie_courte_inchangee():
+    assert indices_lttb([0, 1, 2], [1, 2, 3], 800).tolist() == [0, 1, 2]
+
+def test_reduire_plage_pleine_resolution():
+    x, y = _signal()
+    df = pd.DataFrame({'t': pd.to_timedelta(x, unit='s'), 'a': y, 'b': -y})
+    reduit = reduire(df, 't', ['a', 'b'], n_points=300)
+    assert 300 <= len(reduit) <= 600
+    zoom = reduire(df, 't', 'a', n_points=300, plage=(pd.Timedelta(seconds=100), pd.Timedelta(seconds=299)))
+    assert len(zoom) == 200
@@ -0,0 +1,83 @@
+import json
+
+import pandas as pd
+import pyarrow.dataset as ds
+import pytest
+
+import scr.export_saison
+from scr.export_saison import (VERSION_EXPORT, dossier_partition, exporter_saison, partition_a_jour,
+                               telemetrie_par_tour)
+from tests.conftest import COURSE_ENREGISTREE
+
+def test_export_partitionne_puis_repris(fastf1_hors_ligne, tmp_path):
+    sortie = tmp_path / 'dataset'
+    plan = [(COURSE_ENREGISTREE, 'R'), ('Chinese Grand Prix', 'R')]
+    bilan = exporter_saison(2025, sortie, plan=plan, processus=0)
+    assert bilan[(COURSE_ENREGISTREE, 'R')] == ('ecrite', 'laps, results, weather')
+    assert bilan[('Chinese Grand Prix', 'R')][0] == 'echec'
+
+    laps = ds.dataset(sortie / 'laps', format='parquet', partitioning='hive').to_table().to_pandas()
+    assert set(laps['event']) == {COURSE_ENREGISTREE} and set(laps['session']) == {'R'}
+    assert (laps['year'] == 2025).all() and laps['LapNumber'].max() > 50
+    assert dossier_partition(sortie, 'results', 2025, COURSE_ENREGISTREE, 'R').joinpath('part-0.parquet').exists()
+
+    # Relance : la session à jour est sautée, celle en échec retentée
+    bilan = exporter_saison(2025, sortie, plan=plan, processus=0)
+    assert bilan[(COURSE_ENREGISTREE, 'R')] == ('a_jour', '')
+    assert bilan[('Chinese Grand Prix', 'R')][0] == 'echec'
+    # Télémétrie demandée en plus : la partition n'est plus à jour
+    assert not partition_a_jour(sortie, 2025, COURSE_ENREGISTREE, 'R', ['laps', 'telemetry'])
+
+def test_tables_vides_notees_au_manifeste(tmp_path, monkeypatch):
+    appels = []
+
+    def chargement_session(annee, course, sess_type, parties):
+        appels.append(parties)
+        return dict(tours=pd.DataFrame({'LapNumber': [1.0]}), resultats=pd.DataFrame({'Position': [1.0]}),
+                    meteo=pd.DataFrame(), session=None)
+
+    monkeypatch.setattr(scr.export_saison, 'chargement_session', chargement_session)
+    monkeypatch.setattr(scr.export_saison, 'telemetrie_par_tour', lambda sess: pd.DataFrame())
+    statut = scr.export_saison.exporter_session(2025, 'X', 'R', tmp_path, telemetrie=True)
+    assert statut == ('ecrite', 'laps, results')
+    assert not dossier_partition(tmp_path, 'weather', 2025, 'X', 'R').joinpath('part-0.parquet').exists()
+    # Météo et télémétrie vides : la session est à jour, sans nouveau chargement
+    assert partition_a_jour(tmp_path, 2025, 'X', 'R', ['laps', 'results', 'weather', 'telemetry'])
+    assert scr.export_saison.exporter_session(2025, 'X', 'R', tmp_path, telemetrie=True) == ('a_jour', '')
+    assert len(appels) == 1
+
+def test_manifeste_d_une_autre_version_ignore(tmp_path):
+    chemin = scr.export_saison._manifeste(tmp_path, 2025, 'X', 'R')
+    chemin.parent.mkdir(parents=True)
+    chemin.write_text(json.dumps(dict(version=VERSION_EXPORT - 1, fastf1=scr.export_saison.fastf1.__version__,
+                                      tables=['laps'])))
+    assert not partition_a_jour(tmp_path, 2025, 'X', 'R', ['laps'])
+
+def test_telemetrie_rattachee_aux_tours():
+    class _Session:
+        laps = pd.DataFrame({'DriverNumber': ['1', '1'], 'LapNumber': [1, 2],
+                             'LapStartTime': pd.to_timedelta([10, 100], unit='s'),
+                             'Time': pd.to_timedelta([100, 190], unit='s')})
+        car_data = {'1': pd.DataFrame({'SessionTime': pd.to_timedelta([5, 10, 50, 100, 150, 200], unit='s'),
+                                       'Speed': [0, 100, 200, 210, 220, 80]})}
+    tel = telemetrie_par_tour(_Session())
+    assert tel['LapNumber'].tolist() == [1, 1, 2, 2] and tel['Speed'].tolist() == [100, 200, 210, 220]
+    assert (tel['DriverNumber'] == '1').all()
+
+def test_cli_sessions_courues(fastf1_hors_ligne, tmp_path, monkeypatch, capsys):
+    from scr.calendrier import COLONNES_CALENDRIER, Calendrier
+    from tests.conftest import session_australie_2025
+    evenement = pd.DataFrame([dict(session_australie_2025().event)]).reindex(columns=COLONNES_CALENDRIER)
+    monkeypatch.setattr(scr.export_saison, 'calendrier', lambda annee: Calendrier(annee, evenement))
+
+    # Pas de sprint ce week-end, et rien n'est couru avant la date de la course
+    assert scr.export_saison.sessions_saison(2025, ['R', 'S']) == [(COURSE_ENREGISTREE, 'R')]
+    assert scr.export_saison.sessions_saison(2025, ['R'], maintenant=pd.Timestamp('2025-03-01')) == []
+
+    code = scr.export_saison.main(['2025', '--sortie', str(tmp_path / 'ds'), '--processus', '0', '--cache', ''])
+    assert code == 0 and '1 ecrite' in capsys.readouterr().out
+
+    # Calendrier indisponible : l'erreur est explicite
+    monkeypatch.setattr(scr.export_saison, 'calendrier', lambda annee: None)
+    with pytest.raises(ValueError, match='Calendrier indisponible'):
+        scr.export_saison.sessions_saison(2025)
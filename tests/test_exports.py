@@ -0,0 +1,73 @@
+import gzip
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import scr.exports
+from scr.cache import MagasinSessions
+from scr.exports import FORMATS_EXPORT, ecrire_export, export_session, export_table
+
+def _table(n=1000):
+    return pd.DataFrame({'Driver': pd.Categorical(['VER', 'NOR'] * (n // 2)), 'LapNumber': range(n),
+                         'LapTime': pd.to_timedelta([90.0 + i / 100 for i in range(n)], unit='s')})
+
+def _relire(contenu, format):
+    if format == 'csv':
+        return pd.read_csv(io.BytesIO(contenu))
+    if format == 'csv.gz':
+        return pd.read_csv(io.BytesIO(gzip.decompress(contenu)))
+    if format == 'csv.zst':
+        with pa.input_stream(pa.py_buffer(contenu), compression='zstd') as flux:
+            return pd.read_csv(io.BytesIO(flux.read()))
+    if format == 'parquet':
+        return pd.read_parquet(io.BytesIO(contenu))
+    return pd.read_feather(io.BytesIO(contenu))
+
+@pytest.mark.parametrize('format', list(FORMATS_EXPORT))
+def test_export_par_blocs_relisible(format):
+    df = _table()
+    tampon = io.BytesIO()
+    ecrire_export(df, format, tampon, lignes=128)
+    relu = _relire(tampon.getvalue(), format)
+    assert len(relu) == len(df) and relu['LapNumber'].tolist() == list(range(len(df)))
+    if format in ('parquet', 'feather'):
+        pd.testing.assert_frame_equal(relu, df)
+
+def test_csv_par_blocs_identique_au_csv_complet():
+    df = _table(300)
+    tampon = io.BytesIO()
+    ecrire_export(df, 'csv', tampon, lignes=7)
+    assert tampon.getvalue() == df.to_csv(index=False).encode('utf-8')
+    with pytest.raises(ValueError):
+        export_table(df, 'xlsx')
+
+def test_export_table_en_flux(monkeypatch):
+    df = _table()
+    # Seuil minuscule : l'export passe sur disque, relu tel quel
+    monkeypatch.setattr(scr.exports, 'SEUIL_MEMOIRE_EXPORT', 1024)
+    flux = export_table(df, 'csv')
+    assert flux.readable() and not isinstance(flux, bytes)
+    assert flux.read() == df.to_csv(index=False).encode('utf-8')
+
+def test_export_session_produit_une_fois(monkeypatch, fabrique_session):
+    monkeypatch.setattr(scr.exports, 'MAGASIN_EXPORTS', MagasinSessions(10**8))
+    appels = []
+    original = scr.exports.export_table
+    monkeypatch.setattr(scr.exports, 'export_table', lambda df, f: appels.append(f) or original(df, f))
+    data = {'session': fabrique_session(), 'tours': _table()}
+    premier = export_session(data, 'tours', 'parquet').read()
+    assert export_session(data, 'tours', 'parquet').read() == premier
+    export_session(data, 'tours', 'csv.gz')
+    assert appels == ['parquet', 'csv.gz']
+    pd.testing.assert_frame_equal(_relire(premier, 'parquet'), data['tours'])
+
+def test_gros_export_non_conserve(monkeypatch, fabrique_session):
+    magasin = MagasinSessions(10**8)
+    monkeypatch.setattr(scr.exports, 'MAGASIN_EXPORTS', magasin)
+    monkeypatch.setattr(scr.exports, 'TAILLE_MAX_EXPORT_EN_CACHE', 1024)
+    data = {'session': fabrique_session(), 'tours': _table()}
+    flux = export_session(data, 'tours', 'csv')
+    assert len(_relire(flux.read(), 'csv')) == len(data['tours'])
+    assert magasin.statistiques()['entrees'] == 0
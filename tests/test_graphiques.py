@@ -0,0 +1,51 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from fastf1.core import Laps, Telemetry
+from matplotlib.collections import LineCollection
+
+import scr.pilotes
+import scr.telemetrie
+from scr.cache import MagasinSessions
+from scr.graphiques import figure_carte_mini_secteurs
+
+@pytest.fixture
+def session_positions(fabrique_session, monkeypatch):
+    """Session synthétique : 2 pilotes, 2 tours de 10 s sur un circuit circulaire, télémétrie à 4 Hz."""
+    magasin = MagasinSessions(10**9)
+    for module in (scr.telemetrie, scr.pilotes):
+        monkeypatch.setattr(module, 'MAGASIN_TELEMETRIE', magasin)
+    sess = fabrique_session()
+    temps = {'1': [10.2, 9.9], '4': [10.0, 10.1]}
+    lignes = []
+    for drv, abb in [('1', 'VER'), ('4', 'NOR')]:
+        debut = 0.0
+        for n, t in enumerate(temps[drv], 1):
+            lignes.append(dict(DriverNumber=drv, Driver=abb, LapNumber=float(n), Team='Test',
+                               LapStartTime=pd.Timedelta(seconds=debut),
+                               Time=pd.Timedelta(seconds=debut + t), LapTime=pd.Timedelta(seconds=t),
+                               IsPersonalBest=t == min(temps[drv][:n])))
+            debut += t
+    sess._laps = Laps(pd.DataFrame(lignes), session=sess)
+    st = pd.to_timedelta(np.arange(0, 21, 0.25), unit='s')
+    angle = 2 * np.pi * st.total_seconds().to_numpy() / 10
+    dates = pd.Timestamp('2025-03-16 04:00') + st
+    sess._car_data, sess._pos_data = {}, {}
+    for k, drv in enumerate(['1', '4']):
+        sess._car_data[drv] = Telemetry(pd.DataFrame({'Speed': 200.0 + 20 * np.sin(angle + k), 'SessionTime': st,
+                                                      'Time': st, 'Date': dates}), session=sess, driver=drv)
+        sess._pos_data[drv] = Telemetry(pd.DataFrame({'X': 1000 * np.cos(angle), 'Y': 1000 * np.sin(angle),
+                                                      'Z': 0.0, 'SessionTime': st, 'Time': st, 'Date': dates}),
+                                        session=sess, driver=drv)
+    return sess
+
+def test_carte_mini_secteurs_trace_le_circuit(session_positions):
+    fig = figure_carte_mini_secteurs(session_positions, n_secteurs=4)
+    ax = fig.axes[0]
+    traces = [c for c in ax.collections if isinstance(c, LineCollection)]
+    assert traces and len(traces[0].get_segments()) > 10
+    assert not any(t.get_text() == "Télémetrie indisponible" for t in ax.texts)
+    plt.close(fig)
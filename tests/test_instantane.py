@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+import fastf1
+from fastf1.core import Laps, SessionResults, Telemetry
+from scr import instantane
+
+@pytest.fixture
+def cache_tmp(tmp_path, monkeypatch):
+    monkeypatch.setattr(fastf1.Cache, '_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+def _charger_synthetique(sess):
+    sess._session_info = {'Meeting': {'Circuit': {'Key': 10}}}
+    sess._results = SessionResults(pd.DataFrame({'DriverNumber': ['1', '4'], 'Abbreviation': ['VER', 'NOR'],
+                                                 'Position': [2.0, 1.0], 'Points': [18.0, 25.0]}, index=['1', '4']),
+                                   _force_default_cols=True)
+    sess._car_data = {
+        drv: Telemetry(pd.DataFrame({'Speed': np.arange(5, dtype=float) + k,
+                                     'SessionTime': pd.to_timedelta(np.arange(5), unit='s')}),
+                       session=sess, driver=drv)
+        for k, drv in enumerate(['1', '4'])
+    }
+    sess._pos_data = {drv: tel.rename(columns={'Speed': 'X'}) for drv, tel in sess._car_data.items()}
+    sess._t0_date = pd.Timestamp('2025-03-16 03:00')
+
+def test_aller_retour_resultats_et_telemetrie(cache_tmp, fabrique_session):
+    sess = fabrique_session()
+    _charger_synthetique(sess)
+    assert instantane.enregistrer(sess, ['resultats', 'telemetrie'])
+
+    neuve = fabrique_session()
+    assert instantane.restaurer(neuve, ['resultats', 'telemetrie', 'meteo']) == ('resultats', 'telemetrie')
+    assert isinstance(neuve.results, SessionResults)
+    pd.testing.assert_frame_equal(pd.DataFrame(neuve.results), pd.DataFrame(sess.results))
+    assert set(neuve.car_data) == {'1', '4'}
+    assert isinstance(neuve.car_data['4'], Telemetry)
+    assert neuve.car_data['4']['Speed'].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert neuve.t0_date == sess.t0_date
+    assert neuve.session_info['Meeting']['Circuit']['Key'] == 10
+
+def test_partie_vide_non_ecrite(cache_tmp, fabrique_session):
+    sess = fabrique_session()
+    _charger_synthetique(sess)
+    sess._weather_data = pd.DataFrame()
+    instantane.enregistrer(sess, ['resultats', 'meteo'])
+    assert instantane.lire_manifeste(instantane.dossier_instantane(sess))['parties'] == ['resultats']
+
+def test_version_differente_ignoree(cache_tmp, monkeypatch, fabrique_session):
+    sess = fabrique_session()
+    _charger_synthetique(sess)
+    instantane.enregistrer(sess, ['resultats'])
+    monkeypatch.setattr(instantane, 'VERSION_INSTANTANE', instantane.VERSION_INSTANTANE + 1)
+    assert instantane.restaurer(fabrique_session(), ['resultats']) == ()
+
+def test_resultats_incomplets_ou_recents_non_ecrits(cache_tmp, monkeypatch, fabrique_session):
+    sess = fabrique_session()
+    _charger_synthetique(sess)
+    sess._results['Points'] = np.nan  # Ergast en échec : points non publiés
+    assert not instantane.enregistrer(sess, ['resultats'])
+    assert instantane.restaurer(fabrique_session(), ['resultats']) == ()
+
+    _charger_synthetique(sess)
+    monkeypatch.setattr(instantane, 'DELAI_RESULTATS_DEFINITIFS', pd.Timedelta(days=365 * 100))
+    assert not instantane.resultats_definitifs(sess)
+    assert not instantane.enregistrer(sess, ['resultats'])
+
+def test_telemetrie_partielle_non_ecrite(cache_tmp, fabrique_session):
+    sess = fabrique_session()
+    _charger_synthetique(sess)
+    del sess._pos_data['4']
+    instantane.enregistrer(sess, ['resultats', 'telemetrie'])
+    assert instantane.lire_manifeste(instantane.dossier_instantane(sess))['parties'] == ['resultats']
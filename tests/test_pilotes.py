@@ -0,0 +1,41 @@
+import copy
+
+import pandas as pd
+from scr.data import chargement_session
+from scr.pilotes import IndexPilotes, index_pilotes
+from tests.conftest import COURSE_ENREGISTREE
+
+def _index():
+    pilotes = pd.DataFrame({'DriverNumber': ['1', '22', '30'], 'BroadcastName': ['M VERSTAPPEN', 'Y TSUNODA', 'L LAWSON'],
+                            'FullName': ['Max Verstappen', 'Yuki Tsunoda', 'Liam Lawson'],
+                            'TeamName': ['Red Bull Racing', 'Racing Bulls', 'Red Bull Racing'],
+                            'Couleur': ['#3671C6', '#6692FF', '#3671C6'], 'CouleurEquipe': ['#3671C6', '#6692FF', '#3671C6'],
+                            'Trait': ['solid', 'solid', 'dashed']},
+                           index=pd.Index(['VER', 'TSU', 'LAW'], name='Abbreviation'))
+    return IndexPilotes(pilotes)
+
+def test_toutes_les_formes_d_identifiant():
+    index = _index()
+    for identifiant in ['VER', 'ver', 1, '1', 'M VERSTAPPEN', 'Max Verstappen']:
+        assert index.resoudre(identifiant) == 'VER'
+    assert index.resoudre('XYZ') == 'XYZ' and 'XYZ' not in index
+    assert index.nom(30) == 'L LAWSON'
+    assert index.style('LAW') == {'color': '#3671C6', 'linestyle': 'dashed'}
+    assert index.couleur_equipe('Racing Bulls') == '#6692FF'
+
+def test_index_construit_au_chargement(fastf1_hors_ligne):
+    d = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('tours',))
+    index = d['index_pilotes']
+    assert index.resoudre('L NORRIS') == 'NOR'
+    assert set(d['pilotes']) <= set(index.pilotes.index)
+    assert index.style('NOR')['linestyle'] in ('solid', 'dashed')
+
+def test_index_suit_les_resultats(fastf1_hors_ligne):
+    d = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('resultats',))
+    assert index_pilotes(d['session']) is d['index_pilotes']
+    # Session rechargée avec d'autres résultats : l'index n'est pas celui de la première
+    sess = copy.copy(d['session'])
+    sess._results = d['session']._results.copy()
+    sess._results.loc[sess._results['Abbreviation'] == 'NOR', 'BroadcastName'] = 'L NORRIS (CORRIGÉ)'
+    assert index_pilotes(sess) is not d['index_pilotes']
+    assert index_pilotes(sess).nom('NOR') == 'L NORRIS (CORRIGÉ)'
@@ -0,0 +1,48 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from scr.data import chargement_session
+from scr.positions import bilan_positions, matrice_positions
+from tests.conftest import COURSE_ENREGISTREE
+
+def _matrice():
+    positions = pd.DataFrame({'AAA': [2.0, 1.0, 1.0], 'BBB': [1.0, 2.0, np.nan], 'CCC': [3.0, 3.0, 2.0]},
+                             index=pd.Index([1, 2, 3], name='LapNumber'))
+    temps = pd.DataFrame({'AAA': [91.0, 181.0, 271.0], 'BBB': [90.0, 181.5, np.nan], 'CCC': [93.0, 185.0, 276.0]},
+                         index=positions.index)
+    return dict(tours=positions.index.to_numpy(), pilotes=list(positions.columns), positions=positions,
+                temps=temps, ecarts=temps.sub(temps.min(axis=1), axis=0),
+                grille=pd.Series([3.0, 1.0, np.nan], index=positions.columns))
+
+def test_bilan_positions():
+    bilan = bilan_positions(_matrice())
+    assert bilan.loc['AAA', ['Depart', 'Arrivee', 'Gagnees', 'ToursEnTete']].tolist() == [3, 1, 2, 2]
+    # Abandon : arrivée au dernier tour bouclé, départ des stands sans gain calculé
+    assert bilan.loc['BBB', 'Arrivee'] == 2 and bilan.loc['BBB', 'Gagnees'] == -1
+    assert np.isnan(bilan.loc['CCC', 'Gagnees'])
+    assert bilan.loc['CCC', 'EcartFinal'] == 5.0
+
+def test_matrice_partagee_avec_la_session(fastf1_hors_ligne):
+    d = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('tours',))
+    matrice = d['positions']
+    assert matrice is matrice_positions(d['session'])
+    positions = matrice['positions']
+    tours = d['tours']
+    assert positions.shape == (tours['LapNumber'].max(), tours['Driver'].nunique())
+    premier = tours[tours['LapNumber'] == 10].set_index('Driver')['Position']
+    pd.testing.assert_series_equal(positions.loc[10, premier.index.astype(str)].astype(float),
+                                   premier.set_axis(premier.index.astype(str)).astype(float),
+                                   check_names=False, check_index_type=False)
+    assert (matrice['ecarts'].min(axis=1) == 0).all()
+    assert matrice['pilotes'][0] == d['index_pilotes'].pilotes.index[0]
+
+def test_matrice_suit_les_tours(fastf1_hors_ligne):
+    d = chargement_session(2025, COURSE_ENREGISTREE, 'R', parties=('tours',))
+    # Session rechargée avec moins de tours : la matrice est recalculée
+    sess = copy.copy(d['session'])
+    sess._laps = d['session']._laps[d['session']._laps['LapNumber'] <= 10].copy()
+    sess._laps.session = sess
+    matrice = matrice_positions(sess)
+    assert matrice is not d['positions'] and matrice['positions'].index.max() == 10
@@ -0,0 +1,55 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pytest
+
+import scr.rendu
+from scr.cache import MagasinSessions
+from scr.rendu import image_figure
+
+@pytest.fixture
+def magasin(monkeypatch):
+    m = MagasinSessions(10**8)
+    monkeypatch.setattr(scr.rendu, 'MAGASIN_FIGURES', m)
+    return m
+
+def _figure_test(sess, pilote=None, cmap=None):
+    _figure_test.appels += 1
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    ax.set_title(str(pilote))
+    return fig
+
+def test_rendu_unique_et_figure_fermee(magasin, fabrique_session):
+    sess = fabrique_session()
+    _figure_test.appels = 0
+    png = image_figure(_figure_test, sess, pilote='VER', cmap=matplotlib.colormaps['plasma'])
+    assert png.startswith(b'\x89PNG')
+    assert plt.get_fignums() == []
+    assert image_figure(_figure_test, sess, pilote='VER', cmap=matplotlib.colormaps['plasma']) is png
+    assert _figure_test.appels == 1
+
+def test_parametres_dans_la_cle(magasin, fabrique_session):
+    sess = fabrique_session()
+    _figure_test.appels = 0
+    image_figure(_figure_test, sess, pilote='VER')
+    image_figure(_figure_test, sess, pilote='NOR')
+    svg = image_figure(_figure_test, sess, pilote='NOR', format='svg')
+    assert b'<svg' in svg
+    assert _figure_test.appels == 3
+
+def test_figure_de_repli_non_conservee(magasin, fabrique_session):
+    from scr.graphiques import figure_indisponible
+    sess = fabrique_session()
+    appels = []
+
+    def _figure(sess):
+        appels.append(1)
+        fig, ax = plt.subplots()
+        return figure_indisponible(fig, ax, "Télémetrie indisponible")
+
+    assert image_figure(_figure, sess).startswith(b'\x89PNG')
+    # Données indisponibles : rien en cache, la figure est reconstruite à l'appel suivant
+    image_figure(_figure, sess)
+    assert len(appels) == 2 and magasin.statistiques()['entrees'] == 0
+    assert plt.get_fignums() == []
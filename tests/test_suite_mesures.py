@@ -0,0 +1,53 @@
+import pytest
+
+from benchmarks import suite
+from benchmarks.hors_ligne import COURSE, fastf1_hors_ligne, saison_synthetique
+
+def test_chronometrer_rapporte_temps_et_memoire():
+    appels = []
+    resultat = suite.chronometrer(lambda: appels.append(bytearray(1 << 20)), avant=appels.clear, repetitions=3)
+    assert len(resultat['temps_s']) == 3
+    assert resultat['temps_min_s'] <= resultat['temps_median_s']
+    # Le bloc d'1 Mo alloué par l'appel tracé est encore vivant
+    assert resultat['pic_octets'] >= 1 << 20 and resultat['octets_retenus'] >= 1 << 20
+    assert resultat['allocations_retenues'] >= 1
+
+def test_comparer_signale_les_ecarts_au_dela_du_seuil():
+    ancien = {'mesures': {'a': {'temps_median_s': 1.0}, 'b': {'temps_median_s': 1.0}, 'c': {'temps_median_s': 1.0}}}
+    nouveau = {'mesures': {'a': {'temps_median_s': 1.5}, 'b': {'temps_median_s': 1.05},
+                           'c': {'temps_median_s': 0.5}, 'nouvelle': {'temps_median_s': 9.0}}}
+    assert suite.comparer(ancien, nouveau, seuil=0.1) == [('a', 1.0, 1.5, 0.5), ('c', 1.0, 0.5, -0.5)]
+
+def test_mesures_agrandies_declarees_par_facteur():
+    assert {f'derives.classement_session[x{f}]' for f in suite.FACTEURS} <= set(suite.MESURES)
+    assert all(nom.startswith(('chargement.', 'derives.', 'positions.', 'championnat.', 'telemetrie.', 'figures.'))
+               for nom in suite.MESURES)
+
+def test_saison_synthetique_rejoue_la_course_enregistree():
+    with fastf1_hors_ligne():
+        cal = saison_synthetique(3)
+        assert cal.noms == (COURSE, f'{COURSE} 2', f'{COURSE} 3')
+        classement = suite.calcul_classement_pilote(2025, cal.noms[-1])
+    # Trois manches identiques : le vainqueur a trois fois les points de la course
+    assert classement['Points'].max() == 3 * 25
+
+def test_execution_filtree_hors_ligne():
+    resultats = suite.executer('derives.classement_session*', repetitions=1)
+    assert set(resultats['mesures']) == {f'derives.classement_session[x{f}]' for f in suite.FACTEURS}
+    assert resultats['versions']['fastf1'] and resultats['repetitions'] == 1
+
+def test_figure_de_repli_rejetee():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.text(0.5, 0.5, "Télémetrie indisponible")
+    ax.axis('off')
+    with pytest.raises(suite.MesureInvalide):
+        suite.verifier_figure(fig)
+    ax.plot([0, 1], [0, 1])
+    with pytest.raises(suite.MesureInvalide):
+        suite.verifier_figure(fig)
+    ax.texts[0].remove()
+    suite.verifier_figure(fig)
+    plt.close(fig)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+import fastf1
+from fastf1.core import Laps, Telemetry
+
+import scr.telemetrie
+from scr.cache import MagasinSessions
+from scr.cache import estimer_taille
+from scr.telemetrie import comparer_tours, contexte_tour, mini_secteurs, telemetrie_tour, telemetrie_tours_rapides, tours_rapides
+
+@pytest.fixture
+def session_tel(fabrique_session, monkeypatch):
+    """Session synthétique : 2 pilotes, 3 tours de 10 s, télémétrie à 4 Hz."""
+    monkeypatch.setattr(scr.telemetrie, 'MAGASIN_TELEMETRIE', MagasinSessions(10**9))
+    sess = fabrique_session()
+    temps = {'1': [10.5, 9.8, 10.1], '4': [10.2, 10.0, 9.9]}
+    lignes = []
+    for drv, abb in [('1', 'VER'), ('4', 'NOR')]:
+        debut = 0.0
+        for n, t in enumerate(temps[drv], 1):
+            lignes.append(dict(DriverNumber=drv, Driver=abb, LapNumber=float(n),
+                               LapStartTime=pd.Timedelta(seconds=debut),
+                               Time=pd.Timedelta(seconds=debut + t), LapTime=pd.Timedelta(seconds=t),
+                               IsPersonalBest=t == min(temps[drv][:n])))
+            debut += t
+    sess._laps = Laps(pd.DataFrame(lignes), session=sess)
+    st = pd.to_timedelta(np.arange(0, 31, 0.25), unit='s')
+    sess._car_data = {
+        drv: Telemetry(pd.DataFrame({'Speed': np.linspace(100, 300, len(st)) + k, 'SessionTime': st,
+                                     'nGear': (np.arange(len(st)) // 10 % 8 + 1).astype(float),
+                                     'Time': st, 'Date': pd.Timestamp('2025-03-16 04:00') + st}),
+                       session=sess, driver=drv)
+        for k, drv in enumerate(['1', '4'])
+    }
+    return sess
+
+def test_tours_rapides_comme_pick_fastest(session_tel):
+    rapides = tours_rapides(session_tel.laps)
+    for drv in ['1', '4']:
+        attendu = session_tel.laps.pick_drivers(drv).pick_fastest()
+        assert rapides.loc[rapides['DriverNumber'] == drv, 'LapNumber'].item() == attendu['LapNumber']
+
+def test_lot_identique_a_get_car_data(session_tel):
+    lot = telemetrie_tours_rapides(session_tel)
+    assert list(lot) == ['1', '4']
+    for drv, (lap, tel) in lot.items():
+        attendu = session_tel.laps.pick_drivers(drv).pick_fastest().get_car_data().add_distance()
+        # Mêmes valeurs, en types compacts (float32...)
+        pd.testing.assert_frame_equal(pd.DataFrame(tel), pd.DataFrame(attendu), check_dtype=False, rtol=1e-6)
+
+def test_cache_partage_entre_lot_et_tour(session_tel):
+    lot = telemetrie_tours_rapides(session_tel, ['VER'])
+    lap, tel = lot['1']
+    assert telemetrie_tour(session_tel, lap) is tel
+    assert scr.telemetrie.MAGASIN_TELEMETRIE.statistiques()['hits'] == 1
+    with pytest.raises(ValueError):
+        telemetrie_tour(session_tel, lap, 'inconnu')
+
+def test_comparaison_alignee_sur_la_distance(session_tel):
+    laps = [lap for lap, _ in telemetrie_tours_rapides(session_tel).values()]
+    comp = comparer_tours(session_tel, laps, pas=10.0)
+    n = len(comp['distance'])
+    assert comp['pilotes'] == ['VER', 'NOR']
+    assert comp['delta'].shape == comp['canaux']['Speed'].shape == (2, n)
+    assert np.allclose(comp['delta'][0], 0.0)
+    # Rapport engagé : valeur d'un échantillon réel, jamais interpolée
+    assert set(np.unique(comp['canaux']['nGear'])) <= set(range(1, 9))
+    assert not comp['distance'].flags.writeable
+    hits = scr.telemetrie.MAGASIN_TELEMETRIE.statistiques()['hits']
+    comparer_tours(session_tel, laps, pas=10.0)
+    assert scr.telemetrie.MAGASIN_TELEMETRIE.statistiques()['hits'] == hits + 2
+
+def test_comparaison_avec_une_autre_reference(session_tel):
+    laps = [lap for lap, _ in telemetrie_tours_rapides(session_tel).values()]
+    comp = comparer_tours(session_tel, laps, reference=1, pas=10.0)
+    assert comp is not None and comp['pilotes'] == ['VER', 'NOR']
+    # Écart nul sur la ligne de la référence (NOR), grille de son tour
+    assert np.allclose(comp['delta'][1], 0.0) and not np.allclose(comp['delta'][0], 0.0)
+    assert comp['distance'][-1] < float(telemetrie_tour(session_tel, laps[1])['Distance'].max())
+    # Référence sans télémétrie : pas de comparaison
+    del session_tel.car_data['4']
+    scr.telemetrie.MAGASIN_TELEMETRIE.vider()
+    assert comparer_tours(session_tel, laps, reference=1, pas=10.0) is None
+
+def test_mini_secteurs(session_tel):
+    ms = mini_secteurs(session_tel, 4)
+    assert ms['pilotes'] == ['VER', 'NOR']
+    assert ms['temps'].shape == ms['vitesses'].shape == (2, 4)
+    assert (ms['meilleurs'] == ms['temps'].argmin(axis=0)).all()
+    temps_tours = np.array([lap['LapTime'].total_seconds() for lap in ms['tours']])
+    assert np.all(np.abs(ms['temps'].sum(axis=1) - temps_tours) < 0.25)
+    assert mini_secteurs(session_tel, 4) is ms
+
+def test_contexte_tour_partage(session_tel):
+    ctx = contexte_tour(session_tel, 'NOR', lap_number=99)
+    assert ctx.pilote == 'NOR'
+    assert ctx.lap['LapNumber'] == 3  # tour introuvable : repli sur le plus rapide
+    assert contexte_tour(session_tel, 'NOR', lap_number=99) is ctx
+    assert contexte_tour(session_tel, 'VER', lap_number=1).lap['LapNumber'] == 1
+    # Aucune référence forte à la session : ni dans le contexte, ni dans sa ligne de tour
+    assert all(v is not session_tel for v in vars(ctx).values()) and not hasattr(ctx.lap, 'session')
+    assert all(not hasattr(lap, 'session') for lap in mini_secteurs(session_tel, 4)['tours'])
+
+def test_contexte_tour_compte_la_telemetrie(session_tel, monkeypatch):
+    tel = pd.DataFrame({'Speed': np.arange(10_000.0)})
+    monkeypatch.setattr(scr.telemetrie, 'telemetrie_tour', lambda sess, lap, genre: tel)
+    ctx = contexte_tour(session_tel, 'NOR')
+    avant = scr.telemetrie.MAGASIN_TELEMETRIE.statistiques()['octets']
+    assert ctx.telemetrie is tel
+    # Contexte redéposé après chargement : sa télémétrie est comptée dans le budget
+    assert scr.telemetrie.MAGASIN_TELEMETRIE.statistiques()['octets'] >= avant + estimer_taille(tel)
+    assert contexte_tour(session_tel, 'NOR') is ctx
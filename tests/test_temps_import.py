@@ -0,0 +1,23 @@
+from benchmarks.temps_import import RACINE, analyser_importtime, imports_page, pages
+
+def test_analyse_de_importtime():
+    sortie = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     numpy._utils
+import time:      3000 |       3120 |   numpy
+import time:       500 |       3620 | pandas
+import time:        80 |         80 | json
+"""
+    assert analyser_importtime(sortie) == [('numpy._utils', 120, 120, 2), ('numpy', 3000, 3120, 1),
+                                           ('pandas', 500, 3620, 0), ('json', 80, 80, 0)]
+
+def test_imports_differes_exclus_de_la_premiere_visite():
+    imports = imports_page(RACINE / 'Home.py')
+    assert 'from scr.ui import selecteurs_session, sidebar_hint_once, donnees_session' in imports
+    # Placés après st.stop() : payés seulement quand une session est affichée
+    assert not any('plotly' in i or 'colored_header' in i for i in imports)
+
+def test_toutes_les_pages_mesurees():
+    noms = [p.name for p in pages()]
+    assert noms[0] == 'Home.py' and len(noms) == 1 + len(list((RACINE / 'pages').glob('*.py')))
+    # Aucune page ne charge Matplotlib via scr.data
+    assert all('import matplotlib' not in i for p in pages() for i in imports_page(p))
@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 import pandas as pd
-from scr.utils import formatage_timedelta, secs
+from scr.utils import formatage_timedelta, secs, formatage_timedelta_serie, secs_serie
 
 def test_formatage_timedelta_none():
     assert formatage_timedelta(None) == '—'
@@ -24,3 +24,19 @@ def test_secs_standard():
     assert abs(secs(td) - 125.123) < 1e-3
 
 
+def test_secs_serie_garde_index_et_nat():
+    s = pd.Series([pd.Timedelta(seconds=95.123), pd.NaT, None], index=[3, 4, 5])
+    out = secs_serie(s)
+    assert list(out.index) == [3, 4, 5]
+    assert abs(out[3] - 95.123) < 1e-9 and out[[4, 5]].isna().all()
+
+def test_formatage_timedelta_serie_identique_au_scalaire():
+    valeurs = pd.to_timedelta([95.123, 0.0, 3725.5, -1.5, 125.123], unit='s').to_series().reset_index(drop=True)
+    valeurs[1] = pd.NaT
+    attendu = [formatage_timedelta(v) for v in valeurs]
+    assert formatage_timedelta_serie(valeurs).tolist() == attendu
+
+def test_formatage_timedelta_serie_tableau():
+    out = formatage_timedelta_serie(np.array([95123, 'NaT'], dtype='timedelta64[ms]'))
+    assert isinstance(out, np.ndarray)
+    assert out.tolist() == ['01:35.123', '—']